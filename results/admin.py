@@ -14,7 +14,7 @@ from results.models.organizations import Area, Organization
 from results.models.records import Record, RecordLevel
 from results.models.results import Result, ResultPartial
 from results.models.sports import Sport
-from results.models.statistics import StatisticsLink
+from results.models.statistics import PointsTable, StatisticsLink
 
 
 class AreaAdmin(admin.ModelAdmin):
@@ -98,7 +98,7 @@ admin.site.register(CompetitionLevel, CompetitionLevelAdmin)
 
 class CompetitionResultTypeAdmin(admin.ModelAdmin):
     autocomplete_fields = ["competition_type"]
-    list_display = ["competition_type", "name", "abbreviation", "max_result", "min_result", "records"]
+    list_display = ["competition_type", "name", "abbreviation", "max_result", "min_result", "records", "packed"]
     search_fields = ["competition_type__name", "competition_type__abbreviation", "name", "abbreviation"]
 
     def get_queryset(self, request):
@@ -238,6 +238,14 @@ class SportAdmin(admin.ModelAdmin):
 admin.site.register(Sport, SportAdmin)
 
 
+class PointsTableAdmin(admin.ModelAdmin):
+    list_display = ["name", "slug", "levels", "group_by", "public"]
+    search_fields = ["name", "slug"]
+
+
+admin.site.register(PointsTable, PointsTableAdmin)
+
+
 class StatisticsLinkAdmin(admin.ModelAdmin):
     list_display = ["group", "name", "link", "order", "public"]
     search_fields = ["group", "name"]
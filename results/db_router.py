@@ -0,0 +1,71 @@
+"""
+Database routing to read replicas.
+
+Requests with safe methods are marked by :class:`results.middleware.replica.ReplicaMiddleware` to read from one of
+the databases listed in the DATABASE_REPLICAS setting. Replica is chosen once per request, so all reads in the
+request see the same replication state. Writes always use the default database, and reads after a write in the same
+request use it too, so the request sees its own changes. Without replicas, all queries use the default database.
+"""
+
+import contextvars
+import random
+
+from django.conf import settings
+
+_replica = contextvars.ContextVar("replica", default=None)
+
+
+def get_replicas():
+    """
+    :return: database aliases of the read replicas
+    :rtype: list
+    """
+    return getattr(settings, "DATABASE_REPLICAS", [])
+
+
+def set_replica_reads(enabled):
+    """
+    Sets reads in the current context to use a randomly chosen replica.
+
+    :param enabled: True to read from a replica
+    :type enabled: bool
+    :return: token for resetting the previous value with :func:`reset_replica_reads`
+    :rtype: Token
+    """
+    replicas = get_replicas()
+    return _replica.set(random.choice(replicas) if enabled and replicas else None)
+
+
+def reset_replica_reads(token):
+    """
+    Resets replica reads to the value before :func:`set_replica_reads`.
+
+    :param token:
+    :type token: Token
+    """
+    _replica.reset(token)
+
+
+class ReplicaRouter:
+    """Routes reads of safe method requests to the read replicas and everything else to the default database."""
+
+    def db_for_read(self, model, **hints):
+        if not get_replicas():
+            return None
+        return _replica.get() or "default"
+
+    def db_for_write(self, model, **hints):
+        if _replica.get():
+            _replica.set(None)
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {"default", *get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in get_replicas():
+            return False
+        return None
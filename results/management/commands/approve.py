@@ -5,36 +5,35 @@ Approve or lock objects from the database
 import logging
 
 from dateutil.relativedelta import relativedelta
+from django.contrib.admin.models import CHANGE
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Exists, OuterRef
 from django.utils import timezone
 
+from results.mixins.change_log import log_bulk_changes
 from results.models.competitions import Competition
 from results.models.events import Event
 from results.models.records import Record
 from results.models.results import Result
+from results.utils.change_feed import mark_changed
+from results.utils.record_approval import approval_order, approve_records
+from results.utils.requirements import (
+    get_coverage,
+    get_missing_requirement,
+    get_requirements,
+)
+from results.utils.snapshots import delete_snapshot
 
 logger = logging.getLogger(__name__)
 
+CHUNK_SIZE = 500
 
-def _check_requirements(result):
-    competition = result.competition
+
+def _get_athletes(result):
     if result.athlete:
-        athletes = [result.athlete]
-    else:
-        athletes = result.team_members.all()
-    for requirement in competition.type.requirements.split(",") + competition.level.requirements.split(","):
-        if requirement.strip():
-            for athlete in athletes:
-                if (
-                    not athlete.organization.external
-                    and not athlete.info.filter(
-                        type=requirement.strip(),
-                        date_start__lte=competition.date_start,
-                        date_end__gte=competition.date_start,
-                    ).count()
-                ):
-                    return False
-    return True
+        return [result.athlete]
+    return list(result.team_members.all())
 
 
 class Command(BaseCommand):
@@ -87,48 +86,89 @@ class Command(BaseCommand):
             logger.info(text)
 
     def approve_results(self, date_limit):
-        """Approve public results which have not been modified during date limits"""
-        for result in Result.objects.filter(updated_at__lt=date_limit, approved=False, public=True):
-            if _check_requirements(result):
-                result.approved = True
-                self.output("Result approved: %s" % result)
-                if not self.list_only:
-                    result.save()
-            else:
-                self.output("Requirements not met: %s" % result)
+        """Approve public results which have not been modified during date limits
+
+        Results are processed in chunks, with a single query for the athlete requirements and a bulk update for
+        the approved results in each chunk.
+        """
+        pks = list(
+            Result.objects.filter(updated_at__lt=date_limit, approved=False, public=True)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        for index in range(0, len(pks), CHUNK_SIZE):
+            results = list(
+                Result.objects.filter(pk__in=pks[index : index + CHUNK_SIZE])
+                .select_related("competition__type", "competition__level", "athlete__organization")
+                .prefetch_related("team_members__organization")
+                .order_by("pk")
+            )
+            athletes = {result.pk: _get_athletes(result) for result in results}
+            coverage = get_coverage(
+                [
+                    athlete.pk
+                    for result in results
+                    if get_requirements(result.competition)
+                    for athlete in athletes[result.pk]
+                ]
+            )
+            approved = []
+            for result in results:
+                if get_missing_requirement(result.competition, athletes[result.pk], coverage) is None:
+                    result.approved = True
+                    approved.append(result)
+                    self.output("Result approved: %s" % result)
+                else:
+                    self.output("Requirements not met: %s" % result)
+            if approved and not self.list_only:
+                self._save_approved_results(approved)
+
+    @staticmethod
+    def _save_approved_results(results):
+        """Save approved results with a bulk update and log the changes"""
+        now = timezone.now()
+        for result in results:
+            result.updated_at = now
+        with transaction.atomic():
+            Result.objects.bulk_update(results, ["approved", "updated_at"])
+            log_bulk_changes(Result, results, CHANGE, [{"changed": {"fields": ["approved: True"]}}])
+        for competition_id in {result.competition_id for result in results}:
+            mark_changed(competition_id)
+            delete_snapshot(competition_id)
 
     def approve_records(self, date_limit):
         """Approve records which have not been modified during date limits"""
-        for record in Record.objects.filter(updated_at__lt=date_limit, approved=False):
-            record.approved = True
-            self.output("Record approved: %s" % record)
-            if not self.list_only:
-                record.save()
+        records = approval_order(Record.objects.filter(updated_at__lt=date_limit, approved=False))
+        if self.list_only:
+            for record in records:
+                self.output("Record approved: %s" % record)
+        else:
+            for record in approve_records(records):
+                self.output("Record approved: %s" % record)
 
     def lock_competitions(self, date_limit):
         """Lock past competitions which have not been modified during date limit"""
+        unapproved = Result.objects.filter(competition=OuterRef("pk"), updated_at__lt=date_limit).exclude(
+            approved=True
+        )
         for competition in Competition.objects.filter(
             date_end__lte=date_limit, updated_at__lt=date_limit, locked=False
-        ):
-            if (
-                Result.objects.filter(competition=competition, updated_at__lt=date_limit)
-                .exclude(approved=True)
-                .count()
-                == 0
-            ):
-                competition.locked = True
-                self.output("Competition locked: %s" % competition)
-                if not self.list_only:
-                    competition.save()
+        ).exclude(Exists(unapproved)):
+            competition.locked = True
+            self.output("Competition locked: %s" % competition)
+            if not self.list_only:
+                competition.save()
 
     def lock_events(self, date_limit):
         """Lock past events which have not been modified during date limit"""
-        for event in Event.objects.filter(date_end__lte=date_limit, updated_at__lt=date_limit, locked=False):
-            if Competition.objects.filter(event=event, updated_at__lt=date_limit).exclude(locked=True).count() == 0:
-                event.locked = True
-                self.output("Event locked: %s" % event)
-                if not self.list_only:
-                    event.save()
+        unlocked = Competition.objects.filter(event=OuterRef("pk"), updated_at__lt=date_limit).exclude(locked=True)
+        for event in Event.objects.filter(date_end__lte=date_limit, updated_at__lt=date_limit, locked=False).exclude(
+            Exists(unlocked)
+        ):
+            event.locked = True
+            self.output("Event locked: %s" % event)
+            if not self.list_only:
+                event.save()
 
     def handle(self, *args, **options):
         days = options["days"]
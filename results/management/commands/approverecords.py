@@ -9,6 +9,7 @@ import datetime
 from django.core.management.base import BaseCommand
 
 from results.models.records import Record
+from results.utils.record_approval import approve_records
 
 
 class Command(BaseCommand):
@@ -27,14 +28,10 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         date = options["date"]
 
-        def approve_records(records):
-            for record in records:
+        def approve(records):
+            for record in approve_records(records):
                 print(str(record) + ": " + str(record.date_start) + ": " + str(record.result.result))
-                updated = Record.objects.filter(pk=record.pk, approved=False, date_end=None).first()
-                if updated:
-                    print("Approved record")
-                    updated.approved = True
-                    updated.save()
+                print("Approved record")
 
         if date:
             record_list = Record.objects.filter(
@@ -44,7 +41,7 @@ class Command(BaseCommand):
             record_list = Record.objects.filter(date_end=None, partial_result=None, approved=False).order_by(
                 "date_start", "-result__result"
             )
-        approve_records(record_list)
+        approve(record_list)
         if date:
             record_list = Record.objects.filter(date_end=None, approved=False, date_start__lte=date).order_by(
                 "date_start", "-partial_result__value"
@@ -53,4 +50,4 @@ class Command(BaseCommand):
             record_list = Record.objects.filter(date_end=None, approved=False).order_by(
                 "date_start", "-partial_result__value"
             )
-        approve_records(record_list)
+        approve(record_list)
@@ -0,0 +1,95 @@
+"""
+Check that indexes for the hot queries exist and show query plans
+
+usage: ./manage.py checkindexes [--explain]
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from results.models.athletes import AthleteInformation, AthleteSearchToken
+from results.models.records import Record
+from results.models.results import Result
+
+
+def _hot_queries():
+    """
+    Returns hot queries by name, matching the filters in record checks, result validation, athlete information
+    visibility, licensed athletes, athlete search and approve command.
+    """
+    today = date.today()
+    return {
+        "record check": Record.objects.filter(
+            level=0,
+            type=0,
+            category=0,
+            partial_result=None,
+            historical=False,
+            date_end=None,
+            date_start__lte=today,
+        ),
+        "record history": Record.objects.filter(
+            level=0, type=0, category=0, partial_type=None, approved=True, historical=False, date_start__lte=today
+        ),
+        "result existence": Result.objects.filter(competition=0, athlete=0, category=0),
+        "team result existence": Result.objects.filter(competition=0, last_name="", category=0),
+        "athlete requirement": AthleteInformation.objects.filter(
+            athlete=0, type="", date_start__lte=today, date_end__gte=today
+        ),
+        "athlete information visibility": AthleteInformation.objects.filter(
+            athlete__in=[0], visibility__in=["P"], date_start__lte=today, date_end__gte=today
+        ),
+        "licensed athletes": AthleteInformation.objects.filter(
+            type="", sport=0, date_end__gte=today, date_start__lte=today, visibility__in=["P"]
+        ),
+        "athlete search": AthleteSearchToken.objects.filter(token__in=[""]),
+        "approve results": Result.objects.filter(updated_at__lt=timezone.now(), approved=False, public=True),
+        "approve records": Record.objects.filter(updated_at__lt=timezone.now(), approved=False),
+    }
+
+
+def get_missing_indexes():
+    """
+    Returns indexes defined in the models, but missing from the database.
+
+    :return: list of (table name, columns) tuples
+    :rtype: list
+    """
+    missing = []
+    with connection.cursor() as cursor:
+        for model in [AthleteInformation, AthleteSearchToken, Record, Result]:
+            table = model._meta.db_table
+            existing = [
+                constraint["columns"]
+                for constraint in connection.introspection.get_constraints(cursor, table).values()
+                if constraint["index"] or constraint["unique"]
+            ]
+            for index in model._meta.indexes:
+                columns = [model._meta.get_field(field).column for field in index.fields]
+                if columns not in existing:
+                    missing.append((table, columns))
+    return missing
+
+
+class Command(BaseCommand):
+    """Check indexes"""
+
+    help = "Check that indexes for the hot queries exist and show query plans"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--explain", action="store_true", dest="explain", help="Show query plans.")
+
+    def handle(self, *args, **options):
+        missing = get_missing_indexes()
+        for table, columns in missing:
+            self.stderr.write("Missing index: %s (%s)" % (table, ", ".join(columns)))
+        if options["explain"]:
+            for name, queryset in _hot_queries().items():
+                self.stdout.write("%s:\n%s\n" % (name, queryset.explain()))
+        if missing:
+            raise CommandError("Missing indexes, run migrations.")
+        if options["verbosity"]:
+            self.stdout.write("All indexes exist.")
@@ -0,0 +1,47 @@
+"""
+Export public competitions, results and records as open data files
+
+Export changed seasons and sports, run periodically i.e. nightly from cron:
+
+usage: ./manage.py exportopendata [--output /path/to/open-data/]
+
+Export given seasons and sports, including unchanged files:
+
+usage: ./manage.py exportopendata 2023 2024 [--sport 1] [--force]
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from results.utils.open_data import export_open_data
+
+
+class Command(BaseCommand):
+    """Export open data files"""
+
+    help = "Export public competitions, results and records by season and sport as compressed NDJSON and CSV files"
+
+    def add_arguments(self, parser):
+        parser.add_argument("seasons", type=int, nargs="*", help="Seasons to export, default all.")
+        parser.add_argument(
+            "--sport", type=int, action="append", dest="sports", help="Sport id to export, default all sports."
+        )
+        parser.add_argument(
+            "--output",
+            type=str,
+            action="store",
+            dest="output",
+            help="Export directory, default OPEN_DATA_ROOT setting.",
+        )
+        parser.add_argument("--force", action="store_true", dest="force", help="Export unchanged files.")
+
+    def handle(self, *args, **options):
+        directory = options["output"] or settings.OPEN_DATA_ROOT
+        if not directory:
+            raise CommandError("Give --output or set OPEN_DATA_ROOT.")
+        exported = export_open_data(
+            directory, seasons=options["seasons"], sports=options["sports"], force=options["force"]
+        )
+        if options["verbosity"]:
+            for entry in exported:
+                self.stdout.write("Exported: %s (%s rows)" % (entry["path"], entry["rows"]))
@@ -0,0 +1,33 @@
+"""
+Remove old deleted results from the result change feed
+
+Run periodically, i.e. nightly from cron:
+
+usage: ./manage.py prunetombstones [--days 30]
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from results.utils.change_feed import prune_tombstones
+
+
+class Command(BaseCommand):
+    """Remove old result tombstones"""
+
+    help = "Remove deleted results older than given days from the result change feed"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            action="store",
+            dest="days",
+            help="Remove tombstones older than days, default RESULT_CHANGE_FEED_TOMBSTONE_DAYS setting.",
+        )
+
+    def handle(self, *args, **options):
+        days = options["days"] if options["days"] is not None else settings.RESULT_CHANGE_FEED_TOMBSTONE_DAYS
+        count = prune_tombstones(days)
+        if options["verbosity"]:
+            self.stdout.write("Tombstones removed: %s" % count)
@@ -0,0 +1,26 @@
+"""
+Rebuild stored athlete's best results
+
+usage: ./manage.py updateathletebests [--athlete 1,2]
+"""
+
+from django.core.management.base import BaseCommand
+
+from results.utils.bests import rebuild_athlete_bests
+
+
+class Command(BaseCommand):
+    """Rebuild athlete bests"""
+
+    help = "Rebuild athlete's best results"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--athlete", type=str, action="store", dest="athlete", help="Comma separated athlete ids, default all."
+        )
+
+    def handle(self, *args, **options):
+        athletes = [int(athlete) for athlete in options["athlete"].split(",")] if options["athlete"] else None
+        count = rebuild_athlete_bests(athletes)
+        if options["verbosity"]:
+            self.stdout.write("Athlete bests updated: %s" % count)
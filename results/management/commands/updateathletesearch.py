@@ -0,0 +1,20 @@
+"""
+Rebuild athlete search tokens
+
+usage: ./manage.py updateathletesearch
+"""
+
+from django.core.management.base import BaseCommand
+
+from results.utils.athlete_search import rebuild_search_tokens
+
+
+class Command(BaseCommand):
+    """Rebuild athlete search tokens"""
+
+    help = "Rebuild athlete search tokens"
+
+    def handle(self, *args, **options):
+        count = rebuild_search_tokens()
+        if options["verbosity"]:
+            self.stdout.write("Athlete search tokens updated: %s" % count)
@@ -0,0 +1,48 @@
+"""
+Recalculate stored points tables
+
+Process queued competitions, run periodically i.e. from cron:
+
+usage: ./manage.py updatepoints --queue
+
+Recalculate all competitions for a year:
+
+usage: ./manage.py updatepoints 2024 [--table pohjolan-malja]
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from results.models.statistics import PointsTable
+from results.utils.points import process_queue, update_points
+
+
+class Command(BaseCommand):
+    """Recalculate points tables"""
+
+    help = "Recalculate points tables for a year or process queued competitions"
+
+    def add_arguments(self, parser):
+        parser.add_argument("year", type=int, nargs="?", help="Year to recalculate, i.e. 2024.")
+        parser.add_argument(
+            "--table", type=str, action="store", dest="table", help="Points table slug, default all tables."
+        )
+        parser.add_argument("--queue", action="store_true", dest="queue", help="Recalculate queued competitions.")
+
+    def handle(self, *args, **options):
+        if not options["year"] and not options["queue"]:
+            raise CommandError("Give a year or --queue.")
+        if options["queue"]:
+            count = process_queue()
+            if options["verbosity"]:
+                self.stdout.write("Queued competitions updated: %s" % count)
+        if not options["year"]:
+            return
+        tables = PointsTable.objects.all()
+        if options["table"]:
+            tables = tables.filter(slug=options["table"])
+            if not tables:
+                raise CommandError("Unknown points table: %s" % options["table"])
+        for table in tables.prefetch_related("types"):
+            update_points(table, options["year"])
+            if options["verbosity"]:
+                self.stdout.write("Points updated: %s %s" % (table.slug, options["year"]))
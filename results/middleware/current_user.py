@@ -1,22 +1,46 @@
-from threading import local
+from contextvars import ContextVar
 
-_local = local()
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+_request = ContextVar("current_request", default=None)
 
 
 def get_current_user():
-    return getattr(_local, "user", None)
+    """
+    Returns the user of the current request, or None outside requests.
+
+    User is read when called, so the user authenticated by the API view is returned.
+    """
+    return getattr(_request.get(), "user", None)
 
 
 class CurrentUserMiddleware(object):
     """Middleware for getting a request user value.
 
-    Used in writing change log.
+    Used in writing change log. Request is stored in a context variable, so it is separate for each request in
+    both sync and async requests.
     """
 
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
-        response = self.get_response(request)
-        _local.user = request.user
-        return response
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _request.set(request)
+        try:
+            return self.get_response(request)
+        finally:
+            _request.reset(token)
+
+    async def __acall__(self, request):
+        token = _request.set(request)
+        try:
+            return await self.get_response(request)
+        finally:
+            _request.reset(token)
@@ -0,0 +1,71 @@
+import hashlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+
+from results.db_router import reset_replica_reads, set_replica_reads
+from results.utils.cache import is_shared_cache
+
+
+class ReplicaMiddleware(object):
+    """Middleware for routing reads of safe method requests to the read replicas.
+
+    Client is kept on the default database for REPLICA_STICKY_SECONDS after its write request, so it reads its own
+    writes. Client is identified by the authorization header or the session cookie.
+
+    Sticky clients are stored in the cache, so it must be shared between the workers. With a per-process cache, the
+    other workers would not see the write, so identified clients always read from the default database.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def _get_sticky_key(request, response=None):
+        credentials = request.META.get("HTTP_AUTHORIZATION")
+        if not credentials and response is not None and settings.SESSION_COOKIE_NAME in response.cookies:
+            credentials = response.cookies[settings.SESSION_COOKIE_NAME].value
+        if not credentials:
+            credentials = request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+        if not credentials:
+            return None
+        return "replica_sticky_" + hashlib.sha256(credentials.encode()).hexdigest()
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        key = self._get_sticky_key(request)
+        token = set_replica_reads(
+            request.method in SAFE_METHODS and not (key and (not is_shared_cache() or cache.get(key)))
+        )
+        try:
+            response = self.get_response(request)
+        finally:
+            reset_replica_reads(token)
+        if request.method not in SAFE_METHODS:
+            key = self._get_sticky_key(request, response)
+            if key:
+                cache.set(key, True, getattr(settings, "REPLICA_STICKY_SECONDS", 10))
+        return response
+
+    async def __acall__(self, request):
+        key = self._get_sticky_key(request)
+        token = set_replica_reads(
+            request.method in SAFE_METHODS and not (key and (not is_shared_cache() or await cache.aget(key)))
+        )
+        try:
+            response = await self.get_response(request)
+        finally:
+            reset_replica_reads(token)
+        if request.method not in SAFE_METHODS:
+            key = self._get_sticky_key(request, response)
+            if key:
+                await cache.aset(key, True, getattr(settings, "REPLICA_STICKY_SECONDS", 10))
+        return response
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.8 on 2026-10-19 02:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("results", "0020_result_public"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ResultTombstone",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("result_id", models.IntegerField(verbose_name="Result ID")),
+                ("competition_id", models.IntegerField(verbose_name="Competition ID")),
+                ("deleted_at", models.DateTimeField(auto_now_add=True, verbose_name="Deleted at")),
+            ],
+            options={
+                "verbose_name": "Deleted result",
+                "verbose_name_plural": "Deleted results",
+                "ordering": ["deleted_at", "result_id"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="result",
+            index=models.Index(fields=["competition", "updated_at", "id"], name="results_res_competi_ee67ca_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="resulttombstone",
+            index=models.Index(fields=["competition_id", "deleted_at"], name="results_res_competi_a2db1c_idx"),
+        ),
+    ]
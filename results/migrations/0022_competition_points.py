@@ -0,0 +1,42 @@
+# Generated by Django 5.2.8 on 2026-10-19 02:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("results", "0021_result_change_feed"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CompetitionPoints",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("table", models.CharField(max_length=50, verbose_name="Points table")),
+                ("year", models.SmallIntegerField(verbose_name="Year")),
+                ("value", models.IntegerField(verbose_name="Value")),
+                (
+                    "competition",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="points", to="results.competition"
+                    ),
+                ),
+                (
+                    "organization",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="points", to="results.organization"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Competition points",
+                "verbose_name_plural": "Competition points",
+                "ordering": ["table", "year", "-value"],
+                "indexes": [models.Index(fields=["table", "year"], name="results_com_table_a85323_idx")],
+                "unique_together": {("table", "competition", "organization")},
+            },
+        ),
+    ]
@@ -0,0 +1,158 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_pohjolan_malja(apps, schema_editor):
+    """
+    Creates Pohjolan malja points table, replacing the POINTS_TABLES setting.
+    """
+    PointsTable = apps.get_model("results", "PointsTable")
+    PointsTable.objects.create(
+        name="Pohjolan malja",
+        slug="pohjolan-malja",
+        description="Organization points from SM competitions.",
+        levels="SM",
+        points="8,7,6,5,4,3,2,1",
+        external="move",
+        ties="full",
+        group_by="organization",
+        public=False,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("results", "0022_competition_points"),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name="CompetitionPoints",
+        ),
+        migrations.CreateModel(
+            name="PointsTable",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=255, verbose_name="Name")),
+                ("slug", models.SlugField(unique=True, verbose_name="Slug")),
+                ("description", models.TextField(blank=True, verbose_name="Description")),
+                (
+                    "levels",
+                    models.CharField(
+                        help_text="Comma separated level abbreviations",
+                        max_length=255,
+                        verbose_name="Competition levels",
+                    ),
+                ),
+                (
+                    "points",
+                    models.CharField(
+                        help_text="Comma separated points for positions, i.e. 3,2,1",
+                        max_length=255,
+                        verbose_name="Points",
+                    ),
+                ),
+                (
+                    "external",
+                    models.CharField(
+                        choices=[
+                            ("move", "Move following positions up"),
+                            ("ignore", "Ignore external results"),
+                            ("include", "Include external organizations"),
+                        ],
+                        default="move",
+                        max_length=10,
+                        verbose_name="External results",
+                    ),
+                ),
+                (
+                    "ties",
+                    models.CharField(
+                        choices=[
+                            ("full", "Full points for tied positions"),
+                            ("split", "Split points between tied positions"),
+                        ],
+                        default="full",
+                        max_length=10,
+                        verbose_name="Tied positions",
+                    ),
+                ),
+                (
+                    "group_by",
+                    models.CharField(
+                        choices=[("organization", "Organization"), ("area", "Area"), ("athlete", "Athlete")],
+                        default="organization",
+                        max_length=20,
+                        verbose_name="Group by",
+                    ),
+                ),
+                ("public", models.BooleanField(default=False, verbose_name="Public")),
+                (
+                    "types",
+                    models.ManyToManyField(
+                        blank=True,
+                        help_text="Limit to competition types, default all types",
+                        to="results.competitiontype",
+                        verbose_name="Competition types",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Points table",
+                "verbose_name_plural": "Points tables",
+                "ordering": ["name"],
+            },
+        ),
+        migrations.CreateModel(
+            name="CompetitionPoints",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("group_id", models.PositiveIntegerField(verbose_name="Group")),
+                ("year", models.SmallIntegerField(verbose_name="Year")),
+                ("value", models.DecimalField(decimal_places=2, max_digits=10, verbose_name="Value")),
+                (
+                    "competition",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="points", to="results.competition"
+                    ),
+                ),
+                (
+                    "table",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="competition_points",
+                        to="results.pointstable",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Competition points",
+                "verbose_name_plural": "Competition points",
+                "ordering": ["table", "year", "-value"],
+                "indexes": [models.Index(fields=["table", "year"], name="results_com_table_i_4a0255_idx")],
+                "unique_together": {("table", "competition", "group_id")},
+            },
+        ),
+        migrations.CreateModel(
+            name="PointsQueue",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "competition",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="+", to="results.competition"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Points queue",
+                "verbose_name_plural": "Points queue",
+                "ordering": ["created_at"],
+            },
+        ),
+        migrations.RunPython(create_pohjolan_malja, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.8 on 2026-10-19 02:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("results", "0023_points_tables"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="athleteinformation",
+            index=models.Index(
+                fields=["athlete", "type", "date_start", "date_end"], name="results_ath_athlete_eb0c8f_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="athleteinformation",
+            index=models.Index(
+                fields=["athlete", "visibility", "date_start", "date_end"], name="results_ath_athlete_ceda97_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="record",
+            index=models.Index(
+                fields=["level", "type", "category", "partial_result", "historical", "date_end", "date_start"],
+                name="results_rec_level_i_f585f2_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="record",
+            index=models.Index(fields=["approved", "updated_at"], name="results_rec_approve_22a371_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="result",
+            index=models.Index(fields=["competition", "athlete", "category"], name="results_res_competi_3ae788_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="result",
+            index=models.Index(fields=["competition", "last_name", "category"], name="results_res_competi_d93a02_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="result",
+            index=models.Index(fields=["approved", "public", "updated_at"], name="results_res_approve_d51ce2_idx"),
+        ),
+    ]
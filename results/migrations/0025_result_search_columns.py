@@ -0,0 +1,115 @@
+# Generated by Django 5.2.8 on 2026-10-19 02:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_search_columns(apps, schema_editor):
+    """
+    Copies competition and organization information to the existing results.
+    """
+    Competition = apps.get_model("results", "Competition")
+    Organization = apps.get_model("results", "Organization")
+    Result = apps.get_model("results", "Result")
+    competition = Competition.objects.filter(pk=OuterRef("competition"))
+    Result.objects.update(
+        competition_sport=Subquery(competition.values("type__sport")[:1]),
+        competition_type=Subquery(competition.values("type")[:1]),
+        competition_level=Subquery(competition.values("level")[:1]),
+        competition_date_start=Subquery(competition.values("date_start")[:1]),
+        competition_date_end=Subquery(competition.values("date_end")[:1]),
+        competition_trial=Subquery(competition.values("trial")[:1]),
+    )
+    Result.objects.filter(organization__in=Organization.objects.filter(external=True)).update(
+        organization_external=True
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("results", "0024_hot_lookup_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="result",
+            name="competition_date_end",
+            field=models.DateField(editable=False, null=True, verbose_name="End date"),
+        ),
+        migrations.AddField(
+            model_name="result",
+            name="competition_date_start",
+            field=models.DateField(editable=False, null=True, verbose_name="Start date"),
+        ),
+        migrations.AddField(
+            model_name="result",
+            name="competition_level",
+            field=models.ForeignKey(
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="results.competitionlevel",
+                verbose_name="Competition level",
+            ),
+        ),
+        migrations.AddField(
+            model_name="result",
+            name="competition_sport",
+            field=models.ForeignKey(
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="results.sport",
+                verbose_name="Sport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="result",
+            name="competition_trial",
+            field=models.BooleanField(default=False, editable=False, verbose_name="Trial competition"),
+        ),
+        migrations.AddField(
+            model_name="result",
+            name="competition_type",
+            field=models.ForeignKey(
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="results.competitiontype",
+                verbose_name="Competition type",
+            ),
+        ),
+        migrations.AddField(
+            model_name="result",
+            name="organization_external",
+            field=models.BooleanField(default=False, editable=False, verbose_name="External"),
+        ),
+        migrations.RunPython(copy_search_columns, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="result",
+            index=models.Index(
+                fields=["competition_sport", "competition_date_start"], name="results_res_competi_6c1df7_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="result",
+            index=models.Index(
+                fields=["competition_type", "competition_date_start"], name="results_res_competi_120c5d_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="result",
+            index=models.Index(
+                fields=["competition_level", "competition_date_start"], name="results_res_competi_fe17c7_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="result",
+            index=models.Index(fields=["category", "competition_date_start"], name="results_res_categor_3b7615_idx"),
+        ),
+    ]
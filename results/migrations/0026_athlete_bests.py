@@ -0,0 +1,85 @@
+# Generated by Django 5.2.8 on 2026-10-19 02:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("results", "0025_result_search_columns"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AthleteBest",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("season", models.SmallIntegerField(verbose_name="Season")),
+                ("value", models.DecimalField(decimal_places=3, max_digits=12, null=True, verbose_name="Result")),
+                (
+                    "athlete",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="bests", to="results.athlete"
+                    ),
+                ),
+                (
+                    "category",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="+", to="results.category"
+                    ),
+                ),
+                (
+                    "result",
+                    models.ForeignKey(
+                        null=True, on_delete=django.db.models.deletion.CASCADE, related_name="+", to="results.result"
+                    ),
+                ),
+                (
+                    "type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="+", to="results.competitiontype"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Athlete best",
+                "verbose_name_plural": "Athlete bests",
+                "ordering": ["athlete", "type", "category", "-season"],
+                "unique_together": {("athlete", "type", "category", "season")},
+            },
+        ),
+        migrations.CreateModel(
+            name="AthleteBestPartial",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("value", models.DecimalField(decimal_places=3, max_digits=12, verbose_name="Value")),
+                (
+                    "best",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="partials", to="results.athletebest"
+                    ),
+                ),
+                (
+                    "partial",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="+", to="results.resultpartial"
+                    ),
+                ),
+                (
+                    "type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="results.competitionresulttype",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Athlete best partial",
+                "verbose_name_plural": "Athlete best partials",
+                "ordering": ["best", "type"],
+                "unique_together": {("best", "type")},
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.8 on 2026-10-19 02:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_partial_type(apps, schema_editor):
+    """
+    Copies partial result type to the existing records.
+    """
+    Record = apps.get_model("results", "Record")
+    ResultPartial = apps.get_model("results", "ResultPartial")
+    Record.objects.filter(partial_result__isnull=False).update(
+        partial_type=Subquery(ResultPartial.objects.filter(pk=OuterRef("partial_result")).values("type")[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("results", "0026_athlete_bests"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="record",
+            name="partial_type",
+            field=models.ForeignKey(
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="results.competitionresulttype",
+                verbose_name="Partial result type",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="record",
+            index=models.Index(
+                fields=["level", "type", "category", "partial_type", "date_start"],
+                name="results_rec_level_i_365dca_idx",
+            ),
+        ),
+        migrations.RunPython(copy_partial_type, migrations.RunPython.noop),
+    ]
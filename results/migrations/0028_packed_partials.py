@@ -0,0 +1,58 @@
+# Generated by Django 5.2.8 on 2026-10-19 02:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+import results.mixins.change_log
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("results", "0027_record_partial_type"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="competitionresulttype",
+            name="packed",
+            field=models.BooleanField(
+                default=False,
+                help_text=(
+                    "Store partial results of this type in a single row per result, i.e. for shot-by-shot series. "
+                    "Records are not checked for packed partial results."
+                ),
+                verbose_name="Packed",
+            ),
+        ),
+        migrations.CreateModel(
+            name="ResultPartialPacked",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("values", models.JSONField(default=list, verbose_name="Values")),
+                ("created_at", models.DateTimeField(auto_now_add=True, verbose_name="Created at")),
+                ("updated_at", models.DateTimeField(auto_now=True, verbose_name="Updated at")),
+                (
+                    "result",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="partial_packed", to="results.result"
+                    ),
+                ),
+                (
+                    "type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="results.competitionresulttype",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Packed partial results",
+                "verbose_name_plural": "Packed partial results",
+                "ordering": ["result", "type"],
+                "unique_together": {("result", "type")},
+            },
+            bases=(results.mixins.change_log.LogChangesMixing, models.Model),
+        ),
+    ]
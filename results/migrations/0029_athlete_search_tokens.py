@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-19 02:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("results", "0028_packed_partials"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AthleteSearchToken",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("token", models.CharField(max_length=30, verbose_name="Token")),
+                (
+                    "athlete",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="search_tokens", to="results.athlete"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Athlete search token",
+                "verbose_name_plural": "Athlete search tokens",
+                "indexes": [models.Index(fields=["token", "athlete"], name="results_ath_token_49f658_idx")],
+                "unique_together": {("athlete", "token")},
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-19 03:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("results", "0029_athlete_search_tokens"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="athleteinformation",
+            index=models.Index(fields=["type", "sport", "date_end"], name="results_ath_type_cfbf23_idx"),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.8 on 2026-10-19 03:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("results", "0030_athlete_information_type_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CompetitionSnapshot",
+            fields=[
+                (
+                    "competition",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="snapshot",
+                        serialize=False,
+                        to="results.competition",
+                    ),
+                ),
+                ("content", models.BinaryField(verbose_name="Content")),
+                ("created_at", models.DateTimeField(auto_now_add=True, verbose_name="Created at")),
+            ],
+            options={
+                "verbose_name": "Competition snapshot",
+                "verbose_name_plural": "Competition snapshots",
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.8 on 2026-10-19 03:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("results", "0031_competition_snapshot"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="competitionresulttype",
+            name="tiebreak",
+            field=models.SmallIntegerField(
+                blank=True,
+                help_text=(
+                    "Compare partial results of this type, starting from the last one, when positions are "
+                    "calculated for tied results. Types are compared in this order."
+                ),
+                null=True,
+                verbose_name="Tie-break order",
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-19 03:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("results", "0032_result_type_tiebreak"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="resulttombstone",
+            index=models.Index(fields=["deleted_at"], name="results_res_deleted_a3e6ae_idx"),
+        ),
+    ]
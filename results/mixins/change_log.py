@@ -1,3 +1,5 @@
+import json
+
 from django.conf import settings
 from django.contrib.admin.models import ADDITION, CHANGE, DELETION, LogEntry
 from django.contrib.contenttypes.models import ContentType
@@ -6,6 +8,36 @@ from django.forms.models import model_to_dict
 from results.middleware.current_user import get_current_user
 
 
+def log_bulk_changes(model, objects, action_flag, change_message):
+    """
+    Writes log entries for objects changed or deleted with bulk queries, in a single query.
+
+    :param model: model class
+    :param objects: changed or deleted objects
+    :param action_flag: log entry action flag
+    :param change_message: message, or function returning the message for an object
+    :type objects: list
+    :type action_flag: int
+    """
+    user = get_current_user()
+    user_id = user.id if user and user.id else settings.DEFAULT_LOG_USER_ID
+    content_type_id = ContentType.objects.get_for_model(model).pk
+    entries = []
+    for obj in objects:
+        message = change_message(obj) if callable(change_message) else change_message
+        entries.append(
+            LogEntry(
+                user_id=user_id,
+                content_type_id=content_type_id,
+                object_id=str(obj.pk),
+                object_repr=str(obj)[:200],
+                action_flag=action_flag,
+                change_message=json.dumps(message) if isinstance(message, list) else message,
+            )
+        )
+    LogEntry.objects.bulk_create(entries)
+
+
 class LogChangesMixing(object):
     """Logging mixing which writes changes to Django's admin log.
 
@@ -1,24 +1,71 @@
+from drf_queryfields import QueryFieldsMixin
+
+
 class EagerLoadingMixin:
     """
     Mixin to select_related and prefetch_related queries
     From the comments of http://ses4j.github.io/2015/11/23/optimizing-slow-django-rest-framework-performance/
+
+    If only some of the fields are serialized, relations are loaded only for those fields. Relations are matched to
+    the serializer fields by the first part of the lookup, or by _RELATED_FIELD_SOURCES if the relation has a
+    different name than the field.
     """
 
     @classmethod
-    def setup_eager_loading(cls, queryset, prefetch=None):
+    def get_requested_fields(cls, request):
+        """
+        Returns field names limited with the QueryFieldsMixin query parameters
+
+        :param request:
+        :return: field names to serialize or None if all fields are serialized
+        :rtype: set
+        """
+        if not issubclass(cls, QueryFieldsMixin) or request is None or request.method != "GET":
+            return None
+        include, exclude = (
+            {name for names in request.query_params.getlist(arg) for name in names.split(QueryFieldsMixin.delimiter)}
+            - {""}
+            for arg in (QueryFieldsMixin.include_arg_name, QueryFieldsMixin.exclude_arg_name)
+        )
+        if not include and not exclude:
+            return None
+        fields = set(cls.Meta.fields)
+        if include:
+            fields &= include
+        return fields - exclude
+
+    @classmethod
+    def _is_required(cls, lookup, fields):
+        """
+        Returns True if the relation lookup is needed for the fields
+        """
+        if fields is None:
+            return True
+        relation = lookup.split("__")[0]
+        return getattr(cls, "_RELATED_FIELD_SOURCES", {}).get(relation, relation) in fields
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, prefetch=None, fields=None):
         """
         Sets select_related and prefetch_related attributes to queryset if specified in serializer
 
         :param queryset:
         :param prefetch: list of Prefetch objects not included in _PREFETCH_RELATED_FIELDS
+        :param fields: field names to serialize, default all fields
+        :type fields: set
         :return: queryset including select_related and prefetch_related attributes
         :rtype: QuerySet
         """
         if hasattr(cls, "_SELECT_RELATED_FIELDS"):
-            queryset = queryset.select_related(*cls._SELECT_RELATED_FIELDS)
+            select_related = [lookup for lookup in cls._SELECT_RELATED_FIELDS if cls._is_required(lookup, fields)]
+            if select_related:
+                queryset = queryset.select_related(*select_related)
         if hasattr(cls, "_PREFETCH_RELATED_FIELDS"):
+            prefetch_related = [lookup for lookup in cls._PREFETCH_RELATED_FIELDS if cls._is_required(lookup, fields)]
             if prefetch:
-                queryset = queryset.prefetch_related(*prefetch, *cls._PREFETCH_RELATED_FIELDS)
-            else:
-                queryset = queryset.prefetch_related(*cls._PREFETCH_RELATED_FIELDS)
+                prefetch_related = [
+                    lookup for lookup in prefetch if cls._is_required(lookup.prefetch_through, fields)
+                ] + prefetch_related
+            if prefetch_related:
+                queryset = queryset.prefetch_related(*prefetch_related)
         return queryset
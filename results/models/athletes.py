@@ -98,6 +98,13 @@ class AthleteInformation(LogChangesMixing, models.Model):
     def __str__(self):
         return "%s, %s" % (self.athlete, self.type)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["athlete", "type", "date_start", "date_end"]),
+            models.Index(fields=["athlete", "visibility", "date_start", "date_end"]),
+            models.Index(fields=["type", "sport", "date_end"]),
+        ]
+
     @staticmethod
     def get_visibility(user):
         """
@@ -165,3 +172,27 @@ class AthleteInformation(LogChangesMixing, models.Model):
     @allow_staff_or_superuser
     def has_create_permission(request):
         return False
+
+
+class AthleteSearchToken(models.Model):
+    """Stores a prefix of athlete's normalized name or sport ID for the athlete search.
+
+    Related to
+      - :class:`.athletes.Athlete`
+
+    Tokens are updated automatically, see :mod:`results.utils.athlete_search`.
+    """
+
+    athlete = models.ForeignKey(Athlete, on_delete=models.CASCADE, related_name="search_tokens")
+    token = models.CharField(max_length=30, verbose_name=_("Token"))
+
+    def __str__(self):
+        return "%s : %s" % (self.athlete_id, self.token)
+
+    class Meta:
+        verbose_name = _("Athlete search token")
+        verbose_name_plural = _("Athlete search tokens")
+        indexes = [
+            models.Index(fields=["token", "athlete"]),
+        ]
+        unique_together = ("athlete", "token")
@@ -183,6 +183,23 @@ class CompetitionResultType(LogChangesMixing, models.Model):
         blank=True, null=True, max_digits=12, decimal_places=3, verbose_name=_("Minimum result")
     )
     records = models.BooleanField(default=True, verbose_name=_("Check records"))
+    packed = models.BooleanField(
+        default=False,
+        verbose_name=_("Packed"),
+        help_text=_(
+            "Store partial results of this type in a single row per result, i.e. for shot-by-shot series. "
+            "Records are not checked for packed partial results."
+        ),
+    )
+    tiebreak = models.SmallIntegerField(
+        null=True,
+        blank=True,
+        verbose_name=_("Tie-break order"),
+        help_text=_(
+            "Compare partial results of this type, starting from the last one, when positions are calculated for "
+            "tied results. Types are compared in this order."
+        ),
+    )
 
     def __str__(self):
         return "%s %s" % (self.competition_type, self.abbreviation)
@@ -292,6 +309,12 @@ class Competition(LogChangesMixing, models.Model):
             return True
         return False
 
+    def has_object_positions_permission(self, request):
+        return self.has_object_update_permission(request)
+
+    def has_object_import_results_permission(self, request):
+        return self.has_object_update_permission(request)
+
     @authenticated_users
     @allow_staff_or_superuser
     def has_object_update_permission(self, request):
@@ -307,3 +330,27 @@ class Competition(LogChangesMixing, models.Model):
         if self.type.sport.is_manager(request.user):
             return True
         return False
+
+
+class CompetitionSnapshot(models.Model):
+    """Stores the rendered public result list of a locked and approved competition.
+
+    Related to
+     - :class:`.competitions.Competition`
+
+    Result list is stored as zlib compressed JSON and served to anonymous users, see
+    :mod:`results.utils.snapshots`. Snapshot is removed when the competition or its results are changed.
+    """
+
+    competition = models.OneToOneField(
+        Competition, on_delete=models.CASCADE, primary_key=True, related_name="snapshot"
+    )
+    content = models.BinaryField(verbose_name=_("Content"))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created at"))
+
+    def __str__(self):
+        return "%s" % self.competition
+
+    class Meta:
+        verbose_name = _("Competition snapshot")
+        verbose_name_plural = _("Competition snapshots")
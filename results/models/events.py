@@ -6,6 +6,7 @@ from dry_rest_permissions.generics import allow_staff_or_superuser, authenticate
 from results.mixins.change_log import LogChangesMixing
 from results.models.athletes import Athlete
 from results.models.organizations import Organization
+from results.utils.cache import get_user_groups
 
 
 class Event(LogChangesMixing, models.Model):
@@ -125,7 +126,7 @@ class EventContact(LogChangesMixing, models.Model):
             self.event.organization
             and self.event.organization.is_area_manager(request.user)
             or self.event.organization
-            and self.event.organization.group in request.user.groups.all()
+            and self.event.organization.group_id in get_user_groups(request.user.pk)
             and not self.event.locked
         ):
             return True
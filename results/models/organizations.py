@@ -5,6 +5,7 @@ from django.utils.translation import gettext_lazy as _
 from dry_rest_permissions.generics import allow_staff_or_superuser
 
 from results.mixins.change_log import LogChangesMixing
+from results.utils.cache import get_membership, get_user_groups
 
 
 class Area(LogChangesMixing, models.Model):
@@ -59,7 +60,7 @@ class OrganizationManager(models.Manager):
         :param user: user object
         :return: queryset
         """
-        groups = user.groups.all()
+        groups = get_user_groups(user.pk)
         return self.filter(Q(group__in=groups) | Q(areas__manager__in=groups))
 
 
@@ -96,13 +97,7 @@ class Organization(LogChangesMixing, models.Model):
         :param user: user object
         :return: bool
         """
-        groups = user.groups.all()
-        try:
-            Organization.objects.filter(Q(group__in=groups) | Q(areas__manager__in=groups)).distinct().get(pk=self.pk)
-            return True
-        except Organization.DoesNotExist:
-            pass
-        return False
+        return self.pk in get_membership(user.pk)["organizations"]
 
     def is_area_manager(self, user):
         """Check if user has is area manager for the organization
@@ -110,13 +105,7 @@ class Organization(LogChangesMixing, models.Model):
         :param user: user object
         :return: bool
         """
-        groups = user.groups.all()
-        try:
-            Organization.objects.filter(areas__manager__in=groups).distinct().get(pk=self.pk)
-            return True
-        except Organization.DoesNotExist:
-            pass
-        return False
+        return self.pk in get_membership(user.pk)["area_organizations"]
 
     @staticmethod
     def has_read_permission(request):
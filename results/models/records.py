@@ -4,10 +4,15 @@ from dry_rest_permissions.generics import allow_staff_or_superuser, authenticate
 
 from results.mixins.change_log import LogChangesMixing
 from results.models.categories import Category
-from results.models.competitions import CompetitionLevel, CompetitionType
+from results.models.competitions import (
+    CompetitionLevel,
+    CompetitionResultType,
+    CompetitionType,
+)
 from results.models.organizations import Area
 from results.models.results import Result, ResultPartial
-from results.utils.cache import get_user_groups
+from results.utils.cache import get_membership
+from results.utils.record_approval import supersede_records
 
 
 class RecordLevel(LogChangesMixing, models.Model):
@@ -73,6 +78,9 @@ class Record(LogChangesMixing, models.Model):
      - :class:`.categories.Category`
      - :class:`.competitions.CompetitionType`
      - :class:`.results.Result`
+
+    Records with the same level, type, category and partial result type form a chain, where each approved record
+    is valid from its start date until the start date of the next record, see :mod:`results.utils.record_history`.
     """
 
     result = models.ForeignKey(Result, related_name="record", on_delete=models.CASCADE)
@@ -87,6 +95,14 @@ class Record(LogChangesMixing, models.Model):
     date_end = models.DateField(null=True, blank=True, verbose_name=_("End date"))
     info = models.TextField(blank=True, verbose_name=_("Info"))
     historical = models.BooleanField(default=False, verbose_name=_("Historical"))
+    partial_type = models.ForeignKey(
+        CompetitionResultType,
+        null=True,
+        editable=False,
+        related_name="+",
+        on_delete=models.CASCADE,
+        verbose_name=_("Partial result type"),
+    )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created at"))
     updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated at"))
 
@@ -95,41 +111,25 @@ class Record(LogChangesMixing, models.Model):
 
     def save(self, *args, **kwargs):
         """
+        Set partial result type from the partial result.
         When saved, end approved and delete unapproved lower records.
         """
+        self.partial_type_id = self.partial_result.type_id if self.partial_result else None
         super().save(*args, **kwargs)
         if self.approved and "approved" in self.changed_fields:
-            if self.partial_result:
-                records = Record.objects.filter(
-                    level=self.level,
-                    type=self.type,
-                    date_end=None,
-                    category=self.category,
-                    historical=False,
-                    partial_result__type=self.partial_result.type,
-                    partial_result__value__lt=self.partial_result.value,
-                )
-            else:
-                records = Record.objects.filter(
-                    level=self.level,
-                    type=self.type,
-                    date_end=None,
-                    category=self.category,
-                    historical=False,
-                    partial_result=None,
-                    result__result__lt=self.result.result,
-                )
-            for record in records:
-                if record.approved:
-                    record.date_end = self.date_start
-                    record.save()
-                else:
-                    record.delete()
+            supersede_records(self)
 
     class Meta:
         ordering = ["type", "result"]
         verbose_name = _("Record")
         verbose_name_plural = _("Records")
+        indexes = [
+            models.Index(
+                fields=["level", "type", "category", "partial_result", "historical", "date_end", "date_start"]
+            ),
+            models.Index(fields=["approved", "updated_at"]),
+            models.Index(fields=["level", "type", "category", "partial_type", "date_start"]),
+        ]
 
     @staticmethod
     def has_read_permission(request):
@@ -150,17 +150,8 @@ class Record(LogChangesMixing, models.Model):
     @authenticated_users
     @allow_staff_or_superuser
     def has_object_update_permission(self, request):
-        user_groups = get_user_groups(request.user.pk)
-        if (
-            self.level.area
-            and self.level.area.manager
-            and self.level.area.manager in user_groups
-            or self.type.sport
-            and self.type.sport.manager
-            and self.type.sport.manager in user_groups
-        ):
-            return True
-        return False
+        membership = get_membership(request.user.pk)
+        return self.level.area_id in membership["areas"] or self.type.sport_id in membership["sports"]
 
     @authenticated_users
     @allow_staff_or_superuser
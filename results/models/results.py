@@ -1,3 +1,6 @@
+import datetime
+from decimal import Decimal
+
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from dry_rest_permissions.generics import allow_staff_or_superuser, authenticated_users
@@ -5,8 +8,15 @@ from dry_rest_permissions.generics import allow_staff_or_superuser, authenticate
 from results.mixins.change_log import LogChangesMixing
 from results.models.athletes import Athlete
 from results.models.categories import Category
-from results.models.competitions import Competition, CompetitionResultType
+from results.models.competitions import (
+    Competition,
+    CompetitionLevel,
+    CompetitionResultType,
+    CompetitionType,
+)
 from results.models.organizations import Organization
+from results.models.sports import Sport
+from results.utils.cache import get_user_groups
 
 
 class Result(LogChangesMixing, models.Model):
@@ -17,6 +27,10 @@ class Result(LogChangesMixing, models.Model):
      - :class:`.categories.Category`
      - :class:`.competitions.Competition`
      - :class:`.organizations.Organization`
+
+    Competition's sport, type, level, dates and trial status, and organization's external status are copied to the
+    result for filtering. They are set when the result is saved and updated by signals when the competition,
+    competition type or organization changes.
     """
 
     competition = models.ForeignKey(Competition, related_name="results_competition", on_delete=models.CASCADE)
@@ -45,14 +59,38 @@ class Result(LogChangesMixing, models.Model):
     team = models.BooleanField(default=False, verbose_name=_("Team result"))
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created at"))
     updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated at"))
+    competition_sport = models.ForeignKey(
+        Sport, on_delete=models.SET_NULL, null=True, editable=False, related_name="+", verbose_name=_("Sport")
+    )
+    competition_type = models.ForeignKey(
+        CompetitionType,
+        on_delete=models.SET_NULL,
+        null=True,
+        editable=False,
+        related_name="+",
+        verbose_name=_("Competition type"),
+    )
+    competition_level = models.ForeignKey(
+        CompetitionLevel,
+        on_delete=models.SET_NULL,
+        null=True,
+        editable=False,
+        related_name="+",
+        verbose_name=_("Competition level"),
+    )
+    competition_date_start = models.DateField(null=True, editable=False, verbose_name=_("Start date"))
+    competition_date_end = models.DateField(null=True, editable=False, verbose_name=_("End date"))
+    competition_trial = models.BooleanField(default=False, editable=False, verbose_name=_("Trial competition"))
+    organization_external = models.BooleanField(default=False, editable=False, verbose_name=_("External"))
 
     def __str__(self):
         return "%s %s %s" % (self.competition, self.last_name, self.first_name)
 
-    def save(self, *args, **kwargs):
+    def set_derived_fields(self):
         """
         Add result names from the athlete if not included.
         Set position_pre as position if not included and vice versa.
+        Copy competition and organization information for filtering.
         """
         if self.athlete:
             if not self.first_name:
@@ -63,12 +101,45 @@ class Result(LogChangesMixing, models.Model):
             self.position_pre = self.position
         elif not self.position and self.position_pre:
             self.position = self.position_pre
+        competition = self.competition
+        self.competition_sport_id = competition.type.sport_id
+        self.competition_type_id = competition.type_id
+        self.competition_level_id = competition.level_id
+        self.competition_date_start = competition.date_start
+        self.competition_date_end = competition.date_end
+        self.competition_trial = competition.trial
+        self.organization_external = self.organization.external if self.organization else False
+
+    def save(self, *args, **kwargs):
+        """
+        Set derived fields, see :meth:`set_derived_fields`.
+        """
+        self.set_derived_fields()
         super().save(*args, **kwargs)
 
+    def get_partials(self):
+        """
+        Returns partial results, including unpacked partial results from packed storage, ordered by type and order.
+        """
+        partials = list(self.partial.all())
+        for packed in self.partial_packed.all():
+            partials += packed.get_partials()
+        return sorted(partials, key=lambda partial: (partial.type_id, partial.order))
+
     class Meta:
         ordering = ["competition", "category", "position", "-result"]
         verbose_name = _("Result")
         verbose_name_plural = _("Results")
+        indexes = [
+            models.Index(fields=["competition", "updated_at", "id"]),
+            models.Index(fields=["competition", "athlete", "category"]),
+            models.Index(fields=["competition", "last_name", "category"]),
+            models.Index(fields=["approved", "public", "updated_at"]),
+            models.Index(fields=["competition_sport", "competition_date_start"]),
+            models.Index(fields=["competition_type", "competition_date_start"]),
+            models.Index(fields=["competition_level", "competition_date_start"]),
+            models.Index(fields=["category", "competition_date_start"]),
+        ]
 
     @staticmethod
     def has_read_permission(request):
@@ -88,7 +159,7 @@ class Result(LogChangesMixing, models.Model):
         if not self.competition.locked and (
             self.competition.organization.is_area_manager(request.user)
             or self.competition.type.sport.is_manager(request.user)
-            or (self.competition.organization.group in request.user.groups.all() and not self.approved)
+            or (self.competition.organization.group_id in get_user_groups(request.user.pk) and not self.approved)
         ):
             return True
         return False
@@ -147,7 +218,10 @@ class ResultPartial(LogChangesMixing, models.Model):
         if not self.result.competition.locked and (
             self.result.competition.organization.is_area_manager(request.user)
             or self.result.competition.type.sport.is_manager(request.user)
-            or (self.result.competition.organization.group in request.user.groups.all() and not self.result.approved)
+            or (
+                self.result.competition.organization.group_id in get_user_groups(request.user.pk)
+                and not self.result.approved
+            )
         ):
             return True
         return False
@@ -155,3 +229,175 @@ class ResultPartial(LogChangesMixing, models.Model):
     @authenticated_users
     def has_object_write_permission(self, request):
         return self.has_object_update_permission(request)
+
+
+class ResultPartialPacked(LogChangesMixing, models.Model):
+    """Stores partial results of a single type for a result in a single row.
+
+    Used for the result types with packed option, i.e. shot-by-shot series. Values are stored as a list of
+    [order, value, decimals] lists, with value as a string or null. Code, time and text are appended to the list
+    only if any of them is set, i.e. [order, value, decimals, code, time, text].
+
+    Related to
+     - :class:`.competitions.CompetitionResultType`
+     - :class:`.results.Result`
+    """
+
+    result = models.ForeignKey(Result, related_name="partial_packed", on_delete=models.CASCADE)
+    type = models.ForeignKey(CompetitionResultType, related_name="+", on_delete=models.CASCADE)
+    values = models.JSONField(default=list, verbose_name=_("Values"))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created at"))
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated at"))
+
+    def __str__(self):
+        return "%s : %s" % (self.result, self.type)
+
+    class Meta:
+        ordering = ["result", "type"]
+        verbose_name = _("Packed partial results")
+        verbose_name_plural = _("Packed partial results")
+        unique_together = ("result", "type")
+
+    @staticmethod
+    def pack(partials):
+        """
+        Returns packed values for the partial results.
+
+        :param partials: partial result data with order, and optional value, decimals, code, time and text
+        :type partials: list
+        :return: list of [order, value, decimals] or [order, value, decimals, code, time, text] lists, ordered by
+            order
+        :rtype: list
+        """
+        values = []
+        for partial in sorted(partials, key=lambda partial: partial["order"]):
+            value = [
+                partial["order"],
+                str(partial["value"]) if partial.get("value") is not None else None,
+                partial.get("decimals", 0),
+            ]
+            code, time, text = partial.get("code", ""), partial.get("time"), partial.get("text")
+            if code or time is not None or text is not None:
+                value += [code, time.isoformat() if time is not None else None, text]
+            values.append(value)
+        return values
+
+    @staticmethod
+    def unpack(values):
+        """
+        Returns partial result data for the packed values.
+
+        :param values: packed values
+        :type values: list
+        :return: list of dicts with order, value, decimals, code, time and text
+        :rtype: list
+        """
+        partials = []
+        for value in values:
+            order, result, decimals = value[:3]
+            code, time, text = value[3:] if len(value) > 3 else ("", None, None)
+            partials.append(
+                {
+                    "order": order,
+                    "value": Decimal(result) if result is not None else None,
+                    "decimals": decimals,
+                    "code": code,
+                    "time": datetime.time.fromisoformat(time) if time is not None else None,
+                    "text": text,
+                }
+            )
+        return partials
+
+    def get_partials(self):
+        """
+        Returns unsaved partial result instances for the packed values.
+
+        :rtype: list
+        """
+        return [
+            ResultPartial(result_id=self.result_id, type=self.type, **partial) for partial in self.unpack(self.values)
+        ]
+
+
+class ResultTombstone(models.Model):
+    """Stores a deleted result for the result change feed.
+
+    Plain ids are used instead of foreign keys, as the tombstone is created while the result, and possibly
+    the competition, is being deleted.
+    """
+
+    result_id = models.IntegerField(verbose_name=_("Result ID"))
+    competition_id = models.IntegerField(verbose_name=_("Competition ID"))
+    deleted_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Deleted at"))
+
+    def __str__(self):
+        return "%s : %s" % (self.competition_id, self.result_id)
+
+    class Meta:
+        ordering = ["deleted_at", "result_id"]
+        verbose_name = _("Deleted result")
+        verbose_name_plural = _("Deleted results")
+        indexes = [
+            models.Index(fields=["competition_id", "deleted_at"]),
+            models.Index(fields=["deleted_at"]),
+        ]
+
+
+class AthleteBest(models.Model):
+    """Stores athlete's best result by competition type, category and season.
+
+    Related to
+     - :class:`.athletes.Athlete`
+     - :class:`.competitions.CompetitionType`
+     - :class:`.categories.Category`
+     - :class:`.results.Result`
+
+    Only public results are included. Bests are updated automatically, see :mod:`results.utils.bests`.
+    """
+
+    athlete = models.ForeignKey(Athlete, on_delete=models.CASCADE, related_name="bests")
+    type = models.ForeignKey(CompetitionType, on_delete=models.CASCADE, related_name="+")
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name="+")
+    season = models.SmallIntegerField(verbose_name=_("Season"))
+    result = models.ForeignKey(Result, on_delete=models.CASCADE, null=True, related_name="+")
+    value = models.DecimalField(null=True, verbose_name=_("Result"), max_digits=12, decimal_places=3)
+
+    def __str__(self):
+        return "%s %s %s %s" % (self.athlete, self.type, self.category, self.season)
+
+    class Meta:
+        ordering = ["athlete", "type", "category", "-season"]
+        verbose_name = _("Athlete best")
+        verbose_name_plural = _("Athlete bests")
+        unique_together = ("athlete", "type", "category", "season")
+
+    @staticmethod
+    def has_read_permission(request):
+        return True
+
+    def has_object_read_permission(self, request):
+        return True
+
+
+class AthleteBestPartial(models.Model):
+    """Stores athlete's best partial result by result type.
+
+    Related to
+     - :class:`.results.AthleteBest`
+     - :class:`.competitions.CompetitionResultType`
+     - :class:`.results.ResultPartial`
+    """
+
+    best = models.ForeignKey(AthleteBest, on_delete=models.CASCADE, related_name="partials")
+    type = models.ForeignKey(CompetitionResultType, on_delete=models.CASCADE, related_name="+")
+    partial = models.ForeignKey(ResultPartial, on_delete=models.CASCADE, related_name="+")
+    value = models.DecimalField(verbose_name=_("Value"), max_digits=12, decimal_places=3)
+
+    def __str__(self):
+        return "%s : %s" % (self.best, self.type)
+
+    class Meta:
+        ordering = ["best", "type"]
+        verbose_name = _("Athlete best partial")
+        verbose_name_plural = _("Athlete best partials")
+        unique_together = ("best", "type")
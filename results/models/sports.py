@@ -4,6 +4,7 @@ from django.utils.translation import gettext_lazy as _
 from dry_rest_permissions.generics import allow_staff_or_superuser
 
 from results.mixins.change_log import LogChangesMixing
+from results.utils.cache import get_membership
 
 
 class Sport(LogChangesMixing, models.Model):
@@ -33,13 +34,7 @@ class Sport(LogChangesMixing, models.Model):
         :param user: user object
         :return: bool
         """
-        groups = user.groups.all()
-        try:
-            Sport.objects.filter(manager__in=groups).get(pk=self.pk)
-            return True
-        except Sport.DoesNotExist:
-            pass
-        return False
+        return self.pk in get_membership(user.pk)["sports"]
 
     @staticmethod
     def has_read_permission(request):
@@ -2,6 +2,8 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 from dry_rest_permissions.generics import allow_staff_or_superuser
 
+from results.models.competitions import Competition, CompetitionType
+
 
 class StatisticsLink(models.Model):
     """Stores a single statistic link."""
@@ -41,3 +43,140 @@ class StatisticsLink(models.Model):
     @allow_staff_or_superuser
     def has_object_update_permission(self, request):
         return False
+
+
+class PointsTable(models.Model):
+    """Stores a single points table definition.
+
+    Related to
+     - :class:`.competitions.CompetitionType`
+
+    Points are given from the positions in the competitions of the given levels and types. Points are
+    calculated automatically, see :mod:`results.utils.points`.
+    """
+
+    EXTERNAL_CHOICES = [
+        ("move", _("Move following positions up")),
+        ("ignore", _("Ignore external results")),
+        ("include", _("Include external organizations")),
+    ]
+
+    TIE_CHOICES = [
+        ("full", _("Full points for tied positions")),
+        ("split", _("Split points between tied positions")),
+    ]
+
+    GROUP_CHOICES = [
+        ("organization", _("Organization")),
+        ("area", _("Area")),
+        ("athlete", _("Athlete")),
+    ]
+
+    name = models.CharField(max_length=255, verbose_name=_("Name"))
+    slug = models.SlugField(max_length=50, unique=True, verbose_name=_("Slug"))
+    description = models.TextField(blank=True, verbose_name=_("Description"))
+    levels = models.CharField(
+        max_length=255, verbose_name=_("Competition levels"), help_text=_("Comma separated level abbreviations")
+    )
+    types = models.ManyToManyField(
+        CompetitionType,
+        blank=True,
+        verbose_name=_("Competition types"),
+        help_text=_("Limit to competition types, default all types"),
+    )
+    points = models.CharField(
+        max_length=255, verbose_name=_("Points"), help_text=_("Comma separated points for positions, i.e. 3,2,1")
+    )
+    external = models.CharField(
+        max_length=10, choices=EXTERNAL_CHOICES, default="move", verbose_name=_("External results")
+    )
+    ties = models.CharField(max_length=10, choices=TIE_CHOICES, default="full", verbose_name=_("Tied positions"))
+    group_by = models.CharField(
+        max_length=20, choices=GROUP_CHOICES, default="organization", verbose_name=_("Group by")
+    )
+    public = models.BooleanField(default=False, verbose_name=_("Public"))
+
+    def __str__(self):
+        return "%s" % self.name
+
+    class Meta:
+        ordering = ["name"]
+        verbose_name = _("Points table")
+        verbose_name_plural = _("Points tables")
+
+    def get_levels(self):
+        """Returns list of competition level abbreviations."""
+        return [level.strip() for level in self.levels.split(",") if level.strip()]
+
+    def get_points(self):
+        """Returns list of points for positions, starting from the first position."""
+        return [int(value) for value in self.points.split(",") if value.strip()]
+
+    @staticmethod
+    def has_read_permission(request):
+        return True
+
+    def has_object_read_permission(self, request):
+        return self.public or request.user.is_staff or request.user.is_superuser
+
+    @staticmethod
+    @allow_staff_or_superuser
+    def has_write_permission(request):
+        return False
+
+    @allow_staff_or_superuser
+    def has_object_write_permission(self, request):
+        return False
+
+    @allow_staff_or_superuser
+    def has_object_update_permission(self, request):
+        return False
+
+
+class CompetitionPoints(models.Model):
+    """Stores group's points from a single competition for a points table.
+
+    Related to
+     - :class:`.statistics.PointsTable`
+     - :class:`.competitions.Competition`
+
+    Group is an organization, area or athlete, depending on the points table grouping.
+
+    Points are calculated automatically, see :mod:`results.utils.points`.
+    """
+
+    table = models.ForeignKey(PointsTable, on_delete=models.CASCADE, related_name="competition_points")
+    competition = models.ForeignKey(Competition, on_delete=models.CASCADE, related_name="points")
+    group_id = models.PositiveIntegerField(verbose_name=_("Group"))
+    year = models.SmallIntegerField(verbose_name=_("Year"))
+    value = models.DecimalField(max_digits=10, decimal_places=2, verbose_name=_("Value"))
+
+    def __str__(self):
+        return "%s %s : %s" % (self.table, self.competition, self.group_id)
+
+    class Meta:
+        ordering = ["table", "year", "-value"]
+        verbose_name = _("Competition points")
+        verbose_name_plural = _("Competition points")
+        unique_together = ("table", "competition", "group_id")
+        indexes = [
+            models.Index(fields=["table", "year"]),
+        ]
+
+
+class PointsQueue(models.Model):
+    """Stores a competition waiting for points recalculation.
+
+    Related to
+     - :class:`.competitions.Competition`
+
+    Queue is processed by the updatepoints command.
+    """
+
+    competition = models.ForeignKey(Competition, on_delete=models.CASCADE, related_name="+")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        verbose_name = _("Points queue")
+        verbose_name_plural = _("Points queue")
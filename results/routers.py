@@ -1,5 +1,7 @@
+from django.urls import URLPattern
 from rest_framework import routers
 
+from results.utils.async_views import async_read_view
 from results.views.athletes import AthleteInformationViewSet, AthleteViewSet
 from results.views.categories import CategoryViewSet, DivisionViewSet
 from results.views.competitions import (
@@ -13,16 +15,38 @@ from results.views.events import EventContactViewSet, EventViewSet
 from results.views.organizations import AreaViewSet, OrganizationViewSet
 from results.views.records import RecordLevelViewSet, RecordList, RecordViewSet
 from results.views.results import (
+    AthleteBestViewSet,
+    ResultChangeFeed,
     ResultDetailViewSet,
     ResultList,
     ResultPartialViewSet,
     ResultViewSet,
 )
 from results.views.sports import SportViewSet
-from results.views.statistics import StatisticsLinkViewSet
+from results.views.statistics import PointsTableViewSet, StatisticsLinkViewSet
 
-router = routers.DefaultRouter()
+
+class AsyncReadRouter(routers.DefaultRouter):
+    """Router using async views for the viewset actions with an async handler.
+
+    Async handler of an action is a class method named async_<action>, see
+    :func:`results.utils.async_views.async_read_view`.
+    """
+
+    def get_urls(self):
+        urls = []
+        for url in super().get_urls():
+            actions = getattr(url.callback, "actions", {})
+            handler = getattr(getattr(url.callback, "cls", None), "async_%s" % actions.get("get"), None)
+            if handler:
+                url = URLPattern(url.pattern, async_read_view(url.callback, handler), url.default_args, url.name)
+            urls.append(url)
+        return urls
+
+
+router = AsyncReadRouter()
 router.register(r"areas", AreaViewSet)
+router.register(r"athletebests", AthleteBestViewSet)
 router.register(r"athletes", AthleteViewSet)
 router.register(r"athleteinformation", AthleteInformationViewSet)
 router.register(r"categories", CategoryViewSet)
@@ -40,6 +64,8 @@ router.register(r"recordlevels", RecordLevelViewSet)
 router.register(r"recordlist", RecordList, basename="recordlist")
 router.register(r"results", ResultViewSet)
 router.register(r"partialresults", ResultPartialViewSet)
+router.register(r"pointstables", PointsTableViewSet)
+router.register(r"resultchanges", ResultChangeFeed, basename="resultchanges")
 router.register(r"resultdetail", ResultDetailViewSet, basename="resultdetail")
 router.register(r"resultlist", ResultList, basename="resultlist")
 router.register(r"sports", SportViewSet)
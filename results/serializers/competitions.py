@@ -15,6 +15,7 @@ from results.models.events import Event
 from results.models.organizations import Organization
 from results.serializers.events import EventLimitedSerializer
 from results.serializers.organizations import OrganizationSerializer
+from results.utils.cache import get_user_groups
 from results.utils.custom_validation import CustomValidation
 
 
@@ -86,7 +87,16 @@ class CompetitionResultTypeSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = CompetitionResultType
-        fields = ("id", "competition_type", "name", "abbreviation", "max_result", "min_result", "permissions")
+        fields = (
+            "id",
+            "competition_type",
+            "name",
+            "abbreviation",
+            "max_result",
+            "min_result",
+            "tiebreak",
+            "permissions",
+        )
 
 
 class CompetitionResultTypeLimitedSerializer(serializers.ModelSerializer):
@@ -196,8 +206,9 @@ class CompetitionSerializer(serializers.ModelSerializer, EagerLoadingMixin):
             )
         ):
             return data
-        if not (self.instance and self.instance.organization.group in user.groups.all()) and (
-            "organization" not in data or data["organization"].group not in user.groups.all()
+        groups = get_user_groups(user.pk)
+        if not (self.instance and self.instance.organization.group_id in groups) and (
+            "organization" not in data or data["organization"].group_id not in groups
         ):
             raise serializers.ValidationError(_("No permission to alter or create an competition."), 403)
         if (
@@ -9,6 +9,7 @@ from results.models.events import Event, EventContact
 from results.models.organizations import Organization
 from results.serializers.athletes import AthleteLimitedSerializer
 from results.serializers.organizations import OrganizationSerializer
+from results.utils.cache import get_user_groups
 from results.utils.custom_validation import CustomValidation
 
 
@@ -128,8 +129,9 @@ class EventSerializer(serializers.ModelSerializer, EagerLoadingMixin):
             for competition in self.instance.competitions.all():
                 if competition.type.sport.is_manager(user):
                     return data
-        if not (self.instance and self.instance.organization.group in user.groups.all()) and (
-            "organization" not in data or data["organization"].group not in user.groups.all()
+        groups = get_user_groups(user.pk)
+        if not (self.instance and self.instance.organization.group_id in groups) and (
+            "organization" not in data or data["organization"].group_id not in groups
         ):
             raise serializers.ValidationError(_("No permission to alter or create an event."), 403)
         if (self.instance and self.instance.locked) or ("locked" in data and data["locked"]):
@@ -4,6 +4,7 @@ from rest_framework import serializers
 
 from results.mixins.eager_loading import EagerLoadingMixin
 from results.models.records import Record, RecordLevel
+from results.utils.cache import get_membership
 
 
 class RecordSerializer(serializers.ModelSerializer):
@@ -43,7 +44,7 @@ class RecordSerializer(serializers.ModelSerializer):
             or not (
                 self.instance.level.area
                 and self.instance.level.area.manager
-                and self.instance.level.area.manager in user.groups.all()
+                and self.instance.level.area_id in get_membership(user.pk)["areas"]
                 or self.instance.type.sport.is_manager(user)
             )
         ):
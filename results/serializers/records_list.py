@@ -1,3 +1,4 @@
+from drf_queryfields import QueryFieldsMixin
 from dry_rest_permissions.generics import DRYPermissionsField
 from rest_framework import serializers
 
@@ -38,7 +39,7 @@ class ResultRecordListSerializer(serializers.ModelSerializer):
         )
 
 
-class RecordListSerializer(serializers.ModelSerializer, EagerLoadingMixin):
+class RecordListSerializer(QueryFieldsMixin, serializers.ModelSerializer, EagerLoadingMixin):
     """
     Serializer for listing records.
     """
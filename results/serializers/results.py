@@ -5,14 +5,30 @@ from dry_rest_permissions.generics import DRYPermissionsField
 from rest_framework import serializers
 
 from results.mixins.eager_loading import EagerLoadingMixin
-from results.models.categories import CategoryForCompetitionType
-from results.models.results import Result, ResultPartial
+from results.models.results import (
+    AthleteBest,
+    AthleteBestPartial,
+    Result,
+    ResultPartial,
+    ResultPartialPacked,
+)
 from results.serializers.athletes import AthleteLimitedSerializer, AthleteNameSerializer
 from results.serializers.competitions import (
     CompetitionLimitedSerializer,
     CompetitionResultTypeLimitedSerializer,
 )
 from results.serializers.records import RecordLimitedSerializer
+from results.utils.requirements import get_missing_requirement, get_requirements
+from results.utils.result_validation import ResultValidationContext
+
+
+class ResultPartialListSerializer(serializers.ListSerializer):
+    """
+    List serializer for nested partial results, including partial results from packed storage
+    """
+
+    def get_attribute(self, instance):
+        return instance.get_partials()
 
 
 class ResultPartialSerializer(serializers.ModelSerializer):
@@ -26,6 +42,7 @@ class ResultPartialSerializer(serializers.ModelSerializer):
         model = ResultPartial
         fields = ("id", "result", "type", "order", "value", "decimals", "code", "time", "text", "permissions")
         extra_kwargs = {"code": {"required": False}}
+        list_serializer_class = ResultPartialListSerializer
 
     def _check_permission(self, data, user):
         """
@@ -77,6 +94,7 @@ class ResultPartialSerializer(serializers.ModelSerializer):
         """
         Validates:
          - permissions to create or edit the partial result
+         - result type, packed result types are saved with the result
          - value limits
         """
         user = self.context["request"].user
@@ -84,6 +102,8 @@ class ResultPartialSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(_("No permission to alter or create a result."), 403)
         if data["type"].competition_type != data["result"].competition.type:
             raise serializers.ValidationError(_("Partial result type does not match competition type."))
+        if data["type"].packed:
+            raise serializers.ValidationError(_("Partial results of a packed result type are saved with the result."))
         if (
             "value" in data
             and data["result"]
@@ -110,6 +130,7 @@ class ResultPartialNestedSerializer(ResultPartialSerializer):
         model = ResultPartial
         fields = ("id", "type", "order", "value", "decimals", "code", "time", "text", "permissions")
         extra_kwargs = {"code": {"required": False}}
+        list_serializer_class = ResultPartialListSerializer
 
     def validate(self, data):
         return data
@@ -126,8 +147,10 @@ class ResultSerializer(QueryFieldsMixin, serializers.ModelSerializer, EagerLoadi
 
     _PREFETCH_RELATED_FIELDS = [
         "partial",
+        "partial_packed__type",
         "team_members",
     ]
+    _RELATED_FIELD_SOURCES = {"partial_packed": "partial"}
 
     class Meta:
         model = Result
@@ -155,6 +178,41 @@ class ResultSerializer(QueryFieldsMixin, serializers.ModelSerializer, EagerLoadi
             "dry_run",
         )
 
+    @property
+    def validation_context(self):
+        """
+        Returns validation context, shared by the results in the same request. Existing entries are preloaded when
+        multiple results are created with a list.
+        """
+        if "validation" not in self.context:
+            self.context["validation"] = ResultValidationContext(
+                self.context["request"].user, preload_entries=isinstance(self.parent, serializers.ListSerializer)
+            )
+        return self.context["validation"]
+
+    @staticmethod
+    def _save_packed_partials(result, partial_data):
+        """
+        Saves partial results of the packed result types in a single row per type and removes packed rows for the
+        other types.
+
+        :return: partial results of the other types
+        :rtype: list
+        """
+        packed = {}
+        partials = []
+        for partial in partial_data:
+            if partial["type"].packed:
+                packed.setdefault(partial["type"], []).append(partial)
+            else:
+                partials.append(partial)
+        for result_type, values in packed.items():
+            ResultPartialPacked.objects.update_or_create(
+                result=result, type=result_type, defaults={"values": ResultPartialPacked.pack(values)}
+            )
+        ResultPartialPacked.objects.filter(result=result).exclude(type__in=packed.keys()).delete()
+        return partials
+
     def create(self, validated_data):
         """
         Nested partial results support in create
@@ -168,10 +226,9 @@ class ResultSerializer(QueryFieldsMixin, serializers.ModelSerializer, EagerLoadi
             result = Result.objects.create(**validated_data)
         else:
             result = Result(**validated_data, pk=9999999999)
-        if partial_data:
-            for partial in partial_data:
-                if not dry_run:
-                    ResultPartial.objects.create(result=result, **partial)
+        if partial_data and not dry_run:
+            for partial in self._save_packed_partials(result, partial_data):
+                ResultPartial.objects.create(result=result, **partial)
         if team_members and not dry_run:
             result.team_members.set(team_members)
         return result
@@ -192,7 +249,7 @@ class ResultSerializer(QueryFieldsMixin, serializers.ModelSerializer, EagerLoadi
             partial_existing = list(ResultPartial.objects.filter(result=instance).values_list("id", flat=True))
             if "partial" in validated_data:
                 partial_data = validated_data.pop("partial")
-                for partial in partial_data:
+                for partial in self._save_packed_partials(instance, partial_data):
                     try:
                         partial_instance = ResultPartial.objects.get(
                             result=instance, type=partial["type"], order=partial["order"]
@@ -277,24 +334,15 @@ class ResultSerializer(QueryFieldsMixin, serializers.ModelSerializer, EagerLoadi
         if category.team and category.team_size and len(athletes) != category.team_size:
             raise serializers.ValidationError(_("Incorrect number of team members for this category."))
 
-    @staticmethod
-    def _check_requirements(competition, athletes):
+    def _check_requirements(self, competition, athletes):
         """
         Validates competition level and type requirements for the athletes.
         i.e. licence.
         """
-        for requirement in competition.type.requirements.split(",") + competition.level.requirements.split(","):
-            if requirement.strip():
-                for athlete in athletes:
-                    if (
-                        not athlete.organization.external
-                        and not athlete.info.filter(
-                            type=requirement.strip(),
-                            date_start__lte=competition.date_start,
-                            date_end__gte=competition.date_start,
-                        ).count()
-                    ):
-                        raise serializers.ValidationError(_("Missing requirement: %s." % requirement.strip()))
+        coverage = self.validation_context.get_coverage(athletes) if get_requirements(competition) else {}
+        requirement = get_missing_requirement(competition, athletes, coverage)
+        if requirement:
+            raise serializers.ValidationError(_("Missing requirement: %s." % requirement))
 
     def _check_value_limits(self, result, category, competition_type):
         """
@@ -379,15 +427,14 @@ class ResultSerializer(QueryFieldsMixin, serializers.ModelSerializer, EagerLoadi
             result = None
         return result
 
-    @staticmethod
-    def _get_result_limits(category, competition_type):
+    def _get_result_limits(self, category, competition_type):
         """
         Returns result limits for the competition type and category.
 
         Raises ValidationError if category is not allowed for the competition
         type.
         """
-        check = CategoryForCompetitionType.objects.filter(category=category, type=competition_type).first()
+        check = self.validation_context.get_category_check(category, competition_type)
         if check and check.disallow:
             raise serializers.ValidationError(_("Category is not allowed for this competition type."))
         max_result = check.max_result if check and check.max_result else competition_type.max_result
@@ -398,22 +445,21 @@ class ResultSerializer(QueryFieldsMixin, serializers.ModelSerializer, EagerLoadi
         """
         Raises ValidationError if trying to create new result and it already exists.
         """
-        if self.instance is None and (
-            (
-                not category.team
-                and Result.objects.filter(
-                    competition=data["competition"], athlete=data["athlete"], category=data["category"]
-                )
-            )
-            or (
-                category.team
-                and Result.objects.filter(
-                    competition=data["competition"], last_name=data["last_name"], category=data["category"]
-                )
-            )
-        ):
+        if self.instance is None and self.validation_context.entry_exists(**self._get_entry(data, category)):
             raise serializers.ValidationError(_("Entry already exists."))
 
+    @staticmethod
+    def _get_entry(data, category):
+        """
+        Returns the entry information for the existence check.
+        """
+        return {
+            "competition": data["competition"],
+            "category": data["category"],
+            "athlete": data.get("athlete"),
+            "last_name": data.get("last_name") if category.team else None,
+        }
+
     def _check_team_status(self, data):
         """
         Raises ValidationError if team status is changed. This is done because of the validation and record checks.
@@ -460,11 +506,12 @@ class ResultSerializer(QueryFieldsMixin, serializers.ModelSerializer, EagerLoadi
         """
         if user.is_superuser or user.is_staff:
             return True
-        competition_data = data["competition"] if "competition" in data else None
+        context = self.validation_context
+        competition_data = context.get_competition(data["competition"]) if "competition" in data else None
         competition_instance = self.instance.competition if self.instance else None
         if (competition_data and competition_data.locked) or competition_instance and competition_instance.locked:
             return False
-        if self.instance and self.instance.competition.type.sport.is_manager(user):
+        if self.instance and context.is_sport_manager(self.instance.competition.type.sport):
             return True
         if (
             not competition_instance
@@ -472,7 +519,7 @@ class ResultSerializer(QueryFieldsMixin, serializers.ModelSerializer, EagerLoadi
                 not competition_instance.approved
                 and competition_instance.level.require_approval
                 and (
-                    not competition_instance.organization.is_area_manager(user)
+                    not context.is_area_manager(competition_instance.organization)
                     or not competition_instance.level.area_competition
                 )
             )
@@ -482,14 +529,14 @@ class ResultSerializer(QueryFieldsMixin, serializers.ModelSerializer, EagerLoadi
                 not competition_data.approved
                 and competition_data.level.require_approval
                 and (
-                    not competition_data.organization.is_area_manager(user)
+                    not context.is_area_manager(competition_data.organization)
                     or not competition_data.level.area_competition
                 )
             )
         ):
             return False
-        if (not competition_instance or not competition_instance.organization.is_manager(user)) and (
-            not competition_data or not competition_data.organization.is_manager(user)
+        if (not competition_instance or not context.is_manager(competition_instance.organization)) and (
+            not competition_data or not context.is_manager(competition_data.organization)
         ):
             return False
         return True
@@ -559,7 +606,7 @@ class ResultSerializer(QueryFieldsMixin, serializers.ModelSerializer, EagerLoadi
         self._check_team_status(data)
         athletes, team = self._get_athletes(data)
         category = self._get_category(data)
-        competition = self._get_competition(data)
+        competition = self.validation_context.get_competition(self._get_competition(data))
         self._check_existence(data, category)
         if settings.CHECK_COMPETITION_REQUIREMENTS:
             self._check_requirements(competition, athletes)
@@ -571,6 +618,8 @@ class ResultSerializer(QueryFieldsMixin, serializers.ModelSerializer, EagerLoadi
             self._check_value_limits(result, category, competition.type)
         self._check_partial(data, competition, category)
         self._check_approval(data, user, competition)
+        if self.instance is None:
+            self.validation_context.add_entry(**self._get_entry(data, category))
 
         return data
 
@@ -585,6 +634,7 @@ class ResultPartialLimitedSerializer(ResultPartialSerializer):
     class Meta:
         model = ResultPartial
         fields = ("id", "type", "order", "value", "decimals", "code", "time", "text")
+        list_serializer_class = ResultPartialListSerializer
 
 
 class ResultLimitedSerializer(QueryFieldsMixin, serializers.ModelSerializer, EagerLoadingMixin):
@@ -619,11 +669,13 @@ class ResultLimitedSerializer(QueryFieldsMixin, serializers.ModelSerializer, Eag
         "elimination_category",
         "partial",
         "partial__type",
+        "partial_packed__type",
         "record",
         "record__level",
         "record__category",
         "team_members",
     ]
+    _RELATED_FIELD_SOURCES = {"partial_packed": "partial"}
 
     class Meta:
         model = Result
@@ -656,6 +708,8 @@ class ResultLimitedAggregateSerializer(ResultLimitedSerializer):
     Serializer for limited aggregate result information
     """
 
+    result = serializers.DecimalField(max_digits=12, decimal_places=3, source="result_aggregate", read_only=True)
+
     _PREFETCH_RELATED_FIELDS = [
         "athlete",
         "athlete__organization",
@@ -666,3 +720,77 @@ class ResultLimitedAggregateSerializer(ResultLimitedSerializer):
     class Meta:
         model = Result
         fields = ("id", "athlete", "result")
+
+
+class ResultGroupAggregateSerializer(ResultLimitedAggregateSerializer):
+    """
+    Serializer for grouped aggregate result information
+
+    Includes only the grouping fields given in the group_by context and the aggregate result.
+    """
+
+    area = serializers.CharField(read_only=True)
+    season = serializers.IntegerField(read_only=True)
+
+    GROUP_FIELDS = ["athlete", "organization", "area", "category", "competition", "season"]
+
+    _PREFETCH_RELATED_FIELDS = ResultLimitedAggregateSerializer._PREFETCH_RELATED_FIELDS + [
+        "category",
+        "competition",
+        "competition__event",
+        "competition__level",
+        "competition__organization",
+        "competition__organization__areas",
+        "competition__type",
+        "organization",
+    ]
+
+    class Meta:
+        model = Result
+        fields = ("id", "athlete", "organization", "area", "category", "competition", "season", "result")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        group_by = self.context.get("group_by", self.GROUP_FIELDS)
+        for field in self.GROUP_FIELDS:
+            if field not in group_by:
+                self.fields.pop(field, None)
+
+    def to_representation(self, instance):
+        """
+        Returns count aggregate as an integer.
+        """
+        data = super().to_representation(instance)
+        if self.context.get("aggregate") == "count" and "result" in data:
+            data["result"] = instance.result_aggregate
+        return data
+
+
+class AthleteBestPartialSerializer(serializers.ModelSerializer):
+    """
+    Serializer for athlete's best partial results
+    """
+
+    result = serializers.ReadOnlyField(source="partial.result_id")
+
+    class Meta:
+        model = AthleteBestPartial
+        fields = ("type", "value", "result")
+
+
+class AthleteBestSerializer(serializers.ModelSerializer, EagerLoadingMixin):
+    """
+    Serializer for athlete's best results
+    """
+
+    category = serializers.SlugRelatedField(read_only=True, slug_field="abbreviation")
+    competition = serializers.ReadOnlyField(source="result.competition_id")
+    date = serializers.ReadOnlyField(source="result.competition_date_start")
+    partials = AthleteBestPartialSerializer(many=True, read_only=True)
+
+    _SELECT_RELATED_FIELDS = ["category", "result"]
+    _PREFETCH_RELATED_FIELDS = ["partials", "partials__partial"]
+
+    class Meta:
+        model = AthleteBest
+        fields = ("id", "athlete", "type", "category", "season", "value", "result", "competition", "date", "partials")
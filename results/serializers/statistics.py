@@ -1,7 +1,8 @@
+from django.utils.translation import gettext_lazy as _
 from dry_rest_permissions.generics import DRYPermissionsField
 from rest_framework import serializers
 
-from results.models.statistics import StatisticsLink
+from results.models.statistics import PointsTable, StatisticsLink
 
 
 class StatisticsLinkSerializer(serializers.ModelSerializer):
@@ -14,3 +15,38 @@ class StatisticsLinkSerializer(serializers.ModelSerializer):
     class Meta:
         model = StatisticsLink
         fields = ("id", "group", "name", "description", "link", "highlight", "order", "public", "permissions")
+
+
+class PointsTableSerializer(serializers.ModelSerializer):
+    """
+    Serializer for points tables
+    """
+
+    permissions = DRYPermissionsField()
+
+    class Meta:
+        model = PointsTable
+        fields = (
+            "id",
+            "name",
+            "slug",
+            "description",
+            "levels",
+            "types",
+            "points",
+            "external",
+            "ties",
+            "group_by",
+            "public",
+            "permissions",
+        )
+
+    def validate_points(self, value):
+        """
+        Checks that points are comma separated integers.
+        """
+        try:
+            [int(point) for point in value.split(",")]
+        except ValueError:
+            raise serializers.ValidationError(_("Points must be comma separated integers."))
+        return value
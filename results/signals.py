@@ -1,19 +1,63 @@
 from django.conf import settings
-from django.contrib.auth.models import Group
-from django.db.models.signals import post_save
+from django.contrib.auth.models import Group, User
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
+from django.utils import timezone
 from rest_framework.authtoken.models import Token
 
-from results.models.competitions import Competition
+from results.models.athletes import Athlete, AthleteInformation
+from results.models.categories import Category
+from results.models.competitions import (
+    Competition,
+    CompetitionLevel,
+    CompetitionResultType,
+    CompetitionType,
+)
 from results.models.events import Event
 from results.models.organizations import Area, Organization
-from results.models.results import Result, ResultPartial
+from results.models.records import Record
+from results.models.results import (
+    Result,
+    ResultPartial,
+    ResultTombstone,
+)
 from results.models.sports import Sport
+from results.models.statistics import PointsTable
+from results.utils.athlete_search import update_search_tokens
+from results.utils.bests import (
+    get_keys,
+    get_result_key,
+    queue_bests,
+    update_bests,
+    update_result_bests,
+)
+from results.utils.cache import invalidate_membership
+from results.utils.change_feed import mark_changed
 from results.utils.notification import (
     competition_creation_notification,
     event_creation_notification,
 )
+from results.utils.points import invalidate_year, queue_points, reset_table_points
 from results.utils.records import check_records, check_records_partial
+from results.utils.requirements import invalidate_coverage
+from results.utils.result_import import invalidate_reference_data
+from results.utils.snapshots import create_snapshot, delete_snapshot
+
+
+def _deleting(origin, models):
+    """
+    Returns True if deletion was started from an object or a queryset of the models.
+    """
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model in models
+
+
+def _deleting_competition(origin):
+    """
+    Returns True if deletion was started from a competition or its parent, which removes the competition too.
+    """
+    return _deleting(origin, [Competition, CompetitionLevel, CompetitionType])
 
 
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
@@ -30,6 +74,103 @@ def check_result_records(sender, instance=None, created=False, **kwargs):
         check_records(instance)
 
 
+@receiver(post_save, sender=Competition)
+def update_result_competition_columns(sender, instance=None, created=False, **kwargs):
+    """Update competition information copied to results after competition has been changed."""
+    if instance and not created:
+        columns = {
+            "competition_sport": instance.type.sport_id,
+            "competition_type": instance.type_id,
+            "competition_level": instance.level_id,
+            "competition_date_start": instance.date_start,
+            "competition_date_end": instance.date_end,
+            "competition_trial": instance.trial,
+        }
+        results = Result.objects.filter(competition=instance)
+        if results.exclude(**columns).update(updated_at=timezone.now(), **columns):
+            update_bests(get_keys(results))
+            mark_changed(instance.pk)
+            delete_snapshot(instance.pk)
+
+
+@receiver(post_save, sender=CompetitionType)
+def update_result_sport_column(sender, instance=None, created=False, **kwargs):
+    """Update sport copied to results after competition type has been changed."""
+    if instance and not created:
+        Result.objects.filter(competition_type=instance).exclude(competition_sport=instance.sport_id).update(
+            competition_sport=instance.sport_id
+        )
+
+
+@receiver(post_save, sender=Organization)
+def update_result_external_column(sender, instance=None, created=False, **kwargs):
+    """Update organization's external status copied to results after organization has been changed."""
+    if instance and not created and "external" in instance.changed_fields:
+        results = Result.objects.filter(organization=instance)
+        competition_ids = set(results.order_by().values_list("competition_id", flat=True).distinct())
+        results.update(organization_external=instance.external, updated_at=timezone.now())
+        for competition_id in competition_ids:
+            mark_changed(competition_id)
+            delete_snapshot(competition_id)
+
+
+@receiver(post_save, sender=Result)
+def update_points_for_result(sender, instance=None, created=False, **kwargs):
+    """Queue competition points recalculation after result has been saved."""
+    if instance:
+        queue_points([instance.competition_id])
+
+
+@receiver(post_delete, sender=Result)
+def update_points_for_deleted_result(sender, instance=None, origin=None, **kwargs):
+    """Queue competition points recalculation after result has been deleted."""
+    if instance and not _deleting_competition(origin):
+        queue_points([instance.competition_id])
+
+
+@receiver(post_save, sender=Competition)
+def update_points_for_competition(sender, instance=None, created=False, **kwargs):
+    """Queue competition points recalculation after competition has been changed."""
+    if instance and not created:
+        queue_points([instance.pk])
+
+
+@receiver(post_delete, sender=Competition)
+def update_points_for_deleted_competition(sender, instance=None, **kwargs):
+    """Remove cached points tables after competition has been deleted."""
+    if instance:
+        invalidate_year(instance.date_start.year)
+
+
+@receiver(post_save, sender=Organization)
+def update_points_for_organization(sender, instance=None, created=False, **kwargs):
+    """Queue competition points recalculation if organization's external status is changed."""
+    if instance and not created and "external" in instance.changed_fields:
+        queue_points(Result.objects.filter(organization=instance).values_list("competition_id", flat=True))
+
+
+@receiver(m2m_changed, sender=Organization.areas.through)
+def update_points_for_organization_areas(sender, instance=None, action=None, reverse=False, pk_set=None, **kwargs):
+    """Queue competition points recalculation if organization's areas are changed."""
+    if instance and action in ["post_add", "post_remove", "post_clear"]:
+        organizations = (pk_set or []) if reverse else [instance.pk]
+        queue_points(Result.objects.filter(organization__in=organizations).values_list("competition_id", flat=True))
+
+
+@receiver(post_save, sender=PointsTable)
+def update_points_for_table(sender, instance=None, **kwargs):
+    """Recalculate points after points table definition has been changed."""
+    if instance:
+        reset_table_points(instance)
+
+
+@receiver(m2m_changed, sender=PointsTable.types.through)
+def update_points_for_table_types(sender, instance=None, action=None, reverse=False, **kwargs):
+    """Recalculate points after points table competition types have been changed."""
+    if instance and not reverse and action in ["post_add", "post_remove", "post_clear"]:
+        reset_table_points(instance)
+
+
 @receiver(post_save, sender=ResultPartial)
 def check_result_records_partial(sender, instance=None, created=False, **kwargs):
     """Check for records after partial result has been saved."""
@@ -37,6 +178,87 @@ def check_result_records_partial(sender, instance=None, created=False, **kwargs)
         check_records_partial(instance)
 
 
+@receiver(post_save, sender=Result)
+def mark_result_changed(sender, instance=None, created=False, **kwargs):
+    """Mark competition changed for the result change feed."""
+    if instance:
+        mark_changed(instance.competition_id)
+
+
+@receiver(post_delete, sender=Result)
+def create_result_tombstone(sender, instance=None, **kwargs):
+    """Store deleted result for the result change feed."""
+    if instance:
+        ResultTombstone.objects.create(result_id=instance.pk, competition_id=instance.competition_id)
+        mark_changed(instance.competition_id)
+
+
+@receiver(post_save, sender=Result)
+def update_bests_for_result(sender, instance=None, created=False, **kwargs):
+    """Update athlete's bests after result has been saved."""
+    if instance:
+        update_result_bests(instance)
+
+
+@receiver(post_delete, sender=Result)
+def update_bests_for_deleted_result(sender, instance=None, origin=None, **kwargs):
+    """Update athlete's bests after result has been deleted."""
+    if instance and _deleting(origin, [Result]):
+        key = get_result_key(instance)
+        if key:
+            queue_bests(keys=[key])
+
+
+@receiver(post_save, sender=ResultPartial)
+def update_bests_for_partial(sender, instance=None, created=False, **kwargs):
+    """Update athlete's bests after partial result has been saved."""
+    if instance:
+        queue_bests(results=[instance.result_id])
+
+
+@receiver(post_delete, sender=ResultPartial)
+def update_bests_for_deleted_partial(sender, instance=None, origin=None, **kwargs):
+    """Update athlete's bests after partial result has been deleted."""
+    if instance and _deleting(origin, [ResultPartial]):
+        queue_bests(results=[instance.result_id])
+
+
+@receiver(pre_delete, sender=Competition)
+def get_bests_for_deleted_competition(sender, instance=None, **kwargs):
+    """Store athlete best keys before competition and its results are deleted."""
+    if instance:
+        instance.athlete_best_keys = get_keys(Result.objects.filter(competition=instance))
+
+
+@receiver(post_delete, sender=Competition)
+def update_bests_for_deleted_competition(sender, instance=None, **kwargs):
+    """Update athlete's bests after competition has been deleted."""
+    if instance:
+        update_bests(getattr(instance, "athlete_best_keys", []))
+
+
+@receiver(post_save, sender=ResultPartial)
+@receiver(post_delete, sender=ResultPartial)
+def touch_result_partial(sender, instance=None, **kwargs):
+    """Update result's timestamp when its partial results change."""
+    if instance:
+        results = Result.objects.filter(pk=instance.result_id)
+        competition_id = results.values_list("competition_id", flat=True).first()
+        if competition_id:
+            results.update(updated_at=timezone.now())
+            mark_changed(competition_id)
+            delete_snapshot(competition_id)
+
+
+@receiver(m2m_changed, sender=Result.team_members.through)
+def touch_result_team_members(sender, instance=None, action=None, reverse=False, **kwargs):
+    """Update result's timestamp when its team members change."""
+    if instance and not reverse and action in ["post_add", "post_remove", "post_clear"]:
+        Result.objects.filter(pk=instance.pk).update(updated_at=timezone.now())
+        mark_changed(instance.competition_id)
+        delete_snapshot(instance.competition_id)
+
+
 @receiver(post_save, sender=Organization)
 def create_organization_group(sender, instance=None, created=False, **kwargs):
     """Creates group when organization is created."""
@@ -79,3 +301,96 @@ def notify_event_creation(sender, instance=None, created=False, **kwargs):
     """Notify when event is created."""
     if created:
         event_creation_notification(instance)
+
+
+@receiver(post_save, sender=AthleteInformation)
+@receiver(post_delete, sender=AthleteInformation)
+def invalidate_requirement_coverage(sender, instance=None, **kwargs):
+    """Remove athlete's cached requirement coverage after athlete information has been changed."""
+    if instance:
+        invalidate_coverage(instance.athlete_id)
+
+
+@receiver(post_save, sender=Athlete)
+def update_athlete_search_tokens(sender, instance=None, update_fields=None, **kwargs):
+    """Update athlete's search tokens after athlete has been saved."""
+    if instance and (not update_fields or {"first_name", "last_name", "sport_id"} & set(update_fields)):
+        update_search_tokens([instance])
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_user_membership(sender, instance=None, action=None, reverse=False, pk_set=None, **kwargs):
+    """Remove cached group membership after user's groups have been changed."""
+    if action not in ["post_add", "post_remove", "post_clear"]:
+        return
+    if not reverse:
+        invalidate_membership([instance.pk])
+    elif pk_set:
+        invalidate_membership(pk_set)
+    else:
+        invalidate_membership()
+
+
+@receiver(post_save, sender=Organization)
+@receiver(post_delete, sender=Organization)
+@receiver(post_save, sender=Area)
+@receiver(post_delete, sender=Area)
+@receiver(post_save, sender=Sport)
+@receiver(post_delete, sender=Sport)
+@receiver(post_delete, sender=Group)
+def invalidate_all_memberships(sender, **kwargs):
+    """Remove all cached group memberships after organization groups or area and sport managers may have changed."""
+    invalidate_membership()
+
+
+@receiver(m2m_changed, sender=Organization.areas.through)
+def invalidate_memberships_for_organization_areas(sender, action=None, **kwargs):
+    """Remove all cached group memberships after organization areas have been changed."""
+    if action in ["post_add", "post_remove", "post_clear"]:
+        invalidate_membership()
+
+
+@receiver(post_save, sender=Competition)
+def update_competition_snapshot(sender, instance=None, created=False, **kwargs):
+    """
+    Render result list snapshot when competition is locked and approved, and remove it after other changes.
+
+    Removed snapshot of a locked and approved competition is rendered again on the next request.
+    """
+    if instance and not created:
+        if (
+            instance.locked
+            and instance.approved
+            and ("locked" in instance.changed_fields or "approved" in instance.changed_fields)
+        ):
+            create_snapshot(instance.pk)
+        else:
+            delete_snapshot(instance.pk)
+
+
+@receiver(post_save, sender=Result)
+@receiver(post_delete, sender=Result)
+def delete_competition_snapshot(sender, instance=None, origin=None, **kwargs):
+    """Remove competition's result list snapshot after result has been changed."""
+    if instance and not _deleting_competition(origin):
+        delete_snapshot(instance.competition_id)
+
+
+@receiver(post_save, sender=Record)
+@receiver(post_delete, sender=Record)
+def delete_record_competition_snapshot(sender, instance=None, origin=None, **kwargs):
+    """Remove competition's result list snapshot after a record of its result has been changed."""
+    if instance and not _deleting(origin, [Result]) and not _deleting_competition(origin):
+        competition_id = Result.objects.filter(pk=instance.result_id).values_list("competition_id", flat=True).first()
+        if competition_id:
+            delete_snapshot(competition_id)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=CompetitionResultType)
+@receiver(post_delete, sender=CompetitionResultType)
+def invalidate_import_reference_data(sender, instance=None, **kwargs):
+    """Remove cached import reference data when categories or result types change."""
+    if instance:
+        invalidate_reference_data()
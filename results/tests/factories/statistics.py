@@ -1,6 +1,6 @@
 import factory
 
-from results.models.statistics import StatisticsLink
+from results.models.statistics import PointsTable, StatisticsLink
 
 
 class StatisticsLinkFactory(factory.django.DjangoModelFactory):
@@ -11,3 +11,15 @@ class StatisticsLinkFactory(factory.django.DjangoModelFactory):
     name = "Junior 11"
     group = "Junior Qualification"
     link = "?category=11&link=true"
+
+
+class PointsTableFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = PointsTable
+        django_get_or_create = ("slug",)
+
+    name = "Area points"
+    slug = "area-points"
+    levels = "SM"
+    points = "3,2,1"
+    public = True
@@ -0,0 +1,135 @@
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from results.db_router import ReplicaRouter, reset_replica_reads, set_replica_reads
+from results.middleware.replica import ReplicaMiddleware
+from results.models.organizations import Area
+from results.models.results import Result
+from results.tests.factories.results import ResultFactory
+from results.utils.snapshots import create_snapshot
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRouterTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+
+    def test_router_without_replicas(self):
+        token = set_replica_reads(True)
+        with self.settings(DATABASE_REPLICAS=[]):
+            self.assertIsNone(self.router.db_for_read(Result))
+            self.assertEqual(self.router.db_for_write(Result), "default")
+        reset_replica_reads(token)
+
+    def test_router_replica_reads(self):
+        self.assertEqual(self.router.db_for_read(Result), "default")
+        token = set_replica_reads(True)
+        self.assertEqual(self.router.db_for_read(Result), "replica")
+        self.assertEqual(self.router.db_for_write(Result), "default")
+        self.assertEqual(self.router.db_for_read(Result), "default")
+        reset_replica_reads(token)
+        self.assertEqual(self.router.db_for_read(Result), "default")
+
+    def test_router_allow_migrate(self):
+        self.assertFalse(self.router.allow_migrate("replica", "results"))
+        self.assertIsNone(self.router.allow_migrate("default", "results"))
+
+    def _get_read_database(self, method, **headers):
+        databases = []
+
+        def get_response(request):
+            databases.append(self.router.db_for_read(Result))
+            return HttpResponse()
+
+        ReplicaMiddleware(get_response)(getattr(self.factory, method)("/api/resultlist/", headers=headers))
+        return databases[0]
+
+    def test_middleware_routes_safe_methods_to_replica(self):
+        self.assertEqual(self._get_read_database("get"), "replica")
+        self.assertEqual(self._get_read_database("post"), "default")
+        self.assertEqual(self.router.db_for_read(Result), "default")
+
+    @patch("results.middleware.replica.is_shared_cache", return_value=True)
+    def test_middleware_sticky_after_write(self, mock_shared):
+        self.assertEqual(self._get_read_database("get", authorization="Token abc"), "replica")
+        self._get_read_database("post", authorization="Token abc")
+        self.assertEqual(self._get_read_database("get", authorization="Token abc"), "default")
+        self.assertEqual(self._get_read_database("get", authorization="Token def"), "replica")
+        with self.settings(REPLICA_STICKY_SECONDS=0):
+            self._get_read_database("post", authorization="Token def")
+        self.assertEqual(self._get_read_database("get", authorization="Token def"), "replica")
+
+    def test_middleware_identified_clients_use_default_with_local_cache(self):
+        self.assertEqual(self._get_read_database("get"), "replica")
+        self.assertEqual(self._get_read_database("get", authorization="Token abc"), "default")
+
+    def test_middleware_resets_replica_reads_after_error(self):
+        def get_response(request):
+            raise ValueError
+
+        with self.assertRaises(ValueError):
+            ReplicaMiddleware(get_response)(self.factory.get("/api/resultlist/"))
+        self.assertEqual(self.router.db_for_read(Result), "default")
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaDatabaseTestCase(TransactionTestCase):
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        cache.clear()
+        self.router = ReplicaRouter()
+        self.user = User.objects.create(username="superuser", is_superuser=True)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + Token.objects.get(user=self.user).key)
+
+    def _request(self, method, url, data=None):
+        with CaptureQueriesContext(connections["default"]) as default:
+            with CaptureQueriesContext(connections["replica"]) as replica:
+                response = getattr(self.client, method)(url, data)
+        self.assertEqual(self.router.db_for_read(Result), "default")
+        return response, len(default), len(replica)
+
+    @patch("results.middleware.replica.is_shared_cache", return_value=True)
+    def test_get_reads_from_replica(self, mock_shared):
+        Area.objects.create(name="Area", abbreviation="A")
+        response, default, replica = self._request("get", "/api/areas/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(default, 0)
+        self.assertGreater(replica, 0)
+
+    def test_write_and_sticky_reads_use_default(self):
+        response, default, replica = self._request("post", "/api/areas/", {"name": "Area", "abbreviation": "A"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertGreater(default, 0)
+        self.assertEqual(replica, 0)
+        response, default, replica = self._request("get", "/api/areas/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
+        self.assertGreater(default, 0)
+        self.assertEqual(replica, 0)
+
+    def test_snapshot_rendered_from_default(self):
+        with self.settings(DEFAULT_LOG_USER_ID=self.user.pk):
+            result = ResultFactory.create(public=True)
+        token = set_replica_reads(True)
+        try:
+            with CaptureQueriesContext(connections["default"]) as default:
+                with CaptureQueriesContext(connections["replica"]) as replica:
+                    create_snapshot(result.competition_id)
+        finally:
+            reset_replica_reads(token)
+        self.assertEqual(len(replica), 0)
+        self.assertGreater(len(default), 0)
@@ -1,10 +1,30 @@
+import csv
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.admin.models import LogEntry
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.management import call_command
 from django.test import TestCase
 
-from results.models.competitions import Competition
+from results.models.athletes import AthleteSearchToken
+from results.models.competitions import (
+    Competition,
+    CompetitionLevel,
+    CompetitionSnapshot,
+)
 from results.models.events import Event
-from results.models.results import Result
+from results.models.results import AthleteBest, Result, ResultTombstone
+from results.models.statistics import CompetitionPoints, PointsQueue
+from results.tests.factories.athletes import AthleteFactory, AthleteInformationFactory
 from results.tests.factories.results import ResultFactory
 
 
@@ -27,7 +47,9 @@ class Approve(TestCase):
 
     def test_approve_objects_within_date_limit(self):
         self.user = User.objects.create(username="logger")
-        result = ResultFactory.create(approved=False, competition__locked=False, competition__event__locked=False)
+        result = ResultFactory.create(
+            approved=False, competition__locked=False, competition__approved=True, competition__event__locked=False
+        )
         call_command("approve", days=0, result=True, record=True, event=True, competition=True, verbosity=0)
         self.assertEqual(Result.objects.filter(approved=False).count(), 0)
         self.assertEqual(Event.objects.filter(locked=False).count(), 1)
@@ -39,6 +61,7 @@ class Approve(TestCase):
         call_command("approve", days=0, result=True, record=True, event=True, competition=True, verbosity=0)
         self.assertEqual(Event.objects.filter(locked=False).count(), 0)
         self.assertEqual(Competition.objects.filter(locked=False).count(), 0)
+        self.assertTrue(CompetitionSnapshot.objects.filter(competition=result.competition).exists())
 
     def test_approve_unpublished_result(self):
         self.user = User.objects.create(username="logger")
@@ -51,3 +74,131 @@ class Approve(TestCase):
         result.save()
         call_command("approve", days=0, result=True, verbosity=0)
         self.assertEqual(Result.objects.filter(approved=False).count(), 0)
+
+    def test_approve_result_requirements(self):
+        cache.clear()
+        self.user = User.objects.create(username="logger")
+        result = ResultFactory.create(approved=False, competition__locked=False, competition__event__locked=False)
+        result.competition.type.requirements = "licence"
+        result.competition.type.save()
+        call_command("approve", days=0, result=True, verbosity=0)
+        self.assertEqual(Result.objects.filter(approved=False).count(), 1)
+        AthleteInformationFactory.create(
+            athlete=result.athlete,
+            type="licence",
+            date_start=result.competition.date_start - timedelta(days=1),
+            date_end=result.competition.date_start,
+        )
+        call_command("approve", days=0, result=True, verbosity=0)
+        self.assertEqual(Result.objects.filter(approved=False).count(), 0)
+        self.assertTrue(
+            LogEntry.objects.filter(object_id=str(result.pk), change_message__contains="approved").exists()
+        )
+
+
+class UpdatePoints(TestCase):
+    def test_update_points(self):
+        self.user = User.objects.create(username="logger")
+        level = CompetitionLevel.objects.create(name="SM", abbreviation="SM")
+        result = ResultFactory.create(competition__level=level, position=2)
+        CompetitionPoints.objects.all().delete()
+        call_command("updatepoints", result.competition.date_start.year, verbosity=0)
+        points = CompetitionPoints.objects.get()
+        self.assertEqual(points.group_id, result.organization_id)
+        self.assertEqual(points.value, 7)
+
+    def test_update_points_queue(self):
+        self.user = User.objects.create(username="logger")
+        level = CompetitionLevel.objects.create(name="SM", abbreviation="SM")
+        result = ResultFactory.create(competition__level=level, position=1)
+        self.assertEqual(PointsQueue.objects.count(), 1)
+        call_command("updatepoints", queue=True, verbosity=0)
+        self.assertEqual(PointsQueue.objects.count(), 0)
+        self.assertEqual(CompetitionPoints.objects.get(competition=result.competition).value, 8)
+
+
+class CheckIndexes(TestCase):
+    def test_check_indexes(self):
+        out = StringIO()
+        call_command("checkindexes", explain=True, stdout=out)
+        self.assertIn("record check:", out.getvalue())
+        self.assertIn("All indexes exist.", out.getvalue())
+
+
+class UpdateAthleteBests(TestCase):
+    def test_update_athlete_bests(self):
+        self.user = User.objects.create(username="logger")
+        result = ResultFactory.create()
+        AthleteBest.objects.all().delete()
+        call_command("updateathletebests", athlete=str(result.athlete_id), verbosity=0)
+        self.assertEqual(AthleteBest.objects.get().result, result)
+
+
+class PruneTombstones(TestCase):
+    def test_prune_tombstones(self):
+        old = ResultTombstone.objects.create(result_id=1, competition_id=1)
+        ResultTombstone.objects.filter(pk=old.pk).update(deleted_at=old.deleted_at - timedelta(days=31))
+        new = ResultTombstone.objects.create(result_id=2, competition_id=1)
+        call_command("prunetombstones", verbosity=0)
+        self.assertEqual(list(ResultTombstone.objects.values_list("pk", flat=True)), [new.pk])
+
+
+class UpdateAthleteSearch(TestCase):
+    def test_update_athlete_search(self):
+        self.user = User.objects.create(username="logger")
+        athlete = AthleteFactory.create(first_name="Matti", last_name="Meikäläinen", sport_id="123")
+        AthleteSearchToken.objects.all().delete()
+        call_command("updateathletesearch", verbosity=0)
+        self.assertIn("meikal", AthleteSearchToken.objects.filter(athlete=athlete).values_list("token", flat=True))
+
+
+class ExportOpenData(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="logger")
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def _export(self):
+        out = StringIO()
+        call_command("exportopendata", output=self.directory, stdout=out)
+        with open(os.path.join(self.directory, "manifest.json")) as f:
+            return out.getvalue(), {entry["path"]: entry for entry in json.load(f)["files"]}
+
+    def test_export_open_data(self):
+        result = ResultFactory.create(result=Decimal("12.5"))
+        ResultFactory.create(public=False, competition=result.competition)
+        prefix = "%s/%s/" % (result.competition.date_start.year, result.competition.type.sport.abbreviation.lower())
+        out, files = self._export()
+        self.assertEqual(
+            set(files),
+            {
+                prefix + name
+                for name in ["competitions.ndjson.gz", "competitions.csv.gz", "results.ndjson.gz", "results.csv.gz"]
+            },
+        )
+        entry = files[prefix + "results.ndjson.gz"]
+        self.assertEqual(entry["rows"], 1)
+        with open(os.path.join(self.directory, entry["path"]), "rb") as f:
+            content = f.read()
+        self.assertEqual(entry["sha256"], hashlib.sha256(content).hexdigest())
+        row = json.loads(gzip.decompress(content))
+        self.assertEqual((row["id"], row["result"], row["approved"]), (result.pk, "12.500", result.approved))
+        with gzip.open(os.path.join(self.directory, prefix + "results.csv.gz"), "rt") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual([(row["id"], row["result"]) for row in rows], [(str(result.pk), "12.500")])
+
+        out, unchanged = self._export()
+        self.assertEqual(out, "")
+        self.assertEqual(unchanged, files)
+
+        result.result = 13
+        result.save()
+        out, files = self._export()
+        self.assertIn(prefix + "results.csv.gz", out)
+        self.assertNotIn("competitions", out)
+
+        result.public = False
+        result.save()
+        out, files = self._export()
+        self.assertNotIn(prefix + "results.csv.gz", files)
+        self.assertFalse(os.path.exists(os.path.join(self.directory, prefix + "results.csv.gz")))
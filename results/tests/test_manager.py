@@ -1,12 +1,17 @@
+from unittest.mock import patch
+
 from django.contrib.auth.models import Group, User
+from django.core.cache import cache
 
 from results.models.organizations import Area, Organization
 from results.models.sports import Sport
 from results.tests.utils import ResultsTestCase
+from results.utils.cache import LOCAL_CACHE_TIMEOUT, get_membership
 
 
 class OrganizationManagerTestCase(ResultsTestCase):
     def setUp(self):
+        cache.clear()
         self.user = User.objects.create(username="tester")
         self.area1 = Area.objects.create(name="Area 1", abbreviation="area1")
         self.area2 = Area.objects.create(name="Area 2", abbreviation="area2")
@@ -34,9 +39,23 @@ class OrganizationManagerTestCase(ResultsTestCase):
         self.assertTrue(self.organization2.is_area_manager(self.user))
         self.assertFalse(self.organization3.is_area_manager(self.user))
 
+    def test_organization_manager_cache_invalidation(self):
+        self.user.groups.add(Group.objects.get(name="area_area2"))
+        self.assertFalse(self.organization1.is_manager(self.user))
+        self.organization1.areas.add(self.area2)
+        self.assertTrue(self.organization1.is_manager(self.user))
+        self.user.groups.clear()
+        self.assertFalse(self.organization1.is_manager(self.user))
+        self.user.groups.add(Group.objects.get(name="club_org3_" + str(self.organization3.pk)))
+        self.assertTrue(self.organization3.is_manager(self.user))
+        self.organization3.group = None
+        self.organization3.save()
+        self.assertFalse(self.organization3.is_manager(self.user))
+
 
 class SportManagerTestCase(ResultsTestCase):
     def setUp(self):
+        cache.clear()
         self.user = User.objects.create(username="tester")
         self.sport = Sport.objects.create(name="Sport", abbreviation="sport")
 
@@ -44,3 +63,38 @@ class SportManagerTestCase(ResultsTestCase):
         self.assertFalse(self.sport.is_manager(self.user))
         self.user.groups.add(Group.objects.get(name="sport_sport"))
         self.assertTrue(self.sport.is_manager(self.user))
+
+    def test_sport_manager_cache_invalidation(self):
+        group = Group.objects.get(name="sport_sport")
+        self.user.groups.add(group)
+        self.assertTrue(self.sport.is_manager(self.user))
+        group.user_set.remove(self.user)
+        self.assertFalse(self.sport.is_manager(self.user))
+        self.sport.manager = Group.objects.create(name="new_sport_manager")
+        self.sport.save()
+        self.user.groups.add(self.sport.manager)
+        self.assertTrue(self.sport.is_manager(self.user))
+        self.sport.manager = None
+        self.sport.save()
+        self.assertFalse(self.sport.is_manager(self.user))
+
+
+class MembershipCacheTestCase(ResultsTestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="tester")
+
+    def _get_timeout(self, shared):
+        with patch("results.utils.cache.is_shared_cache", return_value=shared):
+            with patch("results.utils.cache.cache.set") as mock_set:
+                get_membership(self.user.pk)
+        return mock_set.call_args.args[2]
+
+    def test_membership_timeout_limited_with_local_cache(self):
+        with self.settings(MEMBERSHIP_CACHE_TIMEOUT=86400):
+            self.assertEqual(self._get_timeout(shared=False), LOCAL_CACHE_TIMEOUT)
+            self.assertEqual(self._get_timeout(shared=True), 86400)
+        with self.settings(MEMBERSHIP_CACHE_TIMEOUT=None):
+            self.assertEqual(self._get_timeout(shared=False), LOCAL_CACHE_TIMEOUT)
+        with self.settings(MEMBERSHIP_CACHE_TIMEOUT=10):
+            self.assertEqual(self._get_timeout(shared=False), 10)
@@ -1,6 +1,8 @@
 from datetime import date, timedelta
 
 from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APIRequestFactory
 
@@ -70,6 +72,55 @@ class AthleteTestCase(ResultsTestCase):
         response = self._test_list(user=self.user)
         self.assertEqual(len(response.data["results"]), 1)
 
+    def test_athlete_access_list_filter_licence_by_sport(self):
+        sport = SportFactory.create()
+        for value in ["A", "B"]:
+            AthleteInformationFactory.create(
+                athlete=self.object,
+                sport=sport,
+                type="licence",
+                value=value,
+                date_start=date.today(),
+                date_end=date.today(),
+            )
+        self.url = "/api/athletes/?info=licence&sport=%s" % sport.pk
+        with CaptureQueriesContext(connection) as queries:
+            response = self._test_list(user=self.user)
+        self.assertEqual([item["id"] for item in response.data["results"]], [self.object.pk])
+        self.assertFalse([query for query in queries.captured_queries if "DISTINCT" in query["sql"]])
+        self.url = "/api/athletes/?info=licence&sport=%s" % SportFactory.create(name="Other", abbreviation="O").pk
+        response = self._test_list(user=self.user)
+        self.assertEqual(len(response.data["results"]), 0)
+
+    def _search(self, params):
+        request = self.factory.get(self.url + "search/", params)
+        view = self.viewset.as_view(actions={"get": "search"})
+        return view(request)
+
+    def test_athlete_search(self):
+        athlete = AthleteFactory.create(first_name="Äijä-Pekka", last_name="Öhman", sport_id="1234567")
+        AthleteFactory.create(first_name="Pekka", last_name="Ohtonen", sport_id="7654321")
+        response = self._search({"q": "aija oh"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["id"] for item in response.data], [athlete.pk])
+        self.assertEqual(set(response.data[0]), {"id", "first_name", "last_name", "sport_id"})
+        self.assertEqual(len(self._search({"q": "pekka"}).data), 2)
+        self.assertEqual(len(self._search({"q": "pekka", "limit": 1}).data), 1)
+        self.assertEqual([item["id"] for item in self._search({"q": "12345"}).data], [athlete.pk])
+        self.assertEqual(self._search({"q": "ekka"}).data, [])
+        self.assertEqual(self._search({"q": "p"}).data, [])
+
+    def test_athlete_search_after_update(self):
+        self.object.last_name = "Virtanen"
+        self.object.save()
+        self.assertEqual([item["id"] for item in self._search({"q": "virt"}).data], [self.object.pk])
+        self.object.last_name = "Nieminen"
+        self.object.save()
+        self.assertEqual(self._search({"q": "virt"}).data, [])
+
+    def test_athlete_search_invalid_limit(self):
+        self.assertEqual(self._search({"q": "virt", "limit": "a"}).status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_athlete_access_object_without_user(self):
         response = self._test_access(user=None)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
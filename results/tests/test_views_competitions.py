@@ -1,7 +1,9 @@
 from datetime import timedelta
+from decimal import Decimal
 
 from django.contrib.auth.models import Group, User
 from django.core import mail
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase, override_settings
 from rest_framework import status
 from rest_framework.test import APIRequestFactory, force_authenticate
@@ -14,6 +16,9 @@ from results.models.competitions import (
     CompetitionType,
 )
 from results.models.organizations import Area
+from results.models.results import Result
+from results.tests.factories.athletes import AthleteFactory
+from results.tests.factories.categories import CategoryFactory
 from results.tests.factories.competitions import (
     CompetitionFactory,
     CompetitionLayoutFactory,
@@ -22,6 +27,7 @@ from results.tests.factories.competitions import (
     CompetitionTypeFactory,
 )
 from results.tests.factories.events import EventFactory
+from results.tests.factories.results import ResultFactory, ResultPartialFactory
 from results.tests.utils import ResultsTestCase
 from results.views.competitions import (
     CompetitionLayoutViewSet,
@@ -791,3 +797,162 @@ class CompetitionTestCase(ResultsTestCase):
     def test_competition_delete_with_staffuser(self):
         response = self._test_delete(user=self.staff_user)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+    def _test_positions(self, user):
+        request = self.factory.post(self.url + "1/positions/")
+        if user:
+            force_authenticate(request, user=user)
+        view = self.viewset.as_view(actions={"post": "positions"})
+        return view(request, pk=self.object.pk)
+
+    def test_competition_positions_with_normal_user(self):
+        response = self._test_positions(user=self.user)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_competition_positions_with_tiebreak(self):
+        series = CompetitionResultTypeFactory.create(competition_type=self.object.type, abbreviation="S", tiebreak=1)
+        inner = CompetitionResultTypeFactory.create(competition_type=self.object.type, abbreviation="X", tiebreak=2)
+        category = CategoryFactory.create()
+        results = [
+            ResultFactory.create(competition=self.object, category=category, result=result, position=None)
+            for result in (Decimal("95"), Decimal("98"), Decimal("98"), Decimal("98"), Decimal("98"))
+        ]
+        for result, last_series, inner_tens in (
+            (results[1], "49", "3"),
+            (results[2], "48", "5"),
+            (results[3], "49", "4"),
+            (results[4], "49", "4"),
+        ):
+            ResultPartialFactory.create(
+                result=result, type=series, order=1, value=Decimal("98") - Decimal(last_series)
+            )
+            ResultPartialFactory.create(result=result, type=series, order=2, value=Decimal(last_series))
+            ResultPartialFactory.create(result=result, type=inner, order=1, value=Decimal(inner_tens))
+        dns = ResultFactory.create(competition=self.object, category=category, result=None, result_code="DNS")
+        response = self._test_positions(user=self.superuser)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 6)
+        positions = dict(Result.objects.filter(competition=self.object).values_list("pk", "position"))
+        self.assertEqual(
+            [positions[result.pk] for result in results + [dns]],
+            [5, 3, 4, 1, 1, None],
+        )
+        response = self._test_positions(user=self.superuser)
+        self.assertEqual(response.data, [])
+
+    def test_competition_positions_removed_from_dnf(self):
+        result = ResultFactory.create(competition=self.object, result=Decimal("95"), position=1)
+        result.result_code = "DNF"
+        result.save()
+        response = self._test_positions(user=self.superuser)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        result.refresh_from_db()
+        self.assertIsNone(result.position_pre)
+        result.info = "Changed"
+        result.save()
+        result.refresh_from_db()
+        self.assertIsNone(result.position)
+
+    def _test_import(self, user, content, name, **data):
+        request = self.factory.post(
+            self.url + "1/import/", {"file": SimpleUploadedFile(name, content), **data}, format="multipart"
+        )
+        if user:
+            force_authenticate(request, user=user)
+        view = self.viewset.as_view(actions={"post": "import_results"})
+        return view(request, pk=self.object.pk)
+
+    def _create_import_data(self):
+        CompetitionResultTypeFactory.create(competition_type=self.object.type, abbreviation="S")
+        CategoryFactory.create(
+            abbreviation="S", name="Seniors", sport=self.object.type.sport, max_age=None, min_age=None, gender=None
+        )
+        return [AthleteFactory.create(sport_id=sport_id) for sport_id in ("10000001", "10000002")]
+
+    def test_competition_import_with_normal_user(self):
+        response = self._test_import(self.user, b"sport_id,category,result\n", "results.csv")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_competition_import_csv(self):
+        athletes = self._create_import_data()
+        content = (
+            "sport_id,category,result,decimals,S:1,S:2\n"
+            "10000001,S,190.5,1,95.1,95.4\n"
+            "10000002,S,185,0,90,95\n"
+            "10000003,S,180,0,90,90\n"
+            "10000002,X,180,0,90,90\n"
+        )
+        response = self._test_import(self.superuser, content.encode(), "results.csv")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual([error["row"] for error in response.data["errors"]], [3, 4])
+        result = Result.objects.get(competition=self.object, athlete=athletes[0])
+        self.assertEqual(result.result, Decimal("190.5"))
+        self.assertEqual(result.last_name, athletes[0].last_name)
+        self.assertEqual(result.organization, athletes[0].organization)
+        self.assertEqual([partial.value for partial in result.get_partials()], [Decimal("95.1"), Decimal("95.4")])
+        response = self._test_import(self.superuser, content.encode(), "results.csv")
+        self.assertEqual(response.data["created"], 0)
+        self.assertEqual(len(response.data["errors"]), 4)
+
+    def test_competition_import_ndjson_dry_run(self):
+        self._create_import_data()
+        content = (
+            '{"sport_id": "10000001", "category": "S", "result": 190, '
+            '"partial": [{"type": "S", "order": 1, "value": 95}]}\n'
+            '{"sport_id": "10000002", "category": "S", "result": "invalid"}\n'
+        )
+        response = self._test_import(self.superuser, content.encode(), "results.ndjson", dry_run=True)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["created"], 0)
+        self.assertEqual([error["row"] for error in response.data["errors"]], [2])
+        self.assertFalse(Result.objects.filter(competition=self.object).exists())
+
+    def test_competition_import_invalid_values(self):
+        self._create_import_data()
+        CategoryFactory.create(
+            abbreviation="T",
+            name="Team",
+            sport=self.object.type.sport,
+            team=True,
+            max_age=None,
+            min_age=None,
+            gender=None,
+        )
+        content = (
+            "sport_id,category,result,result_code,info\n"
+            "10000001,S,100,ABCDEFG,\n"
+            "10000002,S,100,,%s\n"
+            "10000001;10000002,T,100,,\n" % ("x" * 300)
+        )
+        response = self._test_import(self.superuser, content.encode(), "results.csv")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["created"], 0)
+        errors = response.data["errors"]
+        self.assertEqual([error["row"] for error in errors], [1, 2, 3])
+        self.assertIn("result_code", errors[0]["errors"])
+        self.assertIn("info", errors[1]["errors"])
+        self.assertEqual(errors[2]["errors"]["non_field_errors"][0], "Missing team name.")
+
+    def test_competition_import_team(self):
+        athletes = self._create_import_data()
+        CategoryFactory.create(
+            abbreviation="T",
+            name="Team",
+            sport=self.object.type.sport,
+            team=True,
+            max_age=None,
+            min_age=None,
+            gender=None,
+        )
+        content = "sport_id,category,last_name,result,S:1\n10000001;10000002,T,Team A,100,50\n10000001,S,,90,\n"
+        response = self._test_import(self.superuser, content.encode(), "results.csv")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data["created"], response.data["errors"]), (2, []))
+        result = Result.objects.get(competition=self.object, team=True)
+        self.assertEqual(set(result.team_members.all()), set(athletes))
+        self.assertEqual([partial.value for partial in result.get_partials()], [Decimal("50")])
+
+    def test_competition_import_invalid_file(self):
+        response = self._test_import(self.superuser, b"[{", "results.json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,7 +1,10 @@
 from datetime import date, timedelta
 
+from django.contrib.admin.models import CHANGE, DELETION, LogEntry
 from django.contrib.auth.models import Group, User
+from django.db import connection
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APIRequestFactory, force_authenticate
 
@@ -14,7 +17,8 @@ from results.tests.factories.competitions import (
     CompetitionResultTypeFactory,
 )
 from results.tests.factories.results import ResultFactory, ResultPartialFactory
-from results.views.records import RecordViewSet
+from results.utils.record_approval import approval_order, approve_records
+from results.views.records import RecordList, RecordViewSet
 
 
 class RecordsTestCase(TestCase):
@@ -278,6 +282,128 @@ class RecordsTestCase(TestCase):
         self.assertEqual(Record.objects.all().count(), 3)
         self.assertEqual(Record.objects.filter(date_end=None).count(), 3)
 
+    def test_partial_record_type(self):
+        partial = ResultPartialFactory.create(result=self.result, type=self.competition_result_type, value=50)
+        self.assertEqual(Record.objects.filter(partial_result=partial, partial_type=partial.type).count(), 2)
+        self.assertEqual(Record.objects.filter(partial_result=None, partial_type=None).count(), 2)
+
+    def _create_record_chain(self):
+        self.model.objects.all().update(approved=True)
+        result = ResultFactory.create(
+            competition=self.competition_later, athlete=self.athlete2, category=self.category_W20, result=300
+        )
+        for record in self.model.objects.filter(approved=False):
+            record.approved = True
+            record.save()
+        return result
+
+    def _test_record_list(self, params):
+        request = self.factory.get("/api/recordlist/", params)
+        view = RecordList.as_view(actions={"get": "list"})
+        return view(request)
+
+    def test_record_list_at_date(self):
+        result = self._create_record_chain()
+        response = self._test_record_list({"level": self.record_level.pk, "category": self.category_W20.pk})
+        self.assertEqual([record["result"]["id"] for record in response.data["results"]], [result.pk])
+        response = self._test_record_list(
+            {
+                "level": self.record_level.pk,
+                "category": self.category_W20.pk,
+                "at": self.competition.date_start.strftime("%Y-%m-%d"),
+            }
+        )
+        self.assertEqual([record["result"]["id"] for record in response.data["results"]], [self.result.pk])
+        response = self._test_record_list(
+            {
+                "level": self.record_level.pk,
+                "category": self.category_W20.pk,
+                "at": self.competition_later.date_start.strftime("%Y-%m-%d"),
+            }
+        )
+        self.assertEqual([record["result"]["id"] for record in response.data["results"]], [result.pk])
+        response = self._test_record_list(
+            {
+                "level": self.record_level.pk,
+                "category": self.category_W20.pk,
+                "at": (self.competition.date_start - timedelta(days=1)).strftime("%Y-%m-%d"),
+            }
+        )
+        self.assertEqual(response.data["results"], [])
+
+    def test_record_list_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self._test_record_list({"category": self.category_W20.pk, "fields": "id,level,date_start"})
+        self.assertEqual(set(response.data["results"][0]), {"id", "level", "date_start"})
+        self.assertFalse(
+            [query for query in queries.captured_queries if 'FROM "results_result"' in query["sql"]],
+        )
+        self.assertNotIn('"results_athlete"', " ".join(query["sql"] for query in queries.captured_queries))
+
+    def test_record_list_valid_between(self):
+        result = self._create_record_chain()
+        response = self._test_record_list(
+            {
+                "level": self.record_level.pk,
+                "category": self.category_W20.pk,
+                "valid_from": self.competition.date_start.strftime("%Y-%m-%d"),
+                "valid_to": self.competition_later.date_start.strftime("%Y-%m-%d"),
+            }
+        )
+        self.assertEqual(
+            sorted(record["result"]["id"] for record in response.data["results"]), sorted([self.result.pk, result.pk])
+        )
+        response = self._test_record_list(
+            {
+                "level": self.record_level.pk,
+                "category": self.category_W20.pk,
+                "valid_from": self.competition_later.date_start.strftime("%Y-%m-%d"),
+            }
+        )
+        self.assertEqual([record["result"]["id"] for record in response.data["results"]], [result.pk])
+
+    def test_record_history(self):
+        result = self._create_record_chain()
+        record = Record.objects.get(result=result, level=self.record_level, category=self.category_W20)
+        request = self.factory.get(self.url + str(record.pk) + "/history/")
+        view = self.viewset.as_view(actions={"get": "history"})
+        response = view(request, pk=record.pk)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["result"] for item in response.data], [self.result.pk, result.pk])
+        self.assertEqual(response.data[0]["date_end"], self.competition_later.date_start.strftime("%Y-%m-%d"))
+
+    def test_approve_records(self):
+        self.model.objects.all().update(approved=True)
+        result = ResultFactory.create(
+            competition=self.competition_later, athlete=self.athlete2, category=self.category_W20, result=300
+        )
+        lower_result = ResultFactory.create(
+            competition=self.competition_later, athlete=self.athlete_old, category=self.category_W20, result=250
+        )
+        lower_record = Record.objects.create(
+            result=lower_result,
+            level=self.record_level,
+            type=self.competition.type,
+            category=self.category_W20,
+            date_start=self.competition_later.date_start,
+        )
+        approved = approve_records(approval_order(Record.objects.filter(approved=False)))
+        self.assertEqual(len(approved), 3)
+        self.assertFalse(Record.objects.filter(pk=lower_record.pk).exists())
+        self.assertEqual(
+            Record.objects.filter(result=self.result, date_end=self.competition_later.date_start).count(), 2
+        )
+        self.assertEqual(Record.objects.filter(result=result, approved=True, date_end=None).count(), 2)
+        self.assertTrue(LogEntry.objects.filter(action_flag=DELETION, object_id=str(lower_record.pk)).exists())
+        self.assertEqual(
+            LogEntry.objects.filter(
+                action_flag=CHANGE,
+                object_id__in=[str(record.pk) for record in approved],
+                change_message__contains="approved: True",
+            ).count(),
+            3,
+        )
+
     def test_record_access_list(self):
         request = self.factory.get(self.url)
         view = self.viewset.as_view(actions={"get": "list"})
@@ -1,24 +1,53 @@
+import json
+import zlib
 from datetime import date, time
 from decimal import Decimal
+from unittest.mock import patch
 
+from asgiref.sync import iscoroutinefunction
 from dateutil.relativedelta import relativedelta
 from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.db import connection, transaction
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from django.utils import timezone
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIRequestFactory, force_authenticate
 
 from results.models.athletes import AthleteInformation
 from results.models.categories import CategoryForCompetitionType
+from results.models.competitions import Competition, CompetitionSnapshot
 from results.models.organizations import Area
-from results.models.results import Result, ResultPartial
-from results.tests.factories.athletes import AthleteFactory
+from results.models.records import Record, RecordLevel
+from results.models.results import (
+    AthleteBest,
+    Result,
+    ResultPartial,
+    ResultPartialPacked,
+)
+from results.serializers.results import ResultLimitedSerializer
+from results.tests.factories.athletes import AthleteFactory, AthleteInformationFactory
 from results.tests.factories.competitions import CompetitionResultTypeFactory
+from results.tests.factories.organizations import OrganizationFactory
 from results.tests.factories.results import ResultFactory, ResultPartialFactory
-from results.views.results import ResultList, ResultPartialViewSet, ResultViewSet
+from results.utils import change_feed
+from results.utils.bests import update_bests
+from results.utils.record_approval import approval_order, approve_records
+from results.views.results import (
+    AthleteBestViewSet,
+    ResultChangeFeed,
+    ResultList,
+    ResultPartialViewSet,
+    ResultViewSet,
+)
 
 
 class ResultTestCase(TestCase):
     def setUp(self):
+        cache.clear()
         self.factory = APIRequestFactory()
         self.user = User.objects.create(username="tester")
         self.group = Group.objects.create(name="testgroup")
@@ -236,6 +265,57 @@ class ResultTestCase(TestCase):
         for key in self.newdata:
             self.assertEqual(response.data[key], self.newdata[key])
 
+    def _test_create_many(self, user, data):
+        self.object.competition.locked = False
+        self.object.competition.save()
+        request = self.factory.post(self.url, data, format="json")
+        force_authenticate(request, user=user)
+        view = self.viewset.as_view(actions={"post": "create"})
+        return view(request)
+
+    def test_result_create_many_with_organization_user(self):
+        athlete = AthleteFactory.create(
+            gender="M", date_of_birth=date.today() - relativedelta(years=18), sport_id="many"
+        )
+        response = self._test_create_many(
+            user=self.organization_user, data=[self.newdata, {**self.newdata, "athlete": athlete.pk}]
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 2)
+        self.assertEqual(self.model.objects.all().count(), 3)
+
+    def test_result_create_many_duplicate(self):
+        response = self._test_create_many(user=self.organization_user, data=[self.newdata, self.newdata])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[1]["non_field_errors"][0], "Entry already exists.")
+        self.assertEqual(self.model.objects.all().count(), 1)
+
+    def _count_entry_preloads(self, queries):
+        return len(
+            [
+                query
+                for query in queries.captured_queries
+                if query["sql"].startswith('SELECT "results_result"."athlete_id"')
+                and query["sql"].endswith('WHERE "results_result"."competition_id" = %s' % self.object.competition_id)
+            ]
+        )
+
+    def test_result_create_existing_entry(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self._test_create(user=self.superuser, data={**self.newdata, "athlete": self.object.athlete.pk})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["non_field_errors"][0], "Entry already exists.")
+        self.assertEqual(self._count_entry_preloads(queries), 0)
+
+    def test_result_create_many_existing_entry(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self._test_create_many(
+                user=self.organization_user, data=[self.newdata, {**self.newdata, "athlete": self.object.athlete.pk}]
+            )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[1]["non_field_errors"][0], "Entry already exists.")
+        self.assertEqual(self._count_entry_preloads(queries), 1)
+
     def test_result_create_with_staff_user_locked_competition(self):
         response = self._test_create(user=self.staff_user, data=self.newdata, locked=True)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
@@ -483,6 +563,23 @@ class ResultTestCase(TestCase):
         response = self._test_create(user=self.staff_user, data=self.data, locked=False)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
+    @override_settings(CHECK_COMPETITION_REQUIREMENTS=True)
+    def test_result_create_after_adding_type_requirement(self):
+        self.data["athlete"] = self.athlete.pk
+        self.object.competition.type.requirements = "licence"
+        self.object.competition.type.save()
+        response = self._test_create(user=self.staff_user, data=self.data, locked=False)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        AthleteInformation.objects.create(
+            athlete=self.athlete,
+            type="licence",
+            value="ok",
+            date_start=self.object.competition.date_start,
+            date_end=self.object.competition.date_end,
+        )
+        response = self._test_create(user=self.staff_user, data=self.data, locked=False)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
     @override_settings(CHECK_COMPETITION_REQUIREMENTS=True)
     def test_result_create_without_level_requirement(self):
         self.data["athlete"] = self.athlete.pk
@@ -584,6 +681,45 @@ class ResultTestCase(TestCase):
         response = self._test_update(user=self.superuser, data=self.newdata, locked=True)
         self.assertEqual(len(response.data["partial"]), 0)
 
+    def test_result_update_with_packed_partial_result(self):
+        self.competition_result_type.packed = True
+        self.competition_result_type.save()
+        self.newdata["partial"] = [
+            {"order": order, "type": self.competition_result_type.pk, "value": Decimal("10.%s" % order), "decimals": 1}
+            for order in range(1, 61)
+        ]
+        response = self._test_update(user=self.superuser, data=self.newdata, locked=True)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["partial"]), 60)
+        self.assertEqual(response.data["partial"][1]["order"], 2)
+        self.assertEqual(response.data["partial"][1]["value"], "10.200")
+        self.assertEqual(ResultPartial.objects.filter(result=self.object).count(), 0)
+        self.assertEqual(ResultPartialPacked.objects.filter(result=self.object).count(), 1)
+
+    def test_result_update_with_packed_partial_delete_result(self):
+        self.test_result_update_with_packed_partial_result()
+        self.newdata["partial"] = []
+        response = self._test_update(user=self.superuser, data=self.newdata, locked=True)
+        self.assertEqual(len(response.data["partial"]), 0)
+        self.assertEqual(ResultPartialPacked.objects.filter(result=self.object).count(), 0)
+
+    def test_result_update_with_packed_partial_code_time_text(self):
+        self.competition_result_type.packed = True
+        self.competition_result_type.save()
+        self.newdata["partial"] = [
+            {"order": 1, "type": self.competition_result_type.pk, "value": Decimal("10.1"), "decimals": 1},
+            {"order": 2, "type": self.competition_result_type.pk, "code": "DNF", "time": "00:01:30", "text": "X"},
+        ]
+        response = self._test_update(user=self.superuser, data=self.newdata, locked=True)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self._test_access(user=self.superuser)
+        self.assertEqual(response.data["partial"][0]["code"], "")
+        self.assertEqual(response.data["partial"][0]["time"], None)
+        self.assertEqual(response.data["partial"][1]["value"], None)
+        self.assertEqual(response.data["partial"][1]["code"], "DNF")
+        self.assertEqual(response.data["partial"][1]["time"], "00:01:30")
+        self.assertEqual(response.data["partial"][1]["text"], "X")
+
     def test_result_create_with_team_result(self):
         team_members = [
             self.athlete.pk,
@@ -690,6 +826,23 @@ class PartialResultTestCase(TestCase):
             else:
                 self.assertEqual(response.data[key], self.data[key])
 
+    def test_partial_result_create_packed(self):
+        self.competition_result_type.packed = True
+        self.competition_result_type.save()
+        response = self._test_create(user=self.superuser, data=self.newdata, locked=True)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["non_field_errors"][0], "Partial results of a packed result type are saved with the result."
+        )
+        self.assertFalse(ResultPartialPacked.objects.filter(result=self.result).exists())
+
+    def test_partial_result_update_packed(self):
+        self.competition_result_type.packed = True
+        self.competition_result_type.save()
+        response = self._test_update(user=self.superuser, data=self.newdata, locked=True)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(ResultPartial.objects.get(pk=self.object.pk).order, self.object.order)
+
     def test_partial_result_update_without_user(self):
         response = self._test_update(user=None, data=self.newdata, locked=False)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -869,9 +1022,10 @@ class ResultListTestCase(TestCase):
         self.user = User.objects.create(username="tester")
         self.factory = APIRequestFactory()
         self.result = ResultFactory.create(
-            athlete=AthleteFactory.create(gender="M", date_of_birth=date.today() - relativedelta(years=18))
+            athlete=AthleteFactory.create(gender="M", date_of_birth=date.today() - relativedelta(years=18)),
+            competition__locked=False,
         )
-        self.result2 = ResultFactory.create(athlete=self.result.athlete)
+        self.result2 = ResultFactory.create(athlete=self.result.athlete, competition__locked=False)
         self.url = "/api/resultlist/"
         self.viewset = ResultList
         self.model = Result
@@ -892,6 +1046,276 @@ class ResultListTestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data["results"]), 1)
 
+    def _list(self, params):
+        request = self.factory.get(self.url, params)
+        view = self.viewset.as_view(actions={"get": "list"})
+        return view(request)
+
+    def test_result_list_packed_partials(self):
+        result_type = CompetitionResultTypeFactory.create(competition_type=self.result.competition.type, packed=True)
+        partial = ResultPartialFactory.create(result=self.result, value=5)
+        ResultPartialPacked.objects.create(
+            result=self.result,
+            type=result_type,
+            values=ResultPartialPacked.pack([{"order": 2, "value": Decimal("9.5"), "decimals": 1}, {"order": 1}]),
+        )
+        response = self._list({"competition": self.result.competition.pk})
+        row = next(row for row in response.data if row["id"] == self.result.pk)
+        self.assertEqual(
+            [(item["type"]["id"], item["order"], item["value"]) for item in row["partial"]],
+            [(partial.type_id, partial.order, "5.000"), (result_type.pk, 1, None), (result_type.pk, 2, "9.500")],
+        )
+
+    def test_result_list_fields_limit_eager_loading(self):
+        ResultPartialFactory.create(result=self.result, value=5)
+        with CaptureQueriesContext(connection) as queries:
+            response = self._list({"fields": "id,athlete,result"})
+        self.assertEqual(set(response.data["results"][0]), {"id", "athlete", "result"})
+        tables = " ".join(query["sql"] for query in queries.captured_queries)
+        for table in ["results_resultpartial", "results_record", "results_event", "results_competition"]:
+            self.assertNotIn(f'"{table}"', tables)
+        self.assertIn('"results_athlete"', tables)
+
+    def test_result_list_excluded_fields_limit_eager_loading(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self._list({"fields!": "partial,record"})
+        self.assertNotIn("partial", response.data["results"][0])
+        tables = " ".join(query["sql"] for query in queries.captured_queries)
+        self.assertNotIn('"results_resultpartial"', tables)
+        self.assertNotIn('"results_resultpartialpacked"', tables)
+        self.assertIn('"results_competition"', tables)
+
+    def _create_list_data(self):
+        athlete = self.result.athlete
+        athlete.additional_organizations.add(OrganizationFactory.create(name="Additional"))
+        AthleteInformationFactory.create(athlete=athlete, date_start=date(2000, 1, 1), date_end=date(2100, 1, 1))
+        AthleteInformationFactory.create(athlete=athlete, type="Licence", visibility="U")
+        ResultPartialFactory.create(result=self.result, value=Decimal("5.25"), time=time(12, 30), text="Final")
+        result_type = CompetitionResultTypeFactory.create(
+            competition_type=self.result.competition.type, abbreviation="shots", packed=True
+        )
+        ResultPartialPacked.objects.create(
+            result=self.result2,
+            type=result_type,
+            values=ResultPartialPacked.pack([{"order": 1, "value": Decimal("10.4"), "decimals": 1}, {"order": 2}]),
+        )
+        Record.objects.create(
+            result=self.result,
+            level=RecordLevel.objects.create(name="Finnish record", abbreviation="SE"),
+            type=self.result.competition.type,
+            category=self.result.category,
+            date_start=self.result.competition.date_start,
+        )
+        team = ResultFactory.create(
+            athlete=None, competition=self.result.competition, team=True, last_name="Team", elimination_category=None
+        )
+        team.team_members.set([self.result.athlete, AthleteFactory.create(last_name="Member")])
+
+    def _assert_list_matches_serializer(self, params, user=None):
+        request = self.factory.get(self.url, params)
+        if user:
+            force_authenticate(request, user)
+        response = self.viewset.as_view(actions={"get": "list"})(request)
+        view = response.renderer_context["view"]
+        serializer = ResultLimitedSerializer(
+            view.filter_queryset(view.get_queryset()), many=True, context=view.get_serializer_context()
+        )
+        data = response.data if isinstance(response.data, list) else response.data["results"]
+        self.assertTrue(data)
+        self.assertEqual(JSONRenderer().render(data), JSONRenderer().render(serializer.data))
+
+    def test_result_list_renderer_matches_serializer(self):
+        self._create_list_data()
+        self._assert_list_matches_serializer({})
+        self._assert_list_matches_serializer({"competition": self.result.competition.pk})
+        self._assert_list_matches_serializer({"ordering": "position"})
+
+    def test_result_list_renderer_matches_serializer_with_staff_user(self):
+        self._create_list_data()
+        self.user.is_staff = True
+        self.user.save()
+        self._assert_list_matches_serializer({}, user=self.user)
+
+    def test_result_list_renderer_matches_serializer_with_fields(self):
+        self._create_list_data()
+        self._assert_list_matches_serializer({"fields": "id,athlete,result,partial"})
+        self._assert_list_matches_serializer({"fields!": "athlete,competition"})
+
+    def test_result_list_snapshot_for_locked_competition(self):
+        self._create_list_data()
+        competition = self.result.competition
+        competition.locked = True
+        competition.approved = True
+        Competition.objects.filter(pk=competition.pk).update(locked=True, approved=True)
+        expected = self._list({"competition": competition.pk, "ordering": "-result"}).render().content
+        self.assertFalse(CompetitionSnapshot.objects.filter(competition=competition).exists())
+        competition.save()
+        self.assertTrue(CompetitionSnapshot.objects.filter(competition=competition).exists())
+        with CaptureQueriesContext(connection) as queries:
+            response = self._list({"competition": competition.pk})
+        self.assertEqual(response.content, expected)
+        self.assertEqual(len(queries.captured_queries), 1)
+        request = self.factory.get(self.url, {"competition": competition.pk}, HTTP_ACCEPT_ENCODING="gzip, deflate")
+        response = self.viewset.as_view(actions={"get": "list"})(request)
+        self.assertEqual(response["Content-Encoding"], "deflate")
+        self.assertEqual(zlib.decompress(response.content), expected)
+
+    def test_result_list_snapshot_not_used_for_users_and_other_parameters(self):
+        competition = self.result.competition
+        competition.locked = True
+        competition.approved = True
+        competition.save()
+        CompetitionSnapshot.objects.filter(competition=competition).update(content=zlib.compress(b"[]"))
+        self.assertEqual(self._list({"competition": competition.pk}).content, b"[]")
+        self.assertEqual(len(self._list({"competition": competition.pk, "ordering": "position"}).data), 1)
+        request = self.factory.get(self.url, {"competition": competition.pk})
+        force_authenticate(request, self.user)
+        self.assertEqual(len(self.viewset.as_view(actions={"get": "list"})(request).data), 1)
+
+    def test_result_list_snapshot_invalidation(self):
+        competition = self.result.competition
+        competition.locked = True
+        competition.approved = True
+        competition.save()
+        self.result.result = 123
+        self.result.save()
+        self.assertFalse(CompetitionSnapshot.objects.filter(competition=competition).exists())
+        response = self._list({"competition": competition.pk})
+        self.assertEqual(json.loads(response.content)[0]["result"], "123.000")
+        self.assertTrue(CompetitionSnapshot.objects.filter(competition=competition).exists())
+        competition.locked = False
+        competition.save()
+        self.assertFalse(CompetitionSnapshot.objects.filter(competition=competition).exists())
+        self.assertEqual(self._list({"competition": competition.pk}).data[0]["result"], "123.000")
+        self.assertFalse(CompetitionSnapshot.objects.filter(competition=competition).exists())
+
+    def test_result_list_snapshot_rendered_when_locked_and_approved(self):
+        competition = self.result.competition
+        competition.locked = True
+        competition.save()
+        self.assertFalse(CompetitionSnapshot.objects.filter(competition=competition).exists())
+        self.assertEqual(len(self._list({"competition": competition.pk}).data), 1)
+        self.assertFalse(CompetitionSnapshot.objects.filter(competition=competition).exists())
+        competition.approved = True
+        competition.save()
+        self.assertTrue(CompetitionSnapshot.objects.filter(competition=competition).exists())
+        competition = Competition.objects.get(pk=competition.pk)
+        competition.name = "Changed"
+        with patch("results.signals.create_snapshot") as mock_create:
+            competition.save()
+        mock_create.assert_not_called()
+        self.assertFalse(CompetitionSnapshot.objects.filter(competition=competition).exists())
+        self._list({"competition": competition.pk})
+        self.assertTrue(CompetitionSnapshot.objects.filter(competition=competition).exists())
+
+    def test_result_list_snapshot_record_approval(self):
+        competition = self.result.competition
+        record = Record.objects.create(
+            result=self.result,
+            level=RecordLevel.objects.create(name="Finnish record", abbreviation="SE"),
+            type=competition.type,
+            category=self.result.category,
+            date_start=competition.date_start,
+        )
+        competition.locked = True
+        competition.approved = True
+        competition.save()
+        self.assertFalse(json.loads(self._list({"competition": competition.pk}).content)[0]["record"][0]["approved"])
+        approve_records(approval_order(Record.objects.filter(pk=record.pk)))
+        self.assertFalse(CompetitionSnapshot.objects.filter(competition=competition).exists())
+        self.assertTrue(json.loads(self._list({"competition": competition.pk}).content)[0]["record"][0]["approved"])
+        record.refresh_from_db()
+        record.info = "Changed"
+        record.save()
+        self.assertFalse(CompetitionSnapshot.objects.filter(competition=competition).exists())
+
+    async def test_result_list_snapshot_async(self):
+        competition = self.result.competition
+        competition.locked = True
+        competition.approved = True
+        await competition.asave()
+        await CompetitionSnapshot.objects.filter(competition=competition).aupdate(content=zlib.compress(b"[]"))
+        self.assertTrue(iscoroutinefunction(resolve(self.url).func))
+        response = await self.async_client.get(self.url, {"competition": competition.pk})
+        self.assertEqual(response.content, b"[]")
+        response = await self.async_client.get(self.url, {"competition": competition.pk, "ordering": "position"})
+        self.assertEqual(len(response.json()), 1)
+
+    def test_result_list_competition_filters_follow_competition(self):
+        competition = self.result.competition
+        response = self._list({"level": competition.level.pk, "trial": 1})
+        self.assertEqual(len(response.data["results"]), 0)
+        competition.trial = True
+        competition.date_start = date(2000, 1, 1)
+        competition.save()
+        response = self._list({"level": competition.level.pk, "trial": 1, "end": "2000-01-01"})
+        self.assertEqual([row["id"] for row in response.data["results"]], [self.result.pk])
+        self.result.refresh_from_db()
+        self.assertEqual(self.result.competition_sport_id, competition.type.sport_id)
+
+    def test_result_list_external_filter_follows_organization(self):
+        organization = self.result.organization
+        organization.external = True
+        organization.save()
+        response = self._list({})
+        self.assertEqual(len(response.data["results"]), 2 - Result.objects.filter(organization=organization).count())
+        response = self._list({"external": 1})
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_result_list_column_updates_invalidate_snapshot_and_change_feed(self):
+        competition = self.result.competition
+        competition.locked = True
+        competition.approved = True
+        competition.save()
+        Result.objects.filter(pk=self.result.pk).update(updated_at=timezone.now() - relativedelta(days=1))
+        cache.delete(change_feed._cache_key(competition.pk))
+        updated_at = Result.objects.get(pk=self.result.pk).updated_at
+        organization = self.result.organization
+        organization.external = True
+        organization.save()
+        self.assertGreater(Result.objects.get(pk=self.result.pk).updated_at, updated_at)
+        self.assertIsNotNone(change_feed.get_change_marker(competition.pk))
+        self.assertFalse(CompetitionSnapshot.objects.filter(competition=competition).exists())
+        self._list({"competition": competition.pk})
+        cache.delete(change_feed._cache_key(competition.pk))
+        updated_at = Result.objects.get(pk=self.result.pk).updated_at
+        competition.trial = True
+        competition.save()
+        self.assertGreater(Result.objects.get(pk=self.result.pk).updated_at, updated_at)
+        self.assertIsNotNone(change_feed.get_change_marker(competition.pk))
+
+    def test_result_list_group_results(self):
+        result = ResultFactory.create(athlete=AthleteFactory.create(sport_id="2"), result=1500)
+        for value in [2000, 100]:
+            result.pk = None
+            result.result = value
+            result.save()
+        response = self._list({"group_results": 2, "page_size": 1})
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(response.data["results"][0]["athlete"]["id"], result.athlete.pk)
+        self.assertEqual(response.data["results"][0]["result"], "3500.000")
+
+    def test_result_list_group_results_by_organization_and_competition(self):
+        result = ResultFactory.create(
+            athlete=AthleteFactory.create(sport_id="2"), organization=self.result.organization
+        )
+        response = self._list(
+            {"group_results": 5, "group_by": "organization,competition", "aggregate": "count", "external": 1}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        row = response.data["results"][0]
+        self.assertEqual(set(row), {"id", "organization", "competition", "result"})
+        self.assertEqual(row["organization"], result.organization.abbreviation)
+        self.assertEqual(sum(row["result"] for row in response.data["results"]), 3)
+
+    def test_result_list_group_results_by_season(self):
+        response = self._list({"group_results": 5, "group_by": "season", "aggregate": "avg"})
+        self.assertEqual(response.data["results"][0]["season"], self.result.competition.date_start.year)
+
+    def test_result_list_group_results_invalid_group(self):
+        response = self._list({"group_results": 5, "group_by": "unknown"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_result_list_search(self):
         import os
 
@@ -903,3 +1327,210 @@ class ResultListTestCase(TestCase):
             self.assertEqual(response.status_code, status.HTTP_200_OK)
             self.assertEqual(len(response.data["results"]), 1)
             self.assertEqual(response.data["results"][0]["result"], str(self.result.result + self.result2.result))
+
+
+class ResultChangeFeedTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="tester")
+        self.factory = APIRequestFactory()
+        self.result = ResultFactory.create()
+        self.result2 = ResultFactory.create(competition=self.result.competition)
+        self.other_result = ResultFactory.create()
+        self.url = "/api/resultchanges/"
+        self.viewset = ResultChangeFeed
+
+    def _get_changes(self, cursor=None, user=None, **params):
+        params["competition"] = self.result.competition.pk
+        if cursor:
+            params["cursor"] = cursor
+        request = self.factory.get(self.url, params)
+        if user:
+            force_authenticate(request, user=user)
+        view = self.viewset.as_view(actions={"get": "list"})
+        return view(request)
+
+    def test_result_changes_initial(self):
+        response = self._get_changes()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([result["id"] for result in response.data["results"]], [self.result.pk, self.result2.pk])
+        self.assertEqual(response.data["deleted"], [])
+        self.assertFalse(response.data["more"])
+
+    def test_result_changes_missing_competition(self):
+        request = self.factory.get(self.url)
+        view = self.viewset.as_view(actions={"get": "list"})
+        response = view(request)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_result_changes_invalid_cursor(self):
+        response = self._get_changes(cursor="invalid")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_result_changes_limit(self):
+        response = self._get_changes(limit=1)
+        self.assertEqual([result["id"] for result in response.data["results"]], [self.result.pk])
+        self.assertTrue(response.data["more"])
+        response = self._get_changes(cursor=response.data["cursor"], limit=1)
+        self.assertEqual([result["id"] for result in response.data["results"]], [self.result2.pk])
+
+    def test_result_changes_since_cursor(self):
+        cursor = self._get_changes().data["cursor"]
+        response = self._get_changes(cursor=cursor)
+        self.assertEqual(response.data["results"], [])
+        self.assertEqual(response.data["cursor"], cursor)
+        self.result.info = "Changed"
+        self.result.save()
+        response = self._get_changes(cursor=cursor)
+        self.assertEqual([result["id"] for result in response.data["results"]], [self.result.pk])
+        self.assertEqual(response.data["results"][0]["info"], "Changed")
+
+    def test_result_changes_partial(self):
+        cursor = self._get_changes().data["cursor"]
+        ResultPartialFactory.create(result=self.result2)
+        response = self._get_changes(cursor=cursor)
+        self.assertEqual([result["id"] for result in response.data["results"]], [self.result2.pk])
+        self.assertEqual(len(response.data["results"][0]["partial"]), 1)
+
+    def test_result_changes_deleted(self):
+        cursor = self._get_changes().data["cursor"]
+        pk = self.result.pk
+        self.result.delete()
+        response = self._get_changes(cursor=cursor)
+        self.assertEqual(response.data["results"], [])
+        self.assertEqual(response.data["deleted"], [pk])
+        cursor = response.data["cursor"]
+        response = self._get_changes(cursor=cursor)
+        self.assertEqual(response.data["results"], [])
+        self.assertEqual(response.data["deleted"], [])
+        self.assertEqual(response.data["cursor"], cursor)
+        self.assertEqual(self._get_changes(cursor=cursor).data["deleted"], [])
+
+    def test_result_changes_deleted_before_initial(self):
+        self.result.delete()
+        cursor = self._get_changes().data["cursor"]
+        self.assertEqual(self._get_changes(cursor=cursor).data["deleted"], [])
+        pk = self.result2.pk
+        self.result2.delete()
+        response = self._get_changes(cursor=cursor)
+        self.assertEqual(response.data["deleted"], [pk])
+        self.assertEqual(self._get_changes(cursor=response.data["cursor"]).data["deleted"], [])
+
+    def test_result_changes_unpublished(self):
+        cursor = self._get_changes().data["cursor"]
+        self.result.public = False
+        self.result.save()
+        response = self._get_changes(cursor=cursor)
+        self.assertEqual(response.data["results"], [])
+        self.assertEqual(response.data["deleted"], [self.result.pk])
+        staff_user = User.objects.create(username="staffuser", is_staff=True)
+        response = self._get_changes(cursor=cursor, user=staff_user)
+        self.assertEqual([result["id"] for result in response.data["results"]], [self.result.pk])
+
+    @override_settings(RESULT_CHANGE_FEED_STREAM_TIMEOUT=0)
+    def test_result_changes_stream(self):
+        request = self.factory.get(self.url + "stream/", {"competition": self.result.competition.pk})
+        view = self.viewset.as_view(actions={"get": "stream"})
+        response = view(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        content = b"".join(response.streaming_content).decode()
+        self.assertIn("event: changes", content)
+        self.assertIn('"id":%s' % self.result2.pk, content)
+
+
+class AthleteBestTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="tester")
+        self.factory = APIRequestFactory()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.result = ResultFactory.create(result=100)
+            self.partial = ResultPartialFactory.create(result=self.result, value=10)
+        self.url = "/api/athletebests/"
+        self.viewset = AthleteBestViewSet
+
+    def _list(self, params):
+        request = self.factory.get(self.url, params)
+        view = self.viewset.as_view(actions={"get": "list"})
+        return view(request)
+
+    def _copy_result(self, value, date_start=None):
+        result = Result.objects.get(pk=self.result.pk)
+        result.pk = None
+        result.result = value
+        if date_start:
+            competition = result.competition
+            competition.pk = None
+            competition.date_start = date_start
+            competition.date_end = date_start
+            competition.save()
+            result.competition = competition
+        with self.captureOnCommitCallbacks(execute=True):
+            result.save()
+        return result
+
+    def test_athlete_best(self):
+        response = self._list({"athlete": self.result.athlete_id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        best = response.data["results"][0]
+        self.assertEqual(best["result"], self.result.pk)
+        self.assertEqual(best["value"], "100.000")
+        self.assertEqual(
+            best["partials"], [{"type": self.partial.type_id, "value": "10.000", "result": self.result.pk}]
+        )
+
+    def test_athlete_best_updated_with_results(self):
+        result = self._copy_result(200)
+        self.assertEqual(AthleteBest.objects.get().result, result)
+        with self.captureOnCommitCallbacks(execute=True):
+            ResultPartialFactory.create(result=result, type=self.partial.type, value=20)
+        self.assertEqual(AthleteBest.objects.get().partials.get().value, 20)
+        result.public = False
+        with self.captureOnCommitCallbacks(execute=True):
+            result.save()
+        best = AthleteBest.objects.get()
+        self.assertEqual((best.result, best.partials.get().partial), (self.result, self.partial))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.partial.delete()
+        self.assertEqual(AthleteBest.objects.get().partials.count(), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.result.delete()
+        self.assertEqual(AthleteBest.objects.count(), 0)
+
+    def test_athlete_personal_best(self):
+        result = self._copy_result(200, date_start=self.result.competition.date_start - relativedelta(years=1))
+        self.assertEqual(AthleteBest.objects.count(), 2)
+        response = self._list({"athlete": self.result.athlete_id, "personal": 1})
+        self.assertEqual([best["result"] for best in response.data["results"]], [result.pk])
+        result.competition.delete()
+        self.assertEqual(AthleteBest.objects.get().result, self.result)
+
+    def test_athlete_best_updated_once_per_transaction(self):
+        with patch("results.utils.bests.update_bests", wraps=update_bests) as mock_update:
+            with self.captureOnCommitCallbacks(execute=True):
+                with transaction.atomic():
+                    result = Result.objects.get(pk=self.result.pk)
+                    result.pk = None
+                    result.result = 200
+                    result.save()
+                    for order in range(2, 5):
+                        ResultPartialFactory.create(
+                            result=result, type=self.partial.type, order=order, value=order * 10
+                        )
+        self.assertEqual(mock_update.call_count, 1)
+        best = AthleteBest.objects.get()
+        self.assertEqual((best.result, best.partials.get().value), (result, 40))
+
+    def test_athlete_best_updated_after_savepoint_rollback(self):
+        result = Result.objects.get(pk=self.result.pk)
+        result.pk = None
+        result.result = 200
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                try:
+                    with transaction.atomic():
+                        ResultPartialFactory.create(result=self.result, type=self.partial.type, order=2, value=5)
+                        raise ValueError
+                except ValueError:
+                    pass
+                result.save()
+        self.assertEqual(AthleteBest.objects.get().result, result)
@@ -3,19 +3,27 @@ import logging
 from datetime import date
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import RequestFactory, TestCase
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIRequestFactory
 
 from results.models.competitions import CompetitionLevel
-from results.models.statistics import StatisticsLink
+from results.models.statistics import (
+    CompetitionPoints,
+    PointsQueue,
+    PointsTable,
+    StatisticsLink,
+)
+from results.tests.factories.athletes import AthleteFactory
 from results.tests.factories.competitions import CompetitionFactory
-from results.tests.factories.organizations import OrganizationFactory
+from results.tests.factories.organizations import AreaFactory, OrganizationFactory
 from results.tests.factories.results import ResultFactory
-from results.tests.factories.statistics import StatisticsLinkFactory
+from results.tests.factories.statistics import PointsTableFactory, StatisticsLinkFactory
 from results.tests.utils import ResultsTestCase
-from results.views.statistics import StatisticsLinkViewSet
+from results.utils.points import process_queue
+from results.views.statistics import PointsTableViewSet, StatisticsLinkViewSet
 
 
 class StatisticsLinkTestCase(ResultsTestCase):
@@ -115,6 +123,127 @@ class StatisticsLinkTestCase(ResultsTestCase):
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
 
 
+class PointsTableTestCase(ResultsTestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create(username="tester")
+        self.staff_user = User.objects.create(username="staffuser", is_staff=True)
+        self.object = PointsTableFactory.create()
+        self.newdata = {"name": "Athlete points", "slug": "athlete-points", "levels": "SM", "points": "5,3,1"}
+        self.url = "/api/pointstables/"
+        self.viewset = PointsTableViewSet
+        self.model = PointsTable
+
+    def test_points_table_list_without_user(self):
+        PointsTableFactory.create(slug="hidden", public=False)
+        request = self.factory.get(self.url)
+        view = self.viewset.as_view(actions={"get": "list"})
+        response = view(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([table["slug"] for table in response.data["results"]], [self.object.slug])
+
+    def test_points_table_create_with_normal_user(self):
+        response = self._test_create(user=self.user, data=self.newdata)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_points_table_create_with_staff_user(self):
+        response = self._test_create(user=self.staff_user, data=self.newdata)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_points_table_create_with_invalid_points(self):
+        self.newdata["points"] = "5,a"
+        response = self._test_create(user=self.staff_user, data=self.newdata)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class StatisticsPointsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        User.objects.create(username="logger")
+        self.level = CompetitionLevel.objects.create(name="SM", abbreviation="SM")
+        self.competition = CompetitionFactory.create(level=self.level)
+        self.year = self.competition.date_start.year
+        self.logger = logging.getLogger("django.request")
+        self.previous_level = self.logger.getEffectiveLevel()
+        self.logger.setLevel(logging.ERROR)
+
+    def tearDown(self):
+        self.logger.setLevel(self.previous_level)
+
+    def _get(self, slug):
+        return self.client.get(reverse("statistics-points", kwargs={"slug": slug, "year": self.year}))
+
+    def test_points_not_found(self):
+        response = self._get("unknown")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_points_not_public(self):
+        PointsTableFactory.create(public=False)
+        response = self._get("area-points")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_points_by_area(self):
+        area = AreaFactory.create()
+        org1 = OrganizationFactory.create(abbreviation="A", name="AN")
+        org2 = OrganizationFactory.create(abbreviation="B", name="BN")
+        org1.areas.add(area)
+        PointsTableFactory.create(group_by="area")
+        ResultFactory.create(organization=org1, competition=self.competition, position=1)
+        ResultFactory.create(organization=org1, competition=self.competition, position=3)
+        ResultFactory.create(organization=org2, competition=self.competition, position=2)
+        process_queue()
+        response = self._get("area-points")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = [{"area": {"id": area.pk, "name": area.name, "abbreviation": area.abbreviation}, "value": 4}]
+        self.assertEqual(response.json()["results"], data)
+        org2.areas.add(area)
+        process_queue()
+        self.assertEqual(self._get("area-points").json()["results"][0]["value"], 6)
+
+    def test_points_by_athlete_with_split_ties_and_external(self):
+        external = OrganizationFactory.create(abbreviation="E", name="EN", external=True)
+        athlete1 = AthleteFactory.create(first_name="A", last_name="A", sport_id="1")
+        athlete2 = AthleteFactory.create(first_name="B", last_name="B", sport_id="2")
+        athlete3 = AthleteFactory.create(first_name="C", last_name="C", sport_id="3")
+        table = PointsTableFactory.create(group_by="athlete", ties="split", external="include")
+        ResultFactory.create(athlete=athlete1, competition=self.competition, position=1)
+        ResultFactory.create(athlete=athlete2, competition=self.competition, position=1)
+        ResultFactory.create(athlete=athlete3, organization=external, competition=self.competition, position=3)
+        process_queue()
+        results = self._get("area-points").json()["results"]
+        self.assertEqual(
+            [(row["athlete"]["id"], row["value"]) for row in results],
+            [(athlete1.pk, 2.5), (athlete2.pk, 2.5), (athlete3.pk, 1)],
+        )
+        table.external = "ignore"
+        table.save()
+        process_queue()
+        results = self._get("area-points").json()["results"]
+        self.assertEqual([row["athlete"]["id"] for row in results], [athlete1.pk, athlete2.pk])
+
+    def test_points_read_without_processing_queue(self):
+        org = OrganizationFactory.create(abbreviation="A", name="AN")
+        PointsTableFactory.create(group_by="organization")
+        ResultFactory.create(organization=org, competition=self.competition, position=1)
+        queued = PointsQueue.objects.count()
+        self.assertEqual(self._get("area-points").json()["results"], [])
+        self.assertEqual(PointsQueue.objects.count(), queued)
+        self.assertEqual(CompetitionPoints.objects.count(), 0)
+        process_queue()
+        cache.clear()
+        self.assertEqual(self._get("area-points").json()["results"][0]["value"], 3)
+
+    def test_points_move_external_without_positive_position(self):
+        external = OrganizationFactory.create(abbreviation="E", name="EN", external=True)
+        org = OrganizationFactory.create(abbreviation="A", name="AN")
+        PointsTableFactory.create(group_by="organization", external="move")
+        ResultFactory.create(organization=external, competition=self.competition, position=1)
+        ResultFactory.create(organization=external, competition=self.competition, position=1)
+        ResultFactory.create(organization=org, competition=self.competition, position=2)
+        process_queue()
+        self.assertEqual(self._get("area-points").json()["results"], [])
+
+
 class StatisticsPohjolanMaljaTestCase(TestCase):
     def setUp(self):
         self.factory = RequestFactory()
@@ -154,6 +283,7 @@ class StatisticsPohjolanMaljaTestCase(TestCase):
         ResultFactory.create(organization=org1, competition=competition, position=10)
         user = User.objects.create(username="superuser", is_staff=True)
         self.client.force_login(user)
+        process_queue()
         response = self.client.get(self.url, follow=True)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         data = [
@@ -163,11 +293,13 @@ class StatisticsPohjolanMaljaTestCase(TestCase):
         self.assertEqual(json.dumps({"results": data}), response.content.decode())
         org3 = OrganizationFactory.create(abbreviation="C", name="CN", external=True)
         ResultFactory.create(organization=org3, competition=competition, position=1)
+        process_queue()
         response = self.client.get(self.url, follow=True)
         # No change as org3 is tied to non-external organization
         self.assertEqual(json.dumps({"results": data}), response.content.decode())
         result3.organization = org3
         result3.save()
+        process_queue()
         response = self.client.get(self.url, follow=True)
         data = [
             {"organization": {"id": 1, "name": "AN", "abbreviation": "A"}, "value": 29},
@@ -175,3 +307,29 @@ class StatisticsPohjolanMaljaTestCase(TestCase):
         ]
         # Org2 loses third place and places 4-9 are increased by 1 (+4 to org1, -5+1 to org2)
         self.assertEqual(json.dumps({"results": data}), response.content.decode())
+
+    def test_pohjolanmalja_updated_with_results(self):
+        user = User.objects.create(username="superuser", is_staff=True)
+        level = CompetitionLevel.objects.create(name="SM", abbreviation="SM")
+        other_level = CompetitionLevel.objects.create(name="Other", abbreviation="O")
+        org = OrganizationFactory.create(abbreviation="A", name="AN")
+        competition = CompetitionFactory.create(level=level)
+        result = ResultFactory.create(organization=org, competition=competition, position=1)
+        ResultFactory.create(organization=org, competition=competition, position=3)
+        self.client.force_login(user)
+        process_queue()
+        response = self.client.get(self.url, follow=True)
+        self.assertEqual(response.json()["results"][0]["value"], 14)
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, follow=True)
+        self.assertEqual(response.json()["results"][0]["value"], 14)
+        result.delete()
+        process_queue()
+        response = self.client.get(self.url, follow=True)
+        self.assertEqual(response.json()["results"][0]["value"], 6)
+        competition.level = other_level
+        competition.save()
+        process_queue()
+        response = self.client.get(self.url, follow=True)
+        self.assertEqual(response.json()["results"], [])
+        self.assertEqual(CompetitionPoints.objects.count(), 0)
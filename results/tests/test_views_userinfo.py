@@ -1,9 +1,12 @@
 import json
 
+from asgiref.sync import iscoroutinefunction
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import RequestFactory, TestCase
-from django.urls import reverse
+from django.urls import resolve, reverse
 from rest_framework import status
+from rest_framework.authtoken.models import Token
 
 from results.models.organizations import Area, Organization
 from results.models.sports import Sport
@@ -11,6 +14,7 @@ from results.models.sports import Sport
 
 class UserInfoTestCase(TestCase):
     def setUp(self):
+        cache.clear()
         self.factory = RequestFactory()
         self.url = reverse("current-user")
 
@@ -80,3 +84,26 @@ class UserInfoTestCase(TestCase):
         response = self.client.get(self.url, follow=True)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.content.decode(), json.dumps(data))
+
+    async def test_userinfo_async_token_authentication(self):
+        user = await User.objects.acreate(username="tester", first_name="Testname")
+        token = await Token.objects.aget(user=user)
+        response = await self.async_client.get(self.url, headers={"authorization": "Token %s" % token.key})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["first_name"], "Testname")
+        response = await self.async_client.get(self.url, headers={"authorization": "Token invalid"})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_userinfo_async_session_and_inactive_user(self):
+        user = await User.objects.acreate(username="tester", first_name="Testname")
+        await self.async_client.aforce_login(user)
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.json()["first_name"], "Testname")
+        user.is_active = False
+        await user.asave()
+        token = await Token.objects.aget(user=user)
+        response = await self.async_client.get(self.url, headers={"authorization": "Token %s" % token.key})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_userinfo_view_is_async(self):
+        self.assertTrue(iscoroutinefunction(resolve(self.url).func))
@@ -0,0 +1,72 @@
+"""
+Async views for the read endpoints under ASGI.
+
+Under ASGI, the response is sent to the client by the event loop, so a slow client does not hold a thread with any
+view. Sync DRF views hold a thread only while the response is built.
+
+Async handlers are used where the response is built without DRF's filtering, pagination and serializers: the
+current user endpoint and the anonymous result lists of locked and approved competitions, served from the
+snapshots. Handler returns None for requests it does not serve, and those are passed to the sync DRF view, which is
+run in a thread. Other read endpoints, i.e. the record list, competitions, events and the result lists rendered from
+the results, are sync DRF views, as Django's async ORM runs the queries in a thread as well and async versions of
+the filters, pagination and serializers would duplicate the DRF views. DRF view attributes are copied to the async
+view, so the API schema and router use the DRF view.
+"""
+
+from asgiref.sync import sync_to_async
+from rest_framework import exceptions
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+VIEW_ATTRIBUTES = ("cls", "initkwargs", "actions", "csrf_exempt")
+
+
+def async_read_view(view, handler):
+    """
+    Returns an async view, which uses the handler for safe method requests and the sync view for the rest.
+
+    :param view: sync view
+    :param handler: async function taking the request and view arguments, returning response or None
+    :type view: function
+    :type handler: function
+    :rtype: function
+    """
+    sync_view = sync_to_async(view)
+
+    async def async_view(request, *args, **kwargs):
+        response = None
+        if request.method in SAFE_METHODS:
+            response = await handler(request, *args, **kwargs)
+        if response is None:
+            response = await sync_view(request, *args, **kwargs)
+        return response
+
+    for attribute in VIEW_ATTRIBUTES:
+        if hasattr(view, attribute):
+            setattr(async_view, attribute, getattr(view, attribute))
+    async_view.__name__ = view.__name__
+    async_view.__doc__ = view.__doc__
+    return async_view
+
+
+def _get_user(request):
+    try:
+        return request.user
+    except exceptions.APIException:
+        return None
+
+
+async def authenticate(request):
+    """
+    Returns user authenticated with DRF's default authentication classes.
+
+    :param request:
+    :type request: HttpRequest
+    :return: user, anonymous user or None if credentials are not valid and request should be passed to DRF view
+    :rtype: User
+    """
+    drf_request = Request(
+        request, authenticators=[authentication() for authentication in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+    )
+    return await sync_to_async(_get_user)(drf_request)
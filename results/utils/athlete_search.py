@@ -0,0 +1,119 @@
+"""
+Indexed athlete search.
+
+Athlete's names and sport ID are normalized to lower case, accent-folded tokens and each token's prefixes are stored
+in :class:`results.models.athletes.AthleteSearchToken`, indexed by token. Search matches every query token exactly
+against the stored prefixes, so each query token is a single index lookup instead of a substring scan over the
+athlete table. Tokens are updated when an athlete is saved, including the Suomisport updates.
+"""
+
+import re
+import unicodedata
+
+from django.db import transaction
+from django.db.models import Count
+
+from results.models.athletes import Athlete, AthleteSearchToken
+
+MIN_PREFIX_LENGTH = 2
+MAX_TOKEN_LENGTH = AthleteSearchToken._meta.get_field("token").max_length
+
+
+def normalize(text):
+    """
+    Returns lower case, accent-folded words of the text.
+
+    :param text:
+    :type text: str
+    :rtype: list
+    """
+    if not text:
+        return []
+    text = unicodedata.normalize("NFKD", str(text).casefold())
+    text = "".join(character for character in text if not unicodedata.combining(character))
+    return [word[:MAX_TOKEN_LENGTH] for word in re.split(r"[\W_]+", text) if word]
+
+
+def get_tokens(first_name, last_name, sport_id):
+    """
+    Returns search tokens for the athlete: prefixes of the normalized names and sport ID.
+
+    :param first_name:
+    :param last_name:
+    :param sport_id:
+    :type first_name: str
+    :type last_name: str
+    :type sport_id: str
+    :rtype: set
+    """
+    tokens = set()
+    for word in normalize(first_name) + normalize(last_name) + normalize(sport_id):
+        tokens.update(word[:length] for length in range(min(MIN_PREFIX_LENGTH, len(word)), len(word) + 1))
+    return tokens
+
+
+def update_search_tokens(athletes):
+    """
+    Replaces search tokens for the athletes.
+
+    :param athletes: athlete queryset or list of athletes
+    :type athletes: list
+    """
+    athletes = list(athletes)
+    with transaction.atomic():
+        AthleteSearchToken.objects.filter(athlete__in=[athlete.pk for athlete in athletes]).delete()
+        AthleteSearchToken.objects.bulk_create(
+            [
+                AthleteSearchToken(athlete_id=athlete.pk, token=token)
+                for athlete in athletes
+                for token in get_tokens(athlete.first_name, athlete.last_name, athlete.sport_id)
+            ]
+        )
+
+
+def rebuild_search_tokens(chunk_size=1000):
+    """
+    Rebuilds search tokens for all athletes.
+
+    :param chunk_size: number of athletes updated in a transaction
+    :type chunk_size: int
+    :return: number of athletes
+    :rtype: int
+    """
+    athletes = Athlete.objects.order_by("pk").only("pk", "first_name", "last_name", "sport_id")
+    count = 0
+    last_pk = 0
+    while True:
+        chunk = list(athletes.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            break
+        update_search_tokens(chunk)
+        count += len(chunk)
+        last_pk = chunk[-1].pk
+    return count
+
+
+def search_athletes(query, limit=10):
+    """
+    Returns athletes matching all words in the query.
+
+    Each query word must be a prefix of the athlete's first name, last name or sport ID, ignoring case and accents.
+
+    :param query: search string
+    :param limit: maximum number of athletes
+    :type query: str
+    :type limit: int
+    :return: matching athletes in the default athlete order
+    :rtype: QuerySet
+    """
+    tokens = {word for word in normalize(query) if len(word) >= MIN_PREFIX_LENGTH}
+    if not tokens:
+        return Athlete.objects.none()
+    matches = (
+        AthleteSearchToken.objects.filter(token__in=tokens)
+        .values("athlete")
+        .annotate(matches=Count("token"))
+        .filter(matches=len(tokens))
+        .values("athlete")
+    )
+    return Athlete.objects.filter(pk__in=matches)[:limit]
@@ -0,0 +1,206 @@
+"""
+Athlete's best results by competition type, category and season.
+
+Bests are stored in :class:`results.models.results.AthleteBest` and updated incrementally, recalculating only the
+(athlete, type, category, season) keys touched by a changed result or partial result. Changes are collected per
+transaction and the keys are recalculated once, after the transaction is committed.
+"""
+
+import threading
+
+from django.db import transaction
+
+from results.models.results import (
+    AthleteBest,
+    AthleteBestPartial,
+    Result,
+    ResultPartial,
+)
+
+
+def get_result_key(result):
+    """
+    Returns athlete best key for the result, or None for results without athlete.
+
+    :param result:
+    :type result: Result
+    :return: athlete id, competition type id, category id and season
+    :rtype: tuple
+    """
+    if not result.athlete_id or not result.competition_type_id or not result.competition_date_start:
+        return None
+    return result.athlete_id, result.competition_type_id, result.category_id, result.competition_date_start.year
+
+
+def _get_source_keys(results):
+    """
+    Returns keys of the stored bests using results as source.
+    """
+    keys = set(
+        AthleteBest.objects.filter(result__in=results).values_list("athlete_id", "type_id", "category_id", "season")
+    )
+    keys |= set(
+        AthleteBestPartial.objects.filter(partial__result__in=results).values_list(
+            "best__athlete_id", "best__type_id", "best__category_id", "best__season"
+        )
+    )
+    return keys
+
+
+def get_keys(results):
+    """
+    Returns keys for the results and the stored bests using them as source.
+
+    :param results: result queryset
+    :type results: QuerySet
+    :return: set of (athlete id, type id, category id, season) tuples
+    :rtype: set
+    """
+    keys = {
+        (athlete, competition_type, category, date_start.year)
+        for athlete, competition_type, category, date_start in results.filter(
+            athlete__isnull=False, competition_type__isnull=False, competition_date_start__isnull=False
+        ).values_list("athlete_id", "competition_type_id", "category_id", "competition_date_start")
+    }
+    return keys | _get_source_keys(results)
+
+
+def update_athlete_best(athlete_id, type_id, category_id, season):
+    """
+    Recalculates athlete's best result and best partial results for a single key.
+
+    :param athlete_id:
+    :param type_id: competition type id
+    :param category_id:
+    :param season: year
+    :type athlete_id: int
+    :type type_id: int
+    :type category_id: int
+    :type season: int
+    """
+    results = Result.objects.filter(
+        athlete_id=athlete_id,
+        competition_type_id=type_id,
+        category_id=category_id,
+        competition_date_start__year=season,
+        public=True,
+    )
+    best = (
+        results.filter(result__isnull=False)
+        .order_by("-result", "competition_date_start", "pk")
+        .values_list("pk", "result")
+        .first()
+    )
+    partials = {}
+    for partial in (
+        ResultPartial.objects.filter(result__in=results, value__isnull=False)
+        .order_by("type", "-value", "result__competition_date_start", "pk")
+        .values("pk", "type", "value")
+    ):
+        partials.setdefault(partial["type"], partial)
+    key = {"athlete_id": athlete_id, "type_id": type_id, "category_id": category_id, "season": season}
+    with transaction.atomic():
+        if not best and not partials:
+            AthleteBest.objects.filter(**key).delete()
+            return
+        athlete_best, created = AthleteBest.objects.update_or_create(
+            **key, defaults={"result_id": best[0] if best else None, "value": best[1] if best else None}
+        )
+        if not created:
+            athlete_best.partials.all().delete()
+        AthleteBestPartial.objects.bulk_create(
+            [
+                AthleteBestPartial(
+                    best=athlete_best, type_id=partial["type"], partial_id=partial["pk"], value=partial["value"]
+                )
+                for partial in partials.values()
+            ]
+        )
+
+
+def update_bests(keys):
+    """
+    Recalculates bests for the keys.
+
+    :param keys: set of (athlete id, type id, category id, season) tuples
+    :type keys: set
+    """
+    for key in keys:
+        update_athlete_best(*key)
+
+
+class _PendingBests:
+    """
+    Keys and result ids waiting for the recalculation in the current transaction.
+    """
+
+    def __init__(self):
+        self.keys = set()
+        self.results = set()
+        self.processed = False
+
+    def __call__(self):
+        if self.processed:
+            return
+        self.processed = True
+        keys = self.keys
+        if self.results:
+            keys |= get_keys(Result.objects.filter(pk__in=self.results))
+        update_bests(keys)
+
+
+_pending = threading.local()
+
+
+def queue_bests(keys=(), results=()):
+    """
+    Recalculates bests for the keys, and for the results' keys and the bests using them as source, after the current
+    transaction is committed. Outside a transaction bests are recalculated immediately.
+
+    Keys queued in the same transaction are collected to a pending set per connection, which is registered with
+    :func:`django.db.transaction.on_commit` in each call, so it is kept even if a savepoint registering it is rolled
+    back. The set is recalculated once, by the first callback after commit.
+
+    :param keys: set of (athlete id, type id, category id, season) tuples
+    :param results: result ids
+    :type keys: set
+    :type results: list
+    """
+    connection = transaction.get_connection()
+    pending = getattr(_pending, connection.alias, None)
+    if pending is None or pending.processed or not connection.in_atomic_block:
+        pending = _PendingBests()
+        setattr(_pending, connection.alias, pending)
+    pending.keys.update(keys)
+    pending.results.update(results)
+    transaction.on_commit(pending)
+
+
+def update_result_bests(result):
+    """
+    Queues bests for the result's key and for the bests using the result as source.
+
+    :param result:
+    :type result: Result
+    """
+    queue_bests(results=[result.pk])
+
+
+def rebuild_athlete_bests(athletes=None):
+    """
+    Rebuilds all bests, optionally limited to the athletes.
+
+    :param athletes: list of athlete ids, default all athletes
+    :type athletes: list
+    :return: number of updated keys
+    :rtype: int
+    """
+    results = Result.objects.all()
+    bests = AthleteBest.objects.all()
+    if athletes:
+        results = results.filter(athlete__in=athletes)
+        bests = bests.filter(athlete__in=athletes)
+    keys = get_keys(results.filter(public=True))
+    bests.delete()
+    update_bests(keys)
+    return len(keys)
@@ -1,21 +1,162 @@
-from django.contrib.auth.models import User
-from django.core.cache import cache
+"""
+Cached group membership for permission checks.
 
+User's group ids and the organization, area and sport ids managed through the groups are cached as plain ids for
+MEMBERSHIP_CACHE_TIMEOUT seconds. User's membership is removed from the cache when user's groups change. Changes to
+organization groups, organization areas and area or sport managers affect many users, so they change the membership
+version included in the cache keys, which invalidates all cached memberships.
 
-def get_user_groups(user_id):
+Invalidation only reaches other workers through a shared cache, e.g. memcached or redis. With a per-process cache,
+i.e. local memory cache, membership is cached at most LOCAL_CACHE_TIMEOUT seconds, so removed permissions expire
+quickly in the other workers too.
+"""
+
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import Group
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db.models import Q
+
+MEMBERSHIP_KEYS = ("groups", "organizations", "area_organizations", "areas", "sports")
+MEMBERSHIP_VERSION_KEY = "membership_version"
+LOCAL_CACHE_TIMEOUT = 60
+
+
+def is_shared_cache():
+    """
+    Returns True if the default cache is shared between the worker processes.
+
+    :rtype: bool
+    """
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], (DummyCache, LocMemCache))
+
+
+def _get_timeout():
+    timeout = getattr(settings, "MEMBERSHIP_CACHE_TIMEOUT", 86400)
+    if is_shared_cache():
+        return timeout
+    return LOCAL_CACHE_TIMEOUT if timeout is None else min(timeout, LOCAL_CACHE_TIMEOUT)
+
+
+def _get_version():
+    version = cache.get(MEMBERSHIP_VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        cache.set(MEMBERSHIP_VERSION_KEY, version, None)
+    return version
+
+
+def _cache_key(user_id, version):
+    return f"membership_{version}_{user_id}"
+
+
+def _get_membership_querysets(groups):
+    """
+    Returns querysets for the ids managed through the groups.
+    """
+    from results.models.organizations import Area, Organization
+    from results.models.sports import Sport
+
+    return {
+        "organizations": Organization.objects.filter(Q(group__in=groups) | Q(areas__manager__in=groups))
+        .order_by()
+        .values_list("pk", flat=True)
+        .distinct(),
+        "area_organizations": Organization.objects.filter(areas__manager__in=groups)
+        .order_by()
+        .values_list("pk", flat=True)
+        .distinct(),
+        "areas": Area.objects.filter(manager__in=groups).values_list("pk", flat=True),
+        "sports": Sport.objects.filter(manager__in=groups).values_list("pk", flat=True),
+    }
+
+
+def _load_membership(user_id):
+    """
+    Returns membership ids for the user.
     """
-    Cache user groups for permission checks.
+    groups = list(Group.objects.filter(user=user_id).values_list("pk", flat=True))
+    if not groups:
+        return {name: [] for name in MEMBERSHIP_KEYS}
+    membership = {name: list(queryset) for name, queryset in _get_membership_querysets(groups).items()}
+    membership["groups"] = groups
+    return membership
 
-    It's recommended to use this to report permissions to frontend and
-    check access from actual groups when modifying information.
+
+async def _aload_membership(user_id):
+    """
+    Returns membership ids for the user, using the async ORM.
+    """
+    groups = [pk async for pk in Group.objects.filter(user=user_id).values_list("pk", flat=True)]
+    if not groups:
+        return {name: [] for name in MEMBERSHIP_KEYS}
+    membership = {name: [pk async for pk in queryset] for name, queryset in _get_membership_querysets(groups).items()}
+    membership["groups"] = groups
+    return membership
+
+
+def get_membership(user_id):
+    """
+    Returns cached group membership for the user.
+
+    :param user_id: user id, None for anonymous user
+    :type user_id: int
+    :return: sets of ids for groups, managed organizations (organizations), organizations managed through areas
+        (area_organizations), managed areas (areas) and managed sports (sports)
+    :rtype: dict
+    """
+    if user_id is None:
+        return {name: frozenset() for name in MEMBERSHIP_KEYS}
+    key = _cache_key(user_id, _get_version())
+    membership = cache.get(key)
+    if membership is None:
+        membership = _load_membership(user_id)
+        cache.set(key, membership, _get_timeout())
+    return {name: frozenset(ids) for name, ids in membership.items()}
+
+
+async def aget_membership(user_id):
+    """
+    Async version of :func:`get_membership`.
+    """
+    if user_id is None:
+        return {name: frozenset() for name in MEMBERSHIP_KEYS}
+    version = await cache.aget(MEMBERSHIP_VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        await cache.aset(MEMBERSHIP_VERSION_KEY, version, None)
+    key = _cache_key(user_id, version)
+    membership = await cache.aget(key)
+    if membership is None:
+        membership = await _aload_membership(user_id)
+        await cache.aset(key, membership, _get_timeout())
+    return {name: frozenset(ids) for name, ids in membership.items()}
+
+
+def get_user_groups(user_id):
+    """
+    Returns cached group ids for the user.
 
     :param user_id:
-    :return: user groups
-    """
-    cache_key = f"user_groups_{user_id}"
-    cached_groups = cache.get(cache_key)
-    if cached_groups is None:
-        groups = User.objects.get(pk=user_id).groups.all()
-        cache.set(cache_key, groups, 15)
-        return groups
-    return cached_groups
+    :type user_id: int
+    :return: group ids
+    :rtype: frozenset
+    """
+    return get_membership(user_id)["groups"]
+
+
+def invalidate_membership(user_ids=None):
+    """
+    Removes cached membership for the users, or for all users if not given.
+
+    :param user_ids: list of user ids
+    :type user_ids: list
+    """
+    if user_ids is None:
+        cache.set(MEMBERSHIP_VERSION_KEY, time.time_ns(), None)
+    else:
+        version = _get_version()
+        cache.delete_many([_cache_key(user_id, version) for user_id in user_ids])
@@ -0,0 +1,150 @@
+"""
+Incremental result change feed for competitions.
+
+Changes are ordered by the result update time and id, and deleted results by the deletion time and tombstone id.
+Positions in the feed are passed to the client as an opaque cursor, which the client sends back to get the next
+changes.
+
+Tombstones of the deleted results are removed after RESULT_CHANGE_FEED_TOMBSTONE_DAYS by the ``prunetombstones``
+command.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone as django_timezone
+
+from results.models.results import Result, ResultTombstone
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _cache_key(competition_id):
+    return f"result_changes_{competition_id}"
+
+
+def _microseconds(timestamp):
+    return (timestamp - EPOCH) // timedelta(microseconds=1)
+
+
+def _timestamp(microseconds):
+    return EPOCH + timedelta(microseconds=int(microseconds))
+
+
+def encode_cursor(timestamp, pk, deleted_at=None, tombstone_pk=0):
+    """
+    Returns a cursor for the feed position.
+
+    :param timestamp: update time of the last change
+    :param pk: id of the last changed result
+    :param deleted_at: deletion time of the last deleted result, None if there are no deleted results
+    :param tombstone_pk: id of the last deleted result's tombstone
+    :type timestamp: datetime
+    :type pk: int
+    :type deleted_at: datetime
+    :type tombstone_pk: int
+    :return: cursor
+    :rtype: str
+    """
+    cursor = "%s_%s" % (_microseconds(timestamp), pk)
+    if deleted_at:
+        cursor += "_%s_%s" % (_microseconds(deleted_at), tombstone_pk)
+    return cursor
+
+
+def decode_cursor(cursor):
+    """
+    Returns positions of the changed and deleted results from the cursor.
+
+    Deletion time is None if cursor does not include position of the deleted results, and deleted results are read
+    from the position of the changed results.
+
+    :param cursor:
+    :type cursor: str
+    :return: timestamp and id of the last changed result, deletion time and tombstone id of the last deleted result
+    :rtype: tuple
+    :raises ValueError: if cursor is not valid
+    """
+    parts = cursor.split("_")
+    if len(parts) == 2:
+        return _timestamp(parts[0]), int(parts[1]), None, 0
+    microseconds, pk, deleted_microseconds, tombstone_pk = parts
+    return _timestamp(microseconds), int(pk), _timestamp(deleted_microseconds), int(tombstone_pk)
+
+
+def mark_changed(competition_id):
+    """
+    Marks competition changed for the change feed streams.
+
+    :param competition_id:
+    :type competition_id: int
+    """
+    cache.set(_cache_key(competition_id), django_timezone.now().timestamp(), None)
+
+
+def get_change_marker(competition_id):
+    """
+    Returns the latest change marker for the competition, or None if there are no marked changes.
+
+    :param competition_id:
+    :type competition_id: int
+    """
+    return cache.get(_cache_key(competition_id))
+
+
+def get_changes(competition_id, cursor=None, limit=500):
+    """
+    Returns changed result ids and deleted result ids since the cursor.
+
+    Visibility is not checked here, changed results should be filtered by the caller. Changed and deleted results
+    have their own positions in the cursor, so each change and deletion is returned once.
+
+    :param competition_id:
+    :param cursor: cursor from the previous call, None for all results
+    :param limit: maximum number of changed and deleted results
+    :type competition_id: int
+    :type cursor: str
+    :type limit: int
+    :return: changed ids, deleted ids, new cursor and more flag
+    :rtype: tuple
+    :raises ValueError: if cursor is not valid
+    """
+    results = Result.objects.filter(competition_id=competition_id)
+    tombstones = ResultTombstone.objects.filter(competition_id=competition_id)
+    if cursor:
+        timestamp, pk, deleted_at, tombstone_pk = decode_cursor(cursor)
+        results = results.filter(Q(updated_at__gt=timestamp) | Q(updated_at=timestamp, pk__gt=pk))
+        tombstones = tombstones.filter(
+            Q(deleted_at__gt=deleted_at or timestamp) | Q(deleted_at=deleted_at or timestamp, pk__gt=tombstone_pk)
+        )
+    else:
+        timestamp, pk = EPOCH, 0
+        latest = tombstones.order_by("-deleted_at", "-pk").values_list("deleted_at", "pk").first()
+        deleted_at, tombstone_pk = latest or (None, 0)
+        tombstones = tombstones.none()
+    changes = list(results.order_by("updated_at", "pk").values_list("pk", "updated_at")[: limit + 1])
+    deleted = list(tombstones.order_by("deleted_at", "pk").values_list("result_id", "deleted_at", "pk")[: limit + 1])
+    more = len(changes) > limit or len(deleted) > limit
+    changes = changes[:limit]
+    deleted = deleted[:limit]
+    if changes:
+        timestamp, pk = changes[-1][1], changes[-1][0]
+    if deleted:
+        deleted_at, tombstone_pk = deleted[-1][1], deleted[-1][2]
+    new_cursor = encode_cursor(timestamp, pk, deleted_at, tombstone_pk)
+    return [change[0] for change in changes], [item[0] for item in deleted], new_cursor, more
+
+
+def prune_tombstones(days):
+    """
+    Removes deleted results older than the given number of days from the change feed.
+
+    Clients with an older cursor do not get these deletions and should load all results again.
+
+    :param days:
+    :type days: int
+    :return: number of removed tombstones
+    :rtype: int
+    """
+    return ResultTombstone.objects.filter(deleted_at__lt=django_timezone.now() - timedelta(days=days)).delete()[0]
@@ -0,0 +1,336 @@
+"""
+Open data export of public competitions, results and records.
+
+Data is exported per season and sport as gzip compressed NDJSON and CSV files, named
+``<season>/<sport>/<dataset>.<format>.gz``, with a ``manifest.json`` listing the files with their row counts, SHA-256
+checksums and ``updated_at`` watermarks, the latest update time of the exported rows.
+
+Rows are read in primary key ordered chunks and written to both formats in a single pass, so memory use does not
+depend on the number of rows. Files are exported again only if their row count or watermark has changed since the
+previous export. Gzip headers do not include a timestamp, so the checksum of unchanged data stays the same.
+"""
+
+import csv
+import datetime
+import gzip
+import hashlib
+import io
+import json
+import os
+from contextlib import ExitStack
+from decimal import Decimal
+
+from django.db.models import Count, F, Max
+from django.db.models.functions import ExtractYear
+from django.utils import timezone
+from django.utils.text import slugify
+
+from results.models.competitions import Competition
+from results.models.records import Record
+from results.models.results import Result
+from results.models.sports import Sport
+
+CHUNK_SIZE = 2000
+FORMATS = ("ndjson", "csv")
+MANIFEST = "manifest.json"
+
+DATASETS = {
+    "competitions": {
+        "season": "date_start",
+        "sport": "type__sport",
+        "columns": (
+            ("id", "id"),
+            ("name", "name"),
+            ("date_start", "date_start"),
+            ("date_end", "date_end"),
+            ("location", "location"),
+            ("event", "event_id"),
+            ("event_name", "event__name"),
+            ("organization", "organization__abbreviation"),
+            ("type", "type__abbreviation"),
+            ("level", "level__abbreviation"),
+            ("approved", "approved"),
+            ("locked", "locked"),
+            ("trial", "trial"),
+            ("updated_at", "updated_at"),
+        ),
+    },
+    "results": {
+        "season": "competition_date_start",
+        "sport": "competition_sport",
+        "columns": (
+            ("id", "id"),
+            ("competition", "competition_id"),
+            ("athlete", "athlete_id"),
+            ("first_name", "first_name"),
+            ("last_name", "last_name"),
+            ("organization", "organization__abbreviation"),
+            ("external", "organization_external"),
+            ("category", "category__abbreviation"),
+            ("elimination_category", "elimination_category__abbreviation"),
+            ("result", "result"),
+            ("result_code", "result_code"),
+            ("decimals", "decimals"),
+            ("position", "position"),
+            ("position_pre", "position_pre"),
+            ("approved", "approved"),
+            ("team", "team"),
+            ("info", "info"),
+            ("updated_at", "updated_at"),
+        ),
+    },
+    "records": {
+        "season": "date_start",
+        "sport": "type__sport",
+        "columns": (
+            ("id", "id"),
+            ("result", "result_id"),
+            ("competition", "result__competition_id"),
+            ("athlete", "result__athlete_id"),
+            ("first_name", "result__first_name"),
+            ("last_name", "result__last_name"),
+            ("value", "result__result"),
+            ("partial_value", "partial_result__value"),
+            ("level", "level__abbreviation"),
+            ("type", "type__abbreviation"),
+            ("category", "category__abbreviation"),
+            ("partial_type", "partial_type__abbreviation"),
+            ("date_start", "date_start"),
+            ("date_end", "date_end"),
+            ("historical", "historical"),
+            ("info", "info"),
+            ("updated_at", "updated_at"),
+        ),
+    },
+}
+
+
+def get_queryset(dataset):
+    """
+    Returns public objects of the dataset.
+
+    :param dataset: competitions, results or records
+    :type dataset: str
+    :rtype: QuerySet
+    """
+    if dataset == "competitions":
+        return Competition.objects.filter(public=True)
+    if dataset == "results":
+        return Result.objects.filter(public=True)
+    return Record.objects.filter(approved=True, result__public=True)
+
+
+def get_groups(dataset, seasons=None, sports=None):
+    """
+    Returns row counts and watermarks for each season and sport of the dataset.
+
+    :param dataset: competitions, results or records
+    :param seasons: limit to seasons, default all
+    :param sports: limit to sport ids, default all
+    :type dataset: str
+    :type seasons: list
+    :type sports: list
+    :return: dict of rows and updated_at by (season, sport id)
+    :rtype: dict
+    """
+    definition = DATASETS[dataset]
+    queryset = get_queryset(dataset).filter(**{"%s__isnull" % definition["sport"]: False})
+    if seasons:
+        queryset = queryset.filter(**{"%s__year__in" % definition["season"]: seasons})
+    if sports:
+        queryset = queryset.filter(**{"%s__in" % definition["sport"]: sports})
+    return {
+        (group["season"], group["sport"]): {"rows": group["rows"], "updated_at": _to_json(group["updated_at"])}
+        for group in queryset.annotate(season=ExtractYear(definition["season"]), sport=F(definition["sport"]))
+        .values("season", "sport")
+        .annotate(rows=Count("pk"), updated_at=Max("updated_at"))
+        .order_by()
+    }
+
+
+def iterate_rows(queryset, lookups, chunk_size=CHUNK_SIZE):
+    """
+    Yields values of the lookups for each object, reading objects in primary key ordered chunks.
+
+    :param queryset:
+    :param lookups: value lookups
+    :param chunk_size: number of rows read in a query
+    :type lookups: list
+    :type chunk_size: int
+    :rtype: Iterator[tuple]
+    """
+    queryset = queryset.order_by("pk").values_list("pk", *lookups)
+    last_pk = 0
+    while True:
+        chunk = list(queryset.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            return
+        for row in chunk:
+            yield row[1:]
+        last_pk = chunk[-1][0]
+
+
+def _to_json(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+def _to_csv(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return _to_json(value)
+
+
+def _open_gzip(stack, path):
+    raw = stack.enter_context(open(path, "wb"))
+    compressed = stack.enter_context(gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0))
+    return stack.enter_context(io.TextIOWrapper(compressed, encoding="utf-8", newline=""))
+
+
+def _get_checksum(path):
+    checksum = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(65536), b""):
+            checksum.update(block)
+    return checksum.hexdigest()
+
+
+def write_dataset(dataset, queryset, paths, chunk_size=CHUNK_SIZE):
+    """
+    Writes the dataset rows to gzip compressed NDJSON and CSV files.
+
+    Files are written to temporary files first and replaced when complete.
+
+    :param dataset: competitions, results or records
+    :param queryset: objects to write
+    :param paths: file paths by format
+    :param chunk_size: number of rows read in a query
+    :type dataset: str
+    :type paths: dict
+    :type chunk_size: int
+    :return: number of rows
+    :rtype: int
+    """
+    columns = DATASETS[dataset]["columns"]
+    names = [name for name, lookup in columns]
+    count = 0
+    with ExitStack() as stack:
+        ndjson = _open_gzip(stack, paths["ndjson"] + ".tmp")
+        writer = csv.writer(_open_gzip(stack, paths["csv"] + ".tmp"), lineterminator="\n")
+        writer.writerow(names)
+        for row in iterate_rows(queryset, [lookup for name, lookup in columns], chunk_size):
+            ndjson.write(
+                json.dumps(dict(zip(names, map(_to_json, row))), ensure_ascii=False, separators=(",", ":")) + "\n"
+            )
+            writer.writerow([_to_csv(value) for value in row])
+            count += 1
+    for path in paths.values():
+        os.replace(path + ".tmp", path)
+    return count
+
+
+def read_manifest(directory):
+    """
+    Returns the manifest of the export directory, or an empty manifest if the directory has not been exported.
+
+    :param directory:
+    :type directory: str
+    :rtype: dict
+    """
+    try:
+        with open(os.path.join(directory, MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"generated_at": None, "files": []}
+
+
+def _write_manifest(directory, files):
+    path = os.path.join(directory, MANIFEST)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(
+            {"generated_at": timezone.now().isoformat(), "files": sorted(files, key=lambda entry: entry["path"])},
+            f,
+            ensure_ascii=False,
+            indent=2,
+        )
+    os.replace(path + ".tmp", path)
+
+
+def _is_current(entries, directory, group):
+    return all(
+        entry
+        and entry["rows"] == group["rows"]
+        and entry["updated_at"] == group["updated_at"]
+        and os.path.exists(os.path.join(directory, entry["path"]))
+        for entry in entries
+    )
+
+
+def export_open_data(directory, seasons=None, sports=None, force=False, chunk_size=CHUNK_SIZE):
+    """
+    Exports public competitions, results and records by season and sport and updates the manifest.
+
+    Files of unchanged seasons and sports are kept, unless force is given. Files of seasons and sports which no
+    longer have public data are removed.
+
+    :param directory: export directory
+    :param seasons: limit to seasons, default all
+    :param sports: limit to sport ids, default all
+    :param force: export all files
+    :param chunk_size: number of rows read in a query
+    :type directory: str
+    :type seasons: list
+    :type sports: list
+    :type force: bool
+    :type chunk_size: int
+    :return: exported manifest entries
+    :rtype: list
+    """
+    sport_slugs = {sport.pk: slugify(sport.abbreviation) or str(sport.pk) for sport in Sport.objects.all()}
+    manifest = {entry["path"]: entry for entry in read_manifest(directory)["files"]}
+    files = {
+        path: entry
+        for path, entry in manifest.items()
+        if (seasons and entry["season"] not in seasons) or (sports and entry["sport_id"] not in sports)
+    }
+    exported = []
+    for dataset in DATASETS:
+        definition = DATASETS[dataset]
+        for (season, sport_id), group in sorted(get_groups(dataset, seasons, sports).items()):
+            paths = {fmt: "%s/%s/%s.%s.gz" % (season, sport_slugs[sport_id], dataset, fmt) for fmt in FORMATS}
+            entries = [manifest.get(path) for path in paths.values()]
+            if not force and _is_current(entries, directory, group):
+                files.update({entry["path"]: entry for entry in entries})
+                continue
+            os.makedirs(os.path.join(directory, str(season), sport_slugs[sport_id]), exist_ok=True)
+            queryset = get_queryset(dataset).filter(
+                **{"%s__year" % definition["season"]: season, definition["sport"]: sport_id}
+            )
+            rows = write_dataset(
+                dataset, queryset, {fmt: os.path.join(directory, path) for fmt, path in paths.items()}, chunk_size
+            )
+            for fmt, path in paths.items():
+                entry = {
+                    "path": path,
+                    "dataset": dataset,
+                    "format": fmt,
+                    "season": season,
+                    "sport_id": sport_id,
+                    "sport": sport_slugs[sport_id],
+                    "rows": rows,
+                    "size": os.path.getsize(os.path.join(directory, path)),
+                    "sha256": _get_checksum(os.path.join(directory, path)),
+                    "updated_at": group["updated_at"],
+                }
+                files[path] = entry
+                exported.append(entry)
+    for path in set(manifest) - set(files):
+        if os.path.exists(os.path.join(directory, path)):
+            os.remove(os.path.join(directory, path))
+    _write_manifest(directory, files.values())
+    return exported
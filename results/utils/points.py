@@ -0,0 +1,340 @@
+"""
+Points tables, based on the positions in competitions.
+
+Points tables are defined with :class:`results.models.statistics.PointsTable`. Points are calculated with a single
+aggregated query per points table and stored by competition, so that only the changed competitions need to be
+recalculated. Changed competitions are queued and the queue is processed by the updatepoints command. Standings are
+cached per points table and year.
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Exists, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from results.models.athletes import Athlete
+from results.models.competitions import Competition
+from results.models.organizations import Area, Organization
+from results.models.results import Result
+from results.models.statistics import CompetitionPoints, PointsQueue, PointsTable
+
+GROUP_FIELDS = {
+    "organization": "organization",
+    "area": "organization__areas",
+    "athlete": "athlete",
+}
+
+
+def _cache_key(table_id, year):
+    return f"points_standings_{table_id}_{year}"
+
+
+def _invalidate(keys):
+    """
+    Removes cached standings for the (table id, year) pairs.
+    """
+    cache.delete_many([_cache_key(table_id, year) for table_id, year in keys])
+
+
+def get_points_tables():
+    """
+    Returns all points tables with competition types.
+
+    :return: points tables
+    :rtype: list
+    """
+    return list(PointsTable.objects.prefetch_related("types"))
+
+
+def _includes(table, competition):
+    """
+    Returns True if competition is included in the points table.
+
+    :param table: points table with prefetched types
+    :param competition: competition values with level__abbreviation and type
+    :type table: PointsTable
+    :type competition: dict
+    """
+    types = [competition_type.pk for competition_type in table.types.all()]
+    return competition["level__abbreviation"] in table.get_levels() and (not types or competition["type"] in types)
+
+
+def calculate_points(table, competitions):
+    """
+    Returns group points for the competitions.
+
+    Athletes and teams get points by their position in category, i.e. with points "8,7,6,5,4,3,2,1" first gets 8
+    points and second gets 7 points for the group.
+
+    External results are handled by the table's external rule:
+     - move: If there is an external athlete or team in a position without any non-external athletes or teams,
+       following positions are moved up.
+     - ignore: External results are not counted and positions are not changed.
+     - include: External organizations get points as well.
+
+    Tied positions get full points of the position, or with the split rule, points for the tied positions are
+    shared evenly, i.e. two athletes tied to the second place get (7 + 6) / 2 points each. Results without a
+    positive effective position are not counted.
+
+    Results are counted by competition, group and effective position in a single aggregated query, points for
+    the positions are added from the counts.
+
+    :param table: points table
+    :param competitions: competition queryset or list of ids
+    :type table: PointsTable
+    :return: value by (competition id, group id)
+    :rtype: dict
+    """
+    points = table.get_points()
+    group_field = GROUP_FIELDS[table.group_by]
+    counted = {} if table.external == "include" else {"organization__external": False}
+    results = Result.objects.filter(
+        competition__in=competitions, position__gte=1, **{"%s__isnull" % group_field: False}, **counted
+    )
+    if table.external == "move":
+        external_positions = (
+            Result.objects.filter(
+                competition=OuterRef("competition"),
+                category=OuterRef("category"),
+                position__gte=1,
+                position__lt=OuterRef("position"),
+                organization__external=True,
+            )
+            .exclude(
+                Exists(
+                    Result.objects.filter(
+                        competition=OuterRef("competition"),
+                        category=OuterRef("category"),
+                        position=OuterRef("position"),
+                        organization__external=False,
+                    )
+                )
+            )
+            .order_by()
+            .values("competition")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        results = results.annotate(effective_position=F("position") - Coalesce(Subquery(external_positions), 0))
+    else:
+        results = results.annotate(effective_position=F("position"))
+    fields = ["competition", group_field, "effective_position"]
+    if table.ties == "split":
+        tied = (
+            Result.objects.filter(
+                competition=OuterRef("competition"),
+                category=OuterRef("category"),
+                position=OuterRef("position"),
+                **counted,
+            )
+            .order_by()
+            .values("competition")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        results = results.annotate(tied=Subquery(tied))
+        fields.append("tied")
+    rows = (
+        results.filter(effective_position__gte=1, effective_position__lte=len(points))
+        .order_by()
+        .values(*fields)
+        .annotate(count=Count("pk"))
+        .values_list(*fields, "count")
+    )
+    values = defaultdict(Decimal)
+    for row in rows:
+        position = row[2]
+        if table.ties == "split":
+            tied_points = points[position - 1 : position - 1 + row[3]]
+            value = Decimal(sum(tied_points)) / row[3]
+        else:
+            value = points[position - 1]
+        values[(row[0], row[1])] += value * row[-1]
+    return values
+
+
+def _create_points(table, competitions):
+    """
+    Calculates and stores points for the competitions.
+
+    :param table: points table
+    :param competitions: competition id and year by id
+    :type table: PointsTable
+    :type competitions: dict
+    :return: (table id, year) pairs with created points
+    :rtype: set
+    """
+    rows = [
+        CompetitionPoints(
+            table=table,
+            competition_id=competition_id,
+            group_id=group_id,
+            year=competitions[competition_id],
+            value=round(value, 2),
+        )
+        for (competition_id, group_id), value in calculate_points(table, list(competitions)).items()
+    ]
+    CompetitionPoints.objects.bulk_create(rows)
+    return {(table.pk, row.year) for row in rows}
+
+
+def update_competition_points(competition_ids):
+    """
+    Recalculates stored points for the competitions in all points tables.
+
+    :param competition_ids:
+    :type competition_ids: list
+    """
+    competitions = list(
+        Competition.objects.filter(pk__in=competition_ids).values("pk", "level__abbreviation", "type", "date_start")
+    )
+    with transaction.atomic():
+        deleted = CompetitionPoints.objects.filter(competition_id__in=competition_ids)
+        changed = set(deleted.order_by().values_list("table_id", "year").distinct())
+        deleted.delete()
+        for table in get_points_tables() if competitions else []:
+            included = {c["pk"]: c["date_start"].year for c in competitions if _includes(table, c)}
+            if included:
+                changed |= _create_points(table, included)
+    _invalidate(changed)
+
+
+def update_points(table, year):
+    """
+    Recalculates stored points for the points table and year.
+
+    :param table: points table
+    :param year:
+    :type table: PointsTable
+    :type year: int
+    """
+    competitions = {
+        c["pk"]: year
+        for c in Competition.objects.filter(level__abbreviation__in=table.get_levels(), date_start__year=year).values(
+            "pk", "level__abbreviation", "type"
+        )
+        if _includes(table, c)
+    }
+    with transaction.atomic():
+        CompetitionPoints.objects.filter(table=table, year=year).delete()
+        _create_points(table, competitions)
+    _invalidate([(table.pk, year)])
+
+
+def reset_table_points(table):
+    """
+    Removes stored points for the points table and queues all competitions in the table's levels.
+
+    Used when the points table definition is changed.
+
+    :param table: points table
+    :type table: PointsTable
+    """
+    points = CompetitionPoints.objects.filter(table=table)
+    years = set(points.order_by().values_list("year", flat=True).distinct())
+    points.delete()
+    _invalidate([(table.pk, year) for year in years])
+    queue_points(Competition.objects.filter(level__abbreviation__in=table.get_levels()).values_list("pk", flat=True))
+
+
+def invalidate_year(year):
+    """
+    Removes cached standings for the year in all points tables.
+
+    :param year:
+    :type year: int
+    """
+    _invalidate([(pk, year) for pk in PointsTable.objects.values_list("pk", flat=True)])
+
+
+def queue_points(competition_ids):
+    """
+    Queues competitions for the points recalculation.
+
+    :param competition_ids:
+    :type competition_ids: list
+    """
+    queue = [PointsQueue(competition_id=pk) for pk in set(competition_ids)]
+    if queue:
+        PointsQueue.objects.bulk_create(queue)
+
+
+def process_queue():
+    """
+    Recalculates points for the queued competitions.
+
+    :return: number of recalculated competitions
+    :rtype: int
+    """
+    with transaction.atomic():
+        queue = list(PointsQueue.objects.select_for_update(skip_locked=True).values_list("pk", "competition_id"))
+        if not queue:
+            return 0
+        PointsQueue.objects.filter(pk__in=[item[0] for item in queue]).delete()
+        competitions = {item[1] for item in queue}
+        update_competition_points(competitions)
+    return len(competitions)
+
+
+def _number(value):
+    return int(value) if value == value.to_integral_value() else float(value)
+
+
+def _get_groups(group_by, ids):
+    """
+    Returns group information by id.
+    """
+    if group_by == "athlete":
+        return {
+            athlete["id"]: athlete
+            for athlete in Athlete.objects.filter(pk__in=ids).values("id", "first_name", "last_name")
+        }
+    model = Area if group_by == "area" else Organization
+    return {group["id"]: group for group in model.objects.filter(pk__in=ids).values("id", "name", "abbreviation")}
+
+
+def _sort_key(row, group_by):
+    group = row[group_by]
+    if group_by == "athlete":
+        return -row["value"], group["last_name"], group["first_name"]
+    return -row["value"], group["name"]
+
+
+def get_standings(table, year):
+    """
+    Returns standings for the points table and year.
+
+    Standings are cached until the points for the table and year are changed, or for the POINTS_CACHE_TIMEOUT
+    seconds.
+
+    :param table: points table
+    :param year:
+    :type table: PointsTable
+    :type year: int
+    :return: group information and value for each group, ordered by value
+    :rtype: list
+    """
+    key = _cache_key(table.pk, year)
+    data = cache.get(key)
+    if data is None:
+        rows = (
+            CompetitionPoints.objects.filter(table=table, year=year)
+            .order_by()
+            .values("group_id")
+            .annotate(value=Sum("value"))
+        )
+        groups = _get_groups(table.group_by, [row["group_id"] for row in rows])
+        data = sorted(
+            [
+                {table.group_by: groups[row["group_id"]], "value": _number(row["value"])}
+                for row in rows
+                if row["group_id"] in groups
+            ],
+            key=lambda row: _sort_key(row, table.group_by),
+        )
+        cache.set(key, data, getattr(settings, "POINTS_CACHE_TIMEOUT", 3600))
+    return data
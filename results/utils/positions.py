@@ -0,0 +1,160 @@
+"""
+Position calculation for competition results.
+
+Results are ranked by category, separately for personal and team results, by the result from highest to lowest.
+Tied results are compared with the partial results of the competition's result types which have a tie-break
+order, type by type in that order. Partial results of a type are compared starting from the last one, i.e. the last
+series, then the series before it. Results tied after all partial results share the position, and the next position
+is skipped, i.e. 1, 2, 2, 4.
+
+Results without a result value or with a result code, i.e. DNF or DNS, do not get a position and their
+preliminary position is cleared, so it is not copied back to the position when the result is saved.
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.contrib.admin.models import CHANGE
+from django.db import transaction
+from django.utils import timezone
+
+from results.mixins.change_log import log_bulk_changes
+from results.models.competitions import CompetitionResultType
+from results.models.results import Result, ResultPartial, ResultPartialPacked
+from results.utils.change_feed import mark_changed
+from results.utils.points import queue_points
+from results.utils.snapshots import delete_snapshot
+
+
+def get_tiebreak_types(competition_type_id):
+    """
+    Returns tie-break result types of the competition type.
+
+    :param competition_type_id:
+    :type competition_type_id: int
+    :return: result type ids in tie-break order
+    :rtype: list
+    """
+    return list(
+        CompetitionResultType.objects.filter(competition_type=competition_type_id, tiebreak__isnull=False)
+        .order_by("tiebreak", "pk")
+        .values_list("pk", flat=True)
+    )
+
+
+def get_tiebreak_values(competition_id, types):
+    """
+    Returns tie-break partial result values for the results of the competition.
+
+    :param competition_id:
+    :param types: tie-break result type ids
+    :type competition_id: int
+    :type types: list
+    :return: dict of values, ordered from the last partial result, by result type id and result id
+    :rtype: dict
+    """
+    partials = defaultdict(list)
+    if not types:
+        return {}
+    for result_id, type_id, order, value in ResultPartial.objects.filter(
+        result__competition=competition_id, type__in=types
+    ).values_list("result_id", "type_id", "order", "value"):
+        partials[(result_id, type_id)].append((order, value))
+    for result_id, type_id, values in ResultPartialPacked.objects.filter(
+        result__competition=competition_id, type__in=types
+    ).values_list("result_id", "type_id", "values"):
+        partials[(result_id, type_id)] += [
+            (partial["order"], partial["value"]) for partial in ResultPartialPacked.unpack(values)
+        ]
+    return {
+        key: tuple(
+            value if value is not None else Decimal("-Infinity") for order, value in sorted(values, reverse=True)
+        )
+        for key, values in partials.items()
+    }
+
+
+def _sort_key(result, types, tiebreak_values):
+    return (result.result,) + tuple(tiebreak_values.get((result.pk, type_id), ()) for type_id in types)
+
+
+def calculate_positions(competition):
+    """
+    Calculates positions for the results of the competition.
+
+    :param competition:
+    :type competition: Competition
+    :return: results with changed positions, positions are set but not saved
+    :rtype: list
+    """
+    types = get_tiebreak_types(competition.type_id)
+    tiebreak_values = get_tiebreak_values(competition.pk, types)
+    groups = defaultdict(list)
+    changed = []
+    for result in Result.objects.filter(competition=competition).only(
+        "pk",
+        "competition_id",
+        "first_name",
+        "last_name",
+        "category_id",
+        "team",
+        "result",
+        "result_code",
+        "position",
+        "position_pre",
+    ):
+        result.competition = competition
+        if result.result is None or result.result_code:
+            if result.position is not None or result.position_pre is not None:
+                result.position = None
+                result.position_pre = None
+                changed.append(result)
+            continue
+        groups[(result.category_id, result.team)].append(result)
+    for results in groups.values():
+        previous = None
+        position = 0
+        for index, result in enumerate(
+            sorted(results, key=lambda result: _sort_key(result, types, tiebreak_values), reverse=True), start=1
+        ):
+            key = _sort_key(result, types, tiebreak_values)
+            if key != previous:
+                position = index
+                previous = key
+            if result.position != position or not result.position_pre:
+                result.position = position
+                if not result.position_pre:
+                    result.position_pre = position
+                changed.append(result)
+    return changed
+
+
+def update_positions(competition):
+    """
+    Calculates and saves positions for the results of the competition.
+
+    Changed results are saved with a bulk update and logged, and the competition is marked changed.
+
+    :param competition:
+    :type competition: Competition
+    :return: results with changed positions
+    :rtype: list
+    """
+    results = calculate_positions(competition)
+    if not results:
+        return results
+    now = timezone.now()
+    for result in results:
+        result.updated_at = now
+    with transaction.atomic():
+        Result.objects.bulk_update(results, ["position", "position_pre", "updated_at"])
+        log_bulk_changes(
+            Result,
+            results,
+            CHANGE,
+            lambda result: [{"changed": {"fields": ["position: %s" % result.position]}}],
+        )
+    mark_changed(competition.pk)
+    delete_snapshot(competition.pk)
+    queue_points([competition.pk])
+    return results
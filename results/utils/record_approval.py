@@ -0,0 +1,164 @@
+"""
+Set-based record approval.
+
+Approving a record ends approved lower records and removes unapproved lower records in the same record chain, see
+:mod:`results.utils.record_history`. Superseded records are calculated in memory for all chains in a batch and
+written with bulk queries: one update per end date, one delete and bulk log entries for the audit trail.
+"""
+
+from collections import defaultdict
+
+from django.contrib.admin.models import CHANGE, DELETION
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from results.mixins.change_log import log_bulk_changes
+
+RELATED_FIELDS = ["level", "type", "category", "result", "partial_result"]
+
+
+def _chain_key(record):
+    return record.level_id, record.type_id, record.category_id, record.partial_type_id
+
+
+def _value(record):
+    return record.partial_result.value if record.partial_result_id else record.result.result
+
+
+def _is_lower(record, value):
+    """
+    Returns True if the record is a current non-historical record lower than the value.
+    """
+    record_value = _value(record)
+    return (
+        record.date_end is None
+        and not record.historical
+        and value is not None
+        and record_value is not None
+        and record_value < value
+    )
+
+
+def _load_chains(model, records):
+    """
+    Returns current records and the given records by chain key.
+    """
+    query = Q(pk__in=[record.pk for record in records])
+    for level, record_type, category, partial_type in {_chain_key(record) for record in records}:
+        query |= Q(level=level, type=record_type, category=category, partial_type=partial_type, date_end=None)
+    chains = defaultdict(dict)
+    for record in model.objects.filter(query).select_related(*RELATED_FIELDS):
+        chains[_chain_key(record)][record.pk] = record
+    return chains
+
+
+def _write(model, approved, ended, deleted):
+    """
+    Writes approved, ended and deleted records with bulk queries.
+
+    Result list snapshots of the changed records' competitions are removed, deleted records remove them in signals.
+    """
+    from results.utils.snapshots import delete_snapshot
+
+    now = timezone.now()
+    end_dates = defaultdict(list)
+    for record in ended.values():
+        end_dates[record.date_end].append(record.pk)
+    with transaction.atomic():
+        if approved:
+            model.objects.filter(pk__in=approved).update(approved=True, updated_at=now)
+        for date_end, pks in end_dates.items():
+            model.objects.filter(pk__in=pks).update(date_end=date_end, updated_at=now)
+        if deleted:
+            model.objects.filter(pk__in=deleted).delete()
+        fields = defaultdict(list)
+        for pk in approved:
+            fields[pk].append("approved: True")
+        for pk in ended:
+            fields[pk].append("date_end")
+        changed = {**approved, **ended}
+        log_bulk_changes(model, changed.values(), CHANGE, lambda record: [{"changed": {"fields": fields[record.pk]}}])
+        log_bulk_changes(model, deleted.values(), DELETION, "Deleted")
+    for competition_id in {record.result.competition_id for record in [*approved.values(), *ended.values()]}:
+        delete_snapshot(competition_id)
+
+
+def _supersede(model, records, approve):
+    """
+    Calculates superseded records for the records in order and writes the changes.
+
+    :param model: record model
+    :param records: records in approval order
+    :param approve: approve the records, otherwise records are already approved
+    :type records: list
+    :type approve: bool
+    :return: approved records
+    :rtype: list
+    """
+    chains = _load_chains(model, records)
+    approved, ended, deleted = {}, {}, {}
+    for record in records:
+        chain = chains[_chain_key(record)]
+        current = chain.get(record.pk)
+        if current is None or (approve and current.approved):
+            continue
+        if approve:
+            current.approved = True
+            approved[current.pk] = current
+        value = _value(current)
+        for other in list(chain.values()):
+            if other.pk == current.pk or not _is_lower(other, value):
+                continue
+            if other.approved:
+                other.date_end = current.date_start
+                ended[other.pk] = other
+            else:
+                deleted[other.pk] = chain.pop(other.pk)
+    _write(model, approved, ended, deleted)
+    return list(approved.values())
+
+
+def supersede_records(record):
+    """
+    Ends approved lower records and deletes unapproved lower records for the approved record.
+
+    :param record: approved record
+    :type record: Record
+    """
+    _supersede(type(record), [record], approve=False)
+
+
+def approval_order(queryset):
+    """
+    Returns records in approval order, from oldest to newest and from highest to lowest value.
+
+    :param queryset: record queryset
+    :type queryset: QuerySet
+    :rtype: QuerySet
+    """
+    return queryset.order_by("date_start", Coalesce("partial_result__value", "result__result").desc(), "pk")
+
+
+def approve_records(queryset, chunk_size=1000):
+    """
+    Approves records in the queryset's order.
+
+    Records are processed in chunks, records removed or already approved by the earlier records are skipped.
+
+    :param queryset: unapproved records in approval order
+    :param chunk_size: number of records in a chunk
+    :type queryset: QuerySet
+    :type chunk_size: int
+    :return: approved records
+    :rtype: list
+    """
+    model = queryset.model
+    pks = list(queryset.values_list("pk", flat=True))
+    approved = []
+    for index in range(0, len(pks), chunk_size):
+        chunk = pks[index : index + chunk_size]
+        records = model.objects.in_bulk(chunk)
+        approved += _supersede(model, [records[pk] for pk in chunk if pk in records], approve=True)
+    return approved
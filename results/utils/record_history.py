@@ -0,0 +1,68 @@
+"""
+Record history for point-in-time and date range queries.
+
+Records with the same level, type, category and partial result type form a chain. When a record is approved, lower
+records in the chain are ended with the new record's start date in :meth:`results.models.records.Record.save`, so
+each approved record is valid from its start date until its end date, end date excluded. Chains are indexed by
+(level, type, category, partial type, start date), so that queries read only the matching chain.
+"""
+
+from django.db.models import Q
+
+from results.models.records import Record
+
+
+def get_records_at(queryset, at):
+    """
+    Returns records valid at the given date.
+
+    :param queryset: record queryset
+    :param at: date
+    :type queryset: QuerySet
+    :type at: date
+    :return: approved records valid at the date
+    :rtype: QuerySet
+    """
+    return queryset.filter(approved=True, historical=False, date_start__lte=at).filter(
+        Q(date_end__isnull=True) | Q(date_end__gt=at)
+    )
+
+
+def get_records_between(queryset, start=None, end=None):
+    """
+    Returns records valid at any time between the given dates.
+
+    :param queryset: record queryset
+    :param start: start date, default no limit
+    :param end: end date, default no limit
+    :type queryset: QuerySet
+    :type start: date
+    :type end: date
+    :return: approved records valid between the dates, ordered by start date
+    :rtype: QuerySet
+    """
+    queryset = queryset.filter(approved=True, historical=False)
+    if start:
+        queryset = queryset.filter(Q(date_end__isnull=True) | Q(date_end__gt=start))
+    if end:
+        queryset = queryset.filter(date_start__lte=end)
+    return queryset.order_by("date_start", "pk")
+
+
+def get_record_chain(record):
+    """
+    Returns the record chain for the record.
+
+    :param record:
+    :type record: Record
+    :return: approved records with the same level, type, category and partial result type, ordered by start date
+    :rtype: QuerySet
+    """
+    return get_records_between(
+        Record.objects.filter(
+            level_id=record.level_id,
+            type_id=record.type_id,
+            category_id=record.category_id,
+            partial_type_id=record.partial_type_id,
+        )
+    )
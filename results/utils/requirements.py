@@ -0,0 +1,143 @@
+"""
+Competition type and level requirements for athletes.
+
+Requirements are athlete information types, i.e. licences, which must be valid at the competition's start date.
+Valid periods of the athlete information types are cached per athlete as merged date intervals. Intervals for
+the athletes missing from the cache are loaded with a single query and the cache is invalidated when the athlete's
+information is changed.
+"""
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from results.models.athletes import AthleteInformation
+
+
+def _cache_key(athlete_id):
+    return f"requirement_coverage_{athlete_id}"
+
+
+def get_requirements(competition):
+    """
+    Returns requirement types for the competition.
+
+    :param competition:
+    :type competition: Competition
+    :return: requirement types from competition type and level
+    :rtype: list
+    """
+    requirements = competition.type.requirements.split(",") + competition.level.requirements.split(",")
+    return [requirement.strip() for requirement in requirements if requirement.strip()]
+
+
+def _merge(intervals):
+    """
+    Returns sorted intervals with overlapping and adjacent intervals merged.
+    """
+    merged = []
+    for date_start, date_end in sorted(intervals):
+        if merged and date_start.toordinal() <= merged[-1][1].toordinal() + 1:
+            if date_end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], date_end)
+        else:
+            merged.append((date_start, date_end))
+    return merged
+
+
+def _load_coverage(athlete_ids):
+    """
+    Returns merged intervals by information type for the athletes, in a single query.
+    """
+    intervals = {athlete_id: defaultdict(list) for athlete_id in athlete_ids}
+    for athlete_id, info_type, date_start, date_end in AthleteInformation.objects.filter(
+        athlete__in=athlete_ids, date_start__isnull=False, date_end__isnull=False
+    ).values_list("athlete_id", "type", "date_start", "date_end"):
+        intervals[athlete_id][info_type].append((date_start, date_end))
+    return {
+        athlete_id: {info_type: _merge(values) for info_type, values in types.items()}
+        for athlete_id, types in intervals.items()
+    }
+
+
+def get_coverage(athlete_ids):
+    """
+    Returns valid periods of the information types for the athletes.
+
+    Athletes missing from the cache are loaded with a single query and cached for REQUIREMENT_CACHE_TIMEOUT
+    seconds.
+
+    :param athlete_ids:
+    :type athlete_ids: list
+    :return: list of (start date, end date) by information type, by athlete id
+    :rtype: dict
+    """
+    athlete_ids = set(athlete_ids)
+    cached = cache.get_many([_cache_key(athlete_id) for athlete_id in athlete_ids])
+    coverage = {
+        athlete_id: cached[_cache_key(athlete_id)] for athlete_id in athlete_ids if _cache_key(athlete_id) in cached
+    }
+    missing = athlete_ids - set(coverage)
+    if missing:
+        loaded = _load_coverage(missing)
+        cache.set_many(
+            {_cache_key(athlete_id): value for athlete_id, value in loaded.items()},
+            getattr(settings, "REQUIREMENT_CACHE_TIMEOUT", 3600),
+        )
+        coverage.update(loaded)
+    return coverage
+
+
+def invalidate_coverage(athlete_id):
+    """
+    Removes cached coverage for the athlete.
+
+    :param athlete_id:
+    :type athlete_id: int
+    """
+    cache.delete(_cache_key(athlete_id))
+
+
+def is_covered(coverage, athlete_id, requirement, date):
+    """
+    Returns True if the requirement is valid for the athlete at the date.
+
+    :param coverage: coverage from :func:`get_coverage`
+    :param athlete_id:
+    :param requirement: requirement type
+    :param date:
+    :type coverage: dict
+    :type athlete_id: int
+    :type requirement: str
+    :type date: date
+    :rtype: bool
+    """
+    intervals = coverage.get(athlete_id, {}).get(requirement, [])
+    return any(date_start <= date <= date_end for date_start, date_end in intervals)
+
+
+def get_missing_requirement(competition, athletes, coverage=None):
+    """
+    Returns the first requirement missing from the athletes, or None if all requirements are met.
+
+    Athletes in external organizations are not checked.
+
+    :param competition:
+    :param athletes: athletes with organizations
+    :param coverage: coverage from :func:`get_coverage`, loaded for the athletes if not given
+    :type competition: Competition
+    :type athletes: list
+    :type coverage: dict
+    :rtype: str
+    """
+    requirements = get_requirements(competition)
+    if requirements and coverage is None:
+        coverage = get_coverage([athlete.pk for athlete in athletes])
+    for requirement in requirements:
+        for athlete in athletes:
+            if not athlete.organization.external and not is_covered(
+                coverage, athlete.pk, requirement, competition.date_start
+            ):
+                return requirement
+    return None
@@ -0,0 +1,449 @@
+"""
+Result file import for electronic scoring systems.
+
+Result file of a competition is imported in a single request. Supported formats are CSV, JSON and NDJSON, each row
+having the fields:
+
+ - sport_id: athlete's sport ID, or team members' sport IDs for team results
+ - first_name, last_name: result names, default from the athlete, team name as last_name for team results
+ - organization: organization abbreviation, default athlete's organization
+ - category: category abbreviation
+ - result, decimals, result_code, position, position_pre, info
+ - partial: partial results with type abbreviation, order, value, decimals and code
+
+In CSV, team members' sport IDs are separated with semicolons and partial results are given in columns named by the
+result type abbreviation and order, i.e. ``S:1``, ``S:2``. JSON is a list of rows or an object with the rows in
+``results``, NDJSON has a row on each line.
+
+Rows are read as a stream and processed in chunks: athletes of the chunk are fetched by sport ID in a single query,
+categories and result types are mapped through cached reference data, and rows are validated with the result
+serializer's validation, sharing the validation context, and values are checked with the model field validators.
+Valid rows are inserted with bulk queries, all chunks in a single transaction. Records are checked for the inserted
+results after the transaction.
+"""
+
+import codecs
+import csv
+import json
+import time
+from decimal import Decimal, InvalidOperation
+from itertools import count, islice
+
+from django.conf import settings
+from django.contrib.admin.models import ADDITION
+from django.core.cache import cache
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+
+from results.mixins.change_log import log_bulk_changes
+from results.models.athletes import Athlete
+from results.models.categories import Category
+from results.models.competitions import CompetitionResultType
+from results.models.organizations import Organization
+from results.models.records import Record
+from results.models.results import Result, ResultPartial, ResultPartialPacked
+from results.serializers.results import ResultSerializer
+from results.utils.bests import get_keys, update_bests
+from results.utils.change_feed import mark_changed
+from results.utils.points import queue_points
+from results.utils.records import check_records, check_records_partial
+from results.utils.result_validation import ResultValidationContext
+from results.utils.snapshots import delete_snapshot
+
+CHUNK_SIZE = 500
+FORMATS = ("csv", "json", "ndjson")
+REFERENCE_VERSION_KEY = "import_reference_version"
+
+
+def _get_version():
+    version = cache.get(REFERENCE_VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        cache.set(REFERENCE_VERSION_KEY, version, None)
+    return version
+
+
+def _get_reference(name, pk, load):
+    key = "import_%s_%s_%s" % (name, _get_version(), pk)
+    data = cache.get(key)
+    if data is None:
+        data = load()
+        cache.set(key, data, getattr(settings, "IMPORT_REFERENCE_CACHE_TIMEOUT", 3600))
+    return data
+
+
+def invalidate_reference_data():
+    """
+    Removes cached categories and result types.
+    """
+    cache.set(REFERENCE_VERSION_KEY, time.time_ns(), None)
+
+
+def get_categories(sport_id):
+    """
+    Returns categories of the sport and categories without a sport, by abbreviation.
+
+    Sport's categories are preferred if abbreviations are the same.
+
+    :param sport_id:
+    :type sport_id: int
+    :rtype: dict
+    """
+
+    def load():
+        categories = {}
+        for category in Category.objects.filter(Q(sport=sport_id) | Q(sport=None)).order_by("-sport", "pk"):
+            categories.setdefault(category.abbreviation, category)
+        return categories
+
+    return _get_reference("categories", sport_id, load)
+
+
+def get_result_types(competition_type_id):
+    """
+    Returns result types of the competition type, by abbreviation.
+
+    :param competition_type_id:
+    :type competition_type_id: int
+    :rtype: dict
+    """
+
+    def load():
+        return {
+            result_type.abbreviation: result_type
+            for result_type in CompetitionResultType.objects.filter(competition_type=competition_type_id)
+            .select_related("competition_type")
+            .order_by("-pk")
+        }
+
+    return _get_reference("result_types", competition_type_id, load)
+
+
+def _read_csv(file):
+    reader = csv.DictReader(codecs.getreader("utf-8-sig")(file))
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            raise ValueError(str(e))
+        data = {"partial": []}
+        for column, value in row.items():
+            if column is None or value is None:
+                continue
+            value = value.strip()
+            if ":" in column:
+                if value:
+                    result_type, order = column.rsplit(":", 1)
+                    data["partial"].append({"type": result_type, "order": order, "value": value})
+            elif value:
+                data[column.strip()] = value
+        yield data
+
+
+def _read_json(file):
+    data = json.load(codecs.getreader("utf-8-sig")(file))
+    if isinstance(data, dict):
+        data = data.get("results", [])
+    if not isinstance(data, list):
+        raise ValueError("JSON file should contain a list of results.")
+    yield from data
+
+
+def _read_ndjson(file):
+    for line in codecs.getreader("utf-8-sig")(file):
+        if line.strip():
+            yield json.loads(line)
+
+
+def read_rows(file, file_format):
+    """
+    Yields result rows from the file.
+
+    :param file: binary file
+    :param file_format: csv, json or ndjson
+    :type file_format: str
+    :rtype: Iterator[dict]
+    :raises ValueError: if format is not supported or file is not valid
+    """
+    if file_format == "csv":
+        return _read_csv(file)
+    if file_format == "json":
+        return _read_json(file)
+    if file_format == "ndjson":
+        return _read_ndjson(file)
+    raise ValueError("Unsupported format: %s." % file_format)
+
+
+def _decimal(data, field):
+    value = data.get(field)
+    if value is None or value == "":
+        return None
+    try:
+        value = Decimal(str(value).replace(",", "."))
+    except InvalidOperation:
+        raise serializers.ValidationError(_("Invalid value for %s.") % field)
+    if not value.is_finite() or value.as_tuple().exponent < -3 or abs(value) >= 10**9:
+        raise serializers.ValidationError(_("Invalid value for %s.") % field)
+    return value
+
+
+def _integer(data, field, default=None):
+    value = data.get(field)
+    if value is None or value == "":
+        return default
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise serializers.ValidationError(_("Invalid value for %s.") % field)
+
+
+def _check_fields(model, values):
+    """
+    Raises ValidationError if the values are not valid for the model fields, i.e. a text is too long.
+
+    Related fields are not checked, as they are set from the reference data.
+    """
+    try:
+        model(**values).clean_fields(
+            exclude=[field.name for field in model._meta.fields if field.is_relation or field.name not in values]
+        )
+    except DjangoValidationError as e:
+        raise serializers.ValidationError(e.message_dict)
+
+
+class ResultImport:
+    """
+    Imports result rows to a competition.
+
+    :param competition:
+    :param request: request, used for the permission checks in the validation
+    :param dry_run: validate only
+    :type competition: Competition
+    :type dry_run: bool
+    """
+
+    def __init__(self, competition, request, dry_run=False):
+        self.serializer = ResultSerializer(
+            context={"request": request, "validation": ResultValidationContext(request.user, preload_entries=True)}
+        )
+        self.competition = self.serializer.validation_context.get_competition(competition)
+        self.dry_run = dry_run
+        self.categories = get_categories(self.competition.type.sport_id)
+        self.result_types = get_result_types(self.competition.type_id)
+        self.organizations = {}
+        self.errors = []
+        self.created = []
+
+    @staticmethod
+    def _get_sport_ids(row):
+        value = row.get("team_members") or row.get("sport_id") or []
+        if isinstance(value, str):
+            value = value.split(";")
+        elif not isinstance(value, list):
+            value = [value]
+        return [str(sport_id).strip() for sport_id in value if str(sport_id).strip()]
+
+    def _get_athletes(self, rows):
+        sport_ids = set()
+        for row in rows:
+            sport_ids.update(self._get_sport_ids(row))
+        return {
+            athlete.sport_id: athlete
+            for athlete in Athlete.objects.filter(sport_id__in=sport_ids).select_related("organization")
+        }
+
+    def _load_organizations(self, rows):
+        abbreviations = {str(row["organization"]) for row in rows if row.get("organization")} - set(self.organizations)
+        if abbreviations:
+            self.organizations.update(
+                {
+                    organization.abbreviation: organization
+                    for organization in Organization.objects.filter(abbreviation__in=abbreviations)
+                }
+            )
+
+    @staticmethod
+    def _get_athlete(athletes, sport_id):
+        if sport_id not in athletes:
+            raise serializers.ValidationError(_("Unknown athlete: %s.") % sport_id)
+        return athletes[sport_id]
+
+    def _get_partials(self, row):
+        partials = []
+        for partial in row.get("partial") or []:
+            if not isinstance(partial, dict):
+                raise serializers.ValidationError(_("Invalid partial result."))
+            if partial.get("type") not in self.result_types:
+                raise serializers.ValidationError(_("Unknown result type: %s.") % partial.get("type"))
+            data = {
+                "type": self.result_types[partial["type"]],
+                "order": _integer(partial, "order", 1),
+                "decimals": _integer(partial, "decimals", 0),
+                "code": partial.get("code") or "",
+            }
+            value = _decimal(partial, "value")
+            if value is not None:
+                data["value"] = value
+            try:
+                _check_fields(ResultPartial, data)
+            except serializers.ValidationError as e:
+                raise serializers.ValidationError({"partial": e.detail})
+            partials.append(data)
+        return partials
+
+    def _get_data(self, row, athletes):
+        """
+        Returns result data for the row, in the same form as the validated serializer data.
+        """
+        if row.get("category") not in self.categories:
+            raise serializers.ValidationError(_("Unknown category: %s.") % row.get("category"))
+        category = self.categories[row["category"]]
+        data = {
+            "competition": self.competition,
+            "category": category,
+            "first_name": row.get("first_name") or None,
+            "last_name": row.get("last_name") or None,
+            "result": _decimal(row, "result"),
+            "decimals": _integer(row, "decimals", 0),
+            "result_code": row.get("result_code") or "",
+            "position": _integer(row, "position"),
+            "position_pre": _integer(row, "position_pre"),
+            "info": row.get("info") or None,
+            "team": category.team,
+        }
+        _check_fields(Result, data)
+        if category.team and not data["last_name"]:
+            raise serializers.ValidationError(_("Missing team name."))
+        data["partial"] = self._get_partials(row)
+        sport_ids = self._get_sport_ids(row)
+        athlete = None
+        if category.team:
+            data["team_members"] = [self._get_athlete(athletes, sport_id) for sport_id in sport_ids]
+        elif len(sport_ids) == 1:
+            athlete = self._get_athlete(athletes, sport_ids[0])
+            data["athlete"] = athlete
+        else:
+            raise serializers.ValidationError(_("Missing athletes."))
+        if row.get("organization"):
+            if str(row["organization"]) not in self.organizations:
+                raise serializers.ValidationError(_("Unknown organization: %s.") % row["organization"])
+            data["organization"] = self.organizations[str(row["organization"])]
+        else:
+            data["organization"] = athlete.organization if athlete else None
+        return data
+
+    def _validate_chunk(self, rows):
+        athletes = self._get_athletes(row for row, number in rows if isinstance(row, dict))
+        self._load_organizations([row for row, number in rows if isinstance(row, dict)])
+        if settings.CHECK_COMPETITION_REQUIREMENTS and athletes:
+            self.serializer.validation_context.get_coverage(athletes.values())
+        valid = []
+        for row, number in rows:
+            try:
+                if not isinstance(row, dict):
+                    raise serializers.ValidationError(_("Invalid row."))
+                valid.append(self.serializer.validate(self._get_data(row, athletes)))
+            except serializers.ValidationError as e:
+                self.errors.append({"row": number, "errors": serializers.as_serializer_error(e)})
+        return valid
+
+    def _insert_chunk(self, data):
+        """
+        Inserts results with their partial results and team members.
+
+        Primary keys are returned by the bulk insert if the database supports it. Otherwise the results are fetched
+        back in the primary key order, as a multi-row insert assigns increasing keys in the order of the rows.
+        """
+        public = getattr(settings, "AUTO_PUBLISH_RESULTS", False)
+        results = []
+        for values in data:
+            values = {key: value for key, value in values.items() if key not in ("partial", "team_members")}
+            result = Result(public=public, **values)
+            result.set_derived_fields()
+            results.append(result)
+        if connection.features.can_return_rows_from_bulk_insert:
+            Result.objects.bulk_create(results)
+        else:
+            last_pk = Result.objects.order_by("-pk").values_list("pk", flat=True).first() or 0
+            Result.objects.bulk_create(results, batch_size=len(results))
+            pks = Result.objects.filter(competition=self.competition, pk__gt=last_pk).order_by("pk")
+            for result, pk in zip(results, pks.values_list("pk", flat=True)):
+                result.pk = pk
+        partials = []
+        packed = []
+        members = []
+        for result, values in zip(results, data):
+            packed_values = {}
+            for partial in values["partial"]:
+                if partial["type"].packed:
+                    packed_values.setdefault(partial["type"], []).append(partial)
+                else:
+                    partials.append(ResultPartial(result_id=result.pk, **partial))
+            packed += [
+                ResultPartialPacked(result_id=result.pk, type=result_type, values=ResultPartialPacked.pack(values))
+                for result_type, values in packed_values.items()
+            ]
+            members += [
+                Result.team_members.through(result_id=result.pk, athlete_id=athlete.pk)
+                for athlete in values.get("team_members", [])
+            ]
+        ResultPartial.objects.bulk_create(partials)
+        ResultPartialPacked.objects.bulk_create(packed)
+        Result.team_members.through.objects.bulk_create(members)
+        log_bulk_changes(
+            Result,
+            results,
+            ADDITION,
+            lambda result: [{"added": {}}, {"changed": {"fields": result._add_message()}}],
+        )
+        self.created += [result.pk for result in results]
+
+    def run(self, rows, chunk_size=CHUNK_SIZE):
+        """
+        Validates and inserts the rows.
+
+        :param rows: result rows
+        :param chunk_size: number of rows processed at once
+        :type rows: Iterator[dict]
+        :type chunk_size: int
+        :return: number of created results, row errors and records
+        :rtype: dict
+        """
+        rows = zip(rows, count(1))
+        with transaction.atomic():
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+                data = self._validate_chunk(chunk)
+                if data and not self.dry_run:
+                    self._insert_chunk(data)
+        return {"created": len(self.created), "errors": self.errors, "records": self._check_records()}
+
+    def _check_records(self):
+        """
+        Checks records for the created results and returns the records.
+        """
+        if not self.created:
+            return []
+        results = Result.objects.filter(pk__in=self.created)
+        for result in results.select_related("organization", "competition__type", "competition__level"):
+            check_records(result)
+        for partial in ResultPartial.objects.filter(result__in=self.created).select_related(
+            "type", "result__organization", "result__competition__type", "result__competition__level"
+        ):
+            check_records_partial(partial)
+        update_bests(get_keys(results))
+        mark_changed(self.competition.pk)
+        delete_snapshot(self.competition.pk)
+        queue_points([self.competition.pk])
+        return list(
+            Record.objects.filter(result__in=self.created)
+            .order_by("pk")
+            .values("id", "result", "partial_result", "level__abbreviation", "category__abbreviation")
+        )
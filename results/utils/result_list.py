@@ -0,0 +1,274 @@
+"""
+Serializer-free renderer for the result list.
+
+Result rows are fetched with values() and related objects with a single query per relation into lookup maps.
+Shared objects, i.e. competitions and organizations, are rendered once per object and rows are assembled with plain
+dicts in the same shape as :class:`results.serializers.results.ResultLimitedSerializer`. Serializer's own fields are
+used for the selected fields, value conversions and permissions, so the output matches the serializer.
+"""
+
+from collections import defaultdict
+
+from django.db.models import F
+from rest_framework import serializers
+
+from results.models.athletes import Athlete, AthleteInformation
+from results.models.categories import Category
+from results.models.competitions import Competition, CompetitionResultType
+from results.models.organizations import Organization
+from results.models.records import Record, RecordLevel
+from results.models.results import ResultPartial, ResultPartialPacked
+from results.serializers.results import ResultLimitedSerializer
+
+CONVERTED_FIELDS = (serializers.DecimalField, serializers.DateField, serializers.DateTimeField, serializers.TimeField)
+
+
+def _get_converters(serializer):
+    """
+    Returns value conversion functions for the serializer fields, None if value is used as is.
+    """
+    return {
+        name: field.to_representation if isinstance(field, CONVERTED_FIELDS) else None
+        for name, field in serializer.fields.items()
+    }
+
+
+def _convert(converters, name, value):
+    if value is None or converters[name] is None:
+        return value
+    return converters[name](value)
+
+
+def _get_abbreviations(model, pks):
+    pks = set(pks) - {None}
+    return dict(model.objects.filter(pk__in=pks).values_list("pk", "abbreviation")) if pks else {}
+
+
+class ResultListRenderer:
+    """
+    Renders result rows in the same shape as ResultLimitedSerializer.
+
+    Fields are limited with the fields and fields! parameters, as in the serializer, and related objects are loaded
+    only for the rendered fields.
+
+    :param context: serializer context including request
+    :type context: dict
+    """
+
+    RELATION_COLUMNS = {
+        "athlete": "athlete_id",
+        "competition": "competition_id",
+        "organization": "organization_id",
+        "category": "category_id",
+        "elimination_category": "elimination_category_id",
+    }
+    LIST_FIELDS = ("team_members", "partial", "record")
+
+    def __init__(self, context):
+        self.request = context.get("request")
+        self.serializer = ResultLimitedSerializer(context=context)
+        self.converters = _get_converters(self.serializer)
+
+    @property
+    def columns(self):
+        """
+        Result columns fetched for the rendered fields
+
+        :rtype: list
+        """
+        columns = ["id"]
+        for name in self.serializer.fields:
+            if name not in self.LIST_FIELDS and name != "id":
+                columns.append(self.RELATION_COLUMNS.get(name, name))
+        return columns
+
+    def render(self, rows):
+        """
+        Returns rendered results.
+
+        :param rows: result rows with the columns
+        :type rows: list
+        :rtype: list
+        """
+        rows = list(rows)
+        lookups = {}
+        for name in self.serializer.fields:
+            loader = getattr(self, "_load_%s" % name, None)
+            if loader:
+                lookups[name] = loader(rows)
+        data = []
+        for row in rows:
+            item = {}
+            for name in self.serializer.fields:
+                if name in self.LIST_FIELDS:
+                    item[name] = lookups[name].get(row["id"], [])
+                elif name in lookups:
+                    item[name] = lookups[name].get(row[self.RELATION_COLUMNS[name]])
+                else:
+                    item[name] = _convert(self.converters, name, row[name])
+            data.append(item)
+        return data
+
+    @staticmethod
+    def _get_ids(rows, column):
+        return {row[column] for row in rows} - {None}
+
+    def _load_athlete(self, rows):
+        return self._render_athletes(self._get_ids(rows, "athlete_id"), self.serializer.fields["athlete"])
+
+    def _load_team_members(self, rows):
+        team_members = defaultdict(list)
+        serializer = self.serializer.fields["team_members"].child
+        converters = _get_converters(serializer)
+        for athlete in (
+            Athlete.objects.filter(team_members__in=[row["id"] for row in rows])
+            .annotate(team_result=F("team_members"))
+            .values("team_result", *serializer.fields)
+        ):
+            team_members[athlete["team_result"]].append(
+                {name: _convert(converters, name, athlete[name]) for name in serializer.fields}
+            )
+        return team_members
+
+    def _load_competition(self, rows):
+        serializer = self.serializer.fields["competition"]
+        return {
+            competition.pk: serializer.to_representation(competition)
+            for competition in Competition.objects.filter(pk__in=self._get_ids(rows, "competition_id")).select_related(
+                "type", "level"
+            )
+        }
+
+    def _load_organization(self, rows):
+        return _get_abbreviations(Organization, self._get_ids(rows, "organization_id"))
+
+    def _load_category(self, rows):
+        return _get_abbreviations(Category, self._get_ids(rows, "category_id"))
+
+    def _load_elimination_category(self, rows):
+        return _get_abbreviations(Category, self._get_ids(rows, "elimination_category_id"))
+
+    def _load_partial(self, rows):
+        serializer = self.serializer.fields["partial"].child
+        converters = _get_converters(serializer)
+        result_ids = [row["id"] for row in rows]
+        values = list(
+            ResultPartial.objects.filter(result__in=result_ids).values(
+                "id", "result_id", "type_id", "order", "value", "decimals", "code", "time", "text"
+            )
+        )
+        for packed in ResultPartialPacked.objects.filter(result__in=result_ids).values(
+            "result_id", "type_id", "values"
+        ):
+            for partial in ResultPartialPacked.unpack(packed["values"]):
+                values.append({"id": None, "result_id": packed["result_id"], "type_id": packed["type_id"], **partial})
+        type_serializer = serializer.fields["type"]
+        types = {
+            result_type.pk: type_serializer.to_representation(result_type)
+            for result_type in CompetitionResultType.objects.filter(pk__in={value["type_id"] for value in values})
+        }
+        partials = defaultdict(list)
+        for value in sorted(values, key=lambda value: (value["type_id"], value["order"])):
+            partials[value["result_id"]].append(
+                {
+                    name: types[value["type_id"]] if name == "type" else _convert(converters, name, value[name])
+                    for name in serializer.fields
+                }
+            )
+        return partials
+
+    def _load_record(self, rows):
+        serializer = self.serializer.fields["record"].child
+        converters = _get_converters(serializer)
+        values = list(
+            Record.objects.filter(result__in=[row["id"] for row in rows]).values(
+                "id", "result_id", "level_id", "approved", "partial_result_id", "category_id", "date_end", "historical"
+            )
+        )
+        slugs = {
+            "level": _get_abbreviations(RecordLevel, {value["level_id"] for value in values}),
+            "category": _get_abbreviations(Category, {value["category_id"] for value in values}),
+        }
+        records = defaultdict(list)
+        for value in values:
+            item = {}
+            for name in serializer.fields:
+                if name in slugs:
+                    item[name] = slugs[name].get(value["%s_id" % name])
+                elif name == "partial_result":
+                    item[name] = value["partial_result_id"]
+                else:
+                    item[name] = _convert(converters, name, value[name])
+            records[value["result_id"]].append(item)
+        return records
+
+    def _render_athletes(self, athlete_ids, serializer):
+        """
+        Returns athletes rendered with AthleteLimitedSerializer fields by athlete id.
+        """
+        if not athlete_ids:
+            return {}
+        fields = serializer.fields
+        athletes = list(
+            Athlete.objects.filter(pk__in=athlete_ids).values(
+                "id", "first_name", "last_name", "sport_id", "organization_id"
+            )
+        )
+        organizations = {}
+        if "organization_info" in fields:
+            organizations = {
+                organization.pk: fields["organization_info"].to_representation(organization)
+                for organization in Organization.objects.filter(
+                    pk__in={athlete["organization_id"] for athlete in athletes} - {None}
+                ).prefetch_related("areas")
+            }
+        additional_organizations = defaultdict(list)
+        if "additional_organizations" in fields:
+            for athlete_id, organization_id in (
+                Organization.objects.filter(additional_organizations__in=athlete_ids)
+                .annotate(additional_athlete=F("additional_organizations"))
+                .values_list("additional_athlete", "pk")
+            ):
+                additional_organizations[athlete_id].append(organization_id)
+        info = defaultdict(list)
+        if "info" in fields:
+            info = self._render_information(athlete_ids, fields["info"].child)
+        rendered = {}
+        for athlete in athletes:
+            item = {}
+            for name in fields:
+                if name == "organization":
+                    item[name] = athlete["organization_id"]
+                elif name == "organization_info":
+                    item[name] = organizations.get(athlete["organization_id"])
+                elif name == "additional_organizations":
+                    item[name] = additional_organizations.get(athlete["id"], [])
+                elif name == "info":
+                    item[name] = info.get(athlete["id"], [])
+                else:
+                    item[name] = athlete[name]
+            rendered[athlete["id"]] = item
+        return rendered
+
+    def _render_information(self, athlete_ids, serializer):
+        """
+        Returns athlete information visible to the user, rendered with AthleteInformationSerializer fields, by
+        athlete id.
+        """
+        converters = _get_converters(serializer)
+        information = defaultdict(list)
+        for info in AthleteInformation.get_visibility_queryset(
+            user=self.request.user, queryset=AthleteInformation.objects.filter(athlete__in=athlete_ids)
+        ).select_related("sport"):
+            item = {}
+            for name, field in serializer.fields.items():
+                if name == "athlete":
+                    item[name] = info.athlete_id
+                elif name == "sport":
+                    item[name] = info.sport.name if info.sport else None
+                elif name == "permissions":
+                    item[name] = field.to_representation(info)
+                else:
+                    item[name] = _convert(converters, name, getattr(info, name))
+            information[info.athlete_id].append(item)
+        return information
@@ -0,0 +1,159 @@
+"""
+Validation context for result serializer.
+
+Context is created once per request, or per batch when results are created with a list, and holds the data shared
+between the validated results: user's cached group membership, category limits, competitions, existing entries and
+requirement coverage. Each value is loaded on the first use and reused for the following results.
+
+Existing entries are checked with a single indexed query per result, unless the context is created with
+preload_entries for the batches, when all entries of the competition are loaded with a single query.
+"""
+
+from results.models.categories import CategoryForCompetitionType
+from results.models.competitions import Competition
+from results.models.results import Result
+from results.utils.cache import get_membership
+from results.utils.requirements import get_coverage
+
+
+class ResultValidationContext:
+    """
+    Request scoped data for result validation.
+
+    :param user: request user
+    :param preload_entries: load all existing entries of the competition on the first existence check
+    :type user: User
+    :type preload_entries: bool
+    """
+
+    def __init__(self, user, preload_entries=False):
+        self.user = user
+        self.preload_entries = preload_entries
+        self._membership = None
+        self._competitions = {}
+        self._limits = {}
+        self._entries = {}
+        self._loaded = set()
+        self._coverage = {}
+
+    @property
+    def membership(self):
+        """
+        :return: user's cached group membership, see :func:`results.utils.cache.get_membership`
+        :rtype: dict
+        """
+        if self._membership is None:
+            self._membership = get_membership(self.user.pk)
+        return self._membership
+
+    @property
+    def groups(self):
+        """
+        :return: user's group ids
+        :rtype: frozenset
+        """
+        return self.membership["groups"]
+
+    def is_manager(self, organization):
+        """
+        Returns True if user is organization manager either directly or through area, same as
+        :meth:`results.models.organizations.Organization.is_manager`.
+        """
+        return organization.pk in self.membership["organizations"]
+
+    def is_area_manager(self, organization):
+        """
+        Returns True if user is area manager for the organization, same as
+        :meth:`results.models.organizations.Organization.is_area_manager`.
+        """
+        return organization.pk in self.membership["area_organizations"]
+
+    def is_sport_manager(self, sport):
+        """
+        Returns True if user is sport manager, same as :meth:`results.models.sports.Sport.is_manager`.
+        """
+        return sport.pk in self.membership["sports"]
+
+    def get_competition(self, competition):
+        """
+        Returns the competition with type, sport, level and organization loaded.
+
+        :param competition:
+        :type competition: Competition
+        :rtype: Competition
+        """
+        if competition.pk not in self._competitions:
+            self._competitions[competition.pk] = Competition.objects.select_related(
+                "type__sport", "level", "organization"
+            ).get(pk=competition.pk)
+        return self._competitions[competition.pk]
+
+    def get_category_check(self, category, competition_type):
+        """
+        Returns category settings for the competition type, or None if not set.
+
+        Settings for all categories of the competition type are loaded in a single query.
+
+        :param category:
+        :param competition_type:
+        :type category: Category
+        :type competition_type: CompetitionType
+        :rtype: CategoryForCompetitionType
+        """
+        if competition_type.pk not in self._limits:
+            checks = {}
+            for check in CategoryForCompetitionType.objects.filter(type=competition_type).order_by("pk"):
+                checks.setdefault(check.category_id, check)
+            self._limits[competition_type.pk] = checks
+        checks = self._limits[competition_type.pk]
+        return checks.get(category.pk)
+
+    def _load_entries(self, competition):
+        entries = self._entries.setdefault(competition.pk, set())
+        for athlete_id, last_name, category_id in (
+            Result.objects.filter(competition=competition)
+            .order_by()
+            .values_list("athlete_id", "last_name", "category_id")
+        ):
+            entries.add(("athlete", athlete_id, category_id))
+            entries.add(("team", last_name, category_id))
+        self._loaded.add(competition.pk)
+
+    @staticmethod
+    def _entry_key(category, athlete, last_name):
+        if category.team:
+            return "team", last_name, category.pk
+        return "athlete", athlete.pk if athlete else None, category.pk
+
+    def entry_exists(self, competition, category, athlete=None, last_name=None):
+        """
+        Returns True if the competition has a result for the athlete, or team name, in the category.
+
+        Entries added to the context are checked first. Existing entries are loaded for the competition in a single
+        query if preload_entries is set, otherwise the entry is checked with its own query.
+        """
+        key = self._entry_key(category, athlete, last_name)
+        if self.preload_entries and competition.pk not in self._loaded:
+            self._load_entries(competition)
+        if key in self._entries.get(competition.pk, ()):
+            return True
+        if competition.pk in self._loaded:
+            return False
+        if category.team:
+            return Result.objects.filter(competition=competition, category=category, last_name=last_name).exists()
+        return Result.objects.filter(competition=competition, category=category, athlete=athlete).exists()
+
+    def add_entry(self, competition, category, athlete=None, last_name=None):
+        """
+        Adds a validated entry, so that duplicates in the same batch are found.
+        """
+        self._entries.setdefault(competition.pk, set()).add(self._entry_key(category, athlete, last_name))
+
+    def get_coverage(self, athletes):
+        """
+        Returns requirement coverage for the athletes, see :func:`results.utils.requirements.get_coverage`.
+        """
+        missing = [athlete.pk for athlete in athletes if athlete.pk not in self._coverage]
+        if missing:
+            self._coverage.update(get_coverage(missing))
+        return self._coverage
@@ -0,0 +1,118 @@
+"""
+Result list snapshots for locked and approved competitions.
+
+Results of a locked and approved competition do not change, so the public result list of the competition is
+rendered once, when the competition is locked or approved, and stored as zlib compressed JSON in
+:class:`results.models.competitions.CompetitionSnapshot`. Anonymous competition result list requests are served
+from the snapshot without querying the results.
+
+Snapshot is removed when the competition or its results are changed, and rendered again on the next request if the
+competition is still locked and approved. Changes to the athletes and organizations shown in the result list are
+not tracked, saving the competition removes the snapshot. Snapshot is always rendered from the default database, so
+that a lagging read replica is not stored in the snapshot.
+"""
+
+import zlib
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpRequest
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from results.db_router import reset_replica_reads, set_replica_reads
+from results.models.competitions import Competition, CompetitionSnapshot
+from results.models.results import Result
+from results.utils.result_list import ResultListRenderer
+
+
+def _get_anonymous_request():
+    http_request = HttpRequest()
+    http_request.method = "GET"
+    request = Request(http_request)
+    request.user = AnonymousUser()
+    return request
+
+
+def render_result_list(competition_id):
+    """
+    Returns the result list of the competition as shown to anonymous users.
+
+    :param competition_id:
+    :type competition_id: int
+    :return: result list JSON
+    :rtype: bytes
+    """
+    renderer = ResultListRenderer({"request": _get_anonymous_request(), "format": None, "view": None})
+    rows = (
+        Result.objects.filter(competition=competition_id, public=True)
+        .exclude(organization_external=True)
+        .order_by("-result")
+        .values(*renderer.columns)
+    )
+    return JSONRenderer().render(renderer.render(rows))
+
+
+def create_snapshot(competition_id):
+    """
+    Renders and stores the result list snapshot for the competition. Results are read from the default database.
+
+    :param competition_id:
+    :type competition_id: int
+    :return: zlib compressed result list JSON
+    :rtype: bytes
+    """
+    token = set_replica_reads(False)
+    try:
+        content = zlib.compress(render_result_list(competition_id))
+    finally:
+        reset_replica_reads(token)
+    CompetitionSnapshot.objects.update_or_create(competition_id=competition_id, defaults={"content": content})
+    return content
+
+
+def _get_snapshot_queryset(competition_id):
+    return Competition.objects.filter(pk=competition_id, locked=True, approved=True).values_list(
+        "snapshot__content", flat=True
+    )
+
+
+def get_snapshot(competition_id):
+    """
+    Returns the result list snapshot if the competition is locked and approved.
+
+    Snapshot is created if the competition is locked and approved and it does not have a snapshot.
+
+    :param competition_id:
+    :type competition_id: int
+    :return: zlib compressed result list JSON or None if the competition is not locked and approved
+    :rtype: bytes
+    """
+    snapshots = list(_get_snapshot_queryset(competition_id))
+    if not snapshots:
+        return None
+    if snapshots[0] is None:
+        return create_snapshot(competition_id)
+    return bytes(snapshots[0])
+
+
+async def aget_snapshot(competition_id):
+    """
+    Async version of :func:`get_snapshot`.
+    """
+    snapshots = [content async for content in _get_snapshot_queryset(competition_id)]
+    if not snapshots:
+        return None
+    if snapshots[0] is None:
+        return await sync_to_async(create_snapshot)(competition_id)
+    return bytes(snapshots[0])
+
+
+def delete_snapshot(competition_id):
+    """
+    Removes the result list snapshot of the competition.
+
+    :param competition_id:
+    :type competition_id: int
+    """
+    CompetitionSnapshot.objects.filter(competition=competition_id).delete()
@@ -1,18 +1,24 @@
 from datetime import date
 
-from django.db.models import Prefetch
+from django.db.models import Exists, OuterRef, Prefetch
 from django.utils.decorators import method_decorator
 from django.views.decorators.vary import vary_on_cookie
 from django_filters.rest_framework import DjangoFilterBackend
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from dry_rest_permissions.generics import DRYPermissions
-from rest_framework import filters, viewsets
+from rest_framework import exceptions, filters, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
 
 from results.models.athletes import Athlete, AthleteInformation
 from results.serializers.athletes import (
     AthleteInformationSerializer,
     AthleteLimitedSerializer,
+    AthleteNameSerializer,
     AthleteSerializer,
 )
+from results.utils.athlete_search import search_athletes
 from results.utils.pagination import CustomPagePagination
 
 
@@ -43,6 +49,10 @@ class AthleteViewSet(viewsets.ModelViewSet):
 
     destroy:
     Removes the given athlete.
+
+    search:
+    Returns athletes matching all words in q, ignoring case and accents. Each word must be a prefix of the athlete's
+    first name, last name or sport ID.
     """
 
     permission_classes = (DRYPermissions,)
@@ -60,21 +70,22 @@ class AthleteViewSet(viewsets.ModelViewSet):
         queryset = Athlete.objects.all()
         info = self.request.query_params.get("info", None)
         if info:
-            visibility = AthleteInformation.get_visibility(self.request.user)
-            queryset = queryset.filter(
-                info__type=info,
-                info__date_end__gte=date.today(),
-                info__date_start__lte=date.today(),
-                info__visibility__in=visibility,
+            information = AthleteInformation.objects.filter(
+                athlete=OuterRef("pk"),
+                type=info,
+                date_end__gte=date.today(),
+                date_start__lte=date.today(),
+                visibility__in=AthleteInformation.get_visibility(self.request.user),
             )
             sport = self.request.query_params.get("sport", None)
             if sport:
-                queryset = queryset.filter(info__sport=sport)
+                information = information.filter(sport=sport)
+            queryset = queryset.filter(Exists(information))
         athlete_information_queryset = AthleteInformation.get_visibility_queryset(
             user=self.request.user, queryset=AthleteInformation.objects.all()
         )
         prefetch = [Prefetch("info", queryset=athlete_information_queryset)]
-        queryset = self.get_serializer_class().setup_eager_loading(queryset, prefetch=prefetch).distinct()
+        queryset = self.get_serializer_class().setup_eager_loading(queryset, prefetch=prefetch)
         return queryset
 
     def get_serializer_class(self):
@@ -89,6 +100,24 @@ class AthleteViewSet(viewsets.ModelViewSet):
     def dispatch(self, request, *args, **kwargs):
         return super().dispatch(request, *args, **kwargs)
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("q", description="Search words.", type=OpenApiTypes.STR, required=True),
+            OpenApiParameter(
+                "limit", description="Maximum number of athletes, default 10, max 50.", type=OpenApiTypes.INT
+            ),
+        ],
+        responses=AthleteNameSerializer(many=True),
+    )
+    @action(detail=False)
+    def search(self, request, *args, **kwargs):
+        try:
+            limit = min(int(request.query_params.get("limit", 10)), 50)
+        except ValueError:
+            raise exceptions.ParseError()
+        athletes = search_athletes(request.query_params.get("q", ""), limit=max(limit, 0))
+        return Response(AthleteNameSerializer(athletes, many=True).data)
+
 
 class AthleteInformationViewSet(viewsets.ModelViewSet):
     """API endpoint for athlete information.
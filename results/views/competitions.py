@@ -1,11 +1,16 @@
+import os
+
 from django.conf import settings
 from django.db.models import Q
 from django.utils.decorators import method_decorator
+from django.utils.translation import gettext_lazy as _
 from django.views.decorators.vary import vary_on_cookie
 from django_filters import rest_framework as filters
 from dry_rest_permissions.generics import DRYPermissions
-from rest_framework import viewsets
+from rest_framework import exceptions, serializers, viewsets
+from rest_framework.decorators import action
 from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.response import Response
 
 from results.models.competitions import (
     Competition,
@@ -21,7 +26,10 @@ from results.serializers.competitions import (
     CompetitionSerializer,
     CompetitionTypeSerializer,
 )
+from results.utils.cache import get_membership
 from results.utils.pagination import CustomPagePagination
+from results.utils.positions import update_positions
+from results.utils.result_import import ResultImport, read_rows
 
 
 class NumberInFilter(filters.BaseInFilter, filters.NumberFilter):
@@ -66,6 +74,14 @@ class CompetitionViewSet(viewsets.ModelViewSet):
 
     destroy:
     Removes the given competition.
+
+    positions:
+    Calculates positions for the results of the given competition and returns the changed positions.
+
+    import_results:
+    Imports results to the given competition from a CSV, JSON or NDJSON file, given in the file field. Format is
+    taken from the format field or the file extension. Returns the number of created results, row errors and
+    records. Results are only validated if dry_run is set.
     """
 
     permission_classes = (DRYPermissions,)
@@ -87,9 +103,8 @@ class CompetitionViewSet(viewsets.ModelViewSet):
             if not user.is_superuser and not user.is_staff:
                 self.queryset = self.queryset.filter(
                     Q(public=True)
-                    | Q(organization__group__in=user.groups.all())
-                    | Q(organization__areas__manager__in=user.groups.all())
-                    | Q(type__sport__manager__in=user.groups.all())
+                    | Q(organization__in=get_membership(user.pk)["organizations"])
+                    | Q(type__sport__in=get_membership(user.pk)["sports"])
                 )
         elif settings.LIMIT_NON_PUBLIC_EVENT_AND_COMPETITION == "authenticated":
             if not user.is_authenticated:
@@ -101,6 +116,29 @@ class CompetitionViewSet(viewsets.ModelViewSet):
     def dispatch(self, request, *args, **kwargs):
         return super().dispatch(request, *args, **kwargs)
 
+    @action(detail=True, methods=["post"])
+    def positions(self, request, *args, **kwargs):
+        results = update_positions(self.get_object())
+        return Response(
+            [{"id": result.pk, "position": result.position, "position_pre": result.position_pre} for result in results]
+        )
+
+    @action(detail=True, methods=["post"], url_path="import")
+    def import_results(self, request, *args, **kwargs):
+        competition = self.get_object()
+        file = request.FILES.get("file")
+        if file is None:
+            raise exceptions.ParseError(_("Missing file."))
+        file_format = request.data.get("format") or os.path.splitext(file.name)[1][1:].lower()
+        if file_format == "jsonl":
+            file_format = "ndjson"
+        dry_run = serializers.BooleanField().to_internal_value(request.data.get("dry_run", False))
+        try:
+            data = ResultImport(competition, request, dry_run=dry_run).run(read_rows(file, file_format))
+        except ValueError as e:
+            raise exceptions.ParseError(str(e))
+        return Response(data)
+
 
 class CompetitionLevelViewSet(viewsets.ModelViewSet):
     """API endpoint for competition levels.
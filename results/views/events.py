@@ -10,6 +10,7 @@ from rest_framework.filters import OrderingFilter, SearchFilter
 from results.models.athletes import AthleteInformation
 from results.models.events import Event, EventContact
 from results.serializers.events import EventContactSerializer, EventSerializer
+from results.utils.cache import get_membership, get_user_groups
 from results.utils.pagination import CustomPagePagination
 
 
@@ -76,9 +77,8 @@ class EventViewSet(viewsets.ModelViewSet):
             if not user.is_superuser and not user.is_staff:
                 self.queryset = self.queryset.filter(
                     Q(public=True)
-                    | Q(organization__group__in=user.groups.all())
-                    | Q(organization__areas__manager__in=user.groups.all())
-                    | Q(competitions__type__sport__manager__in=user.groups.all())
+                    | Q(organization__in=get_membership(user.pk)["organizations"])
+                    | Q(competitions__type__sport__in=get_membership(user.pk)["sports"])
                 )
         elif settings.LIMIT_NON_PUBLIC_EVENT_AND_COMPETITION == "authenticated":
             if not user.is_authenticated:
@@ -161,7 +161,7 @@ class EventContactViewSet(viewsets.ModelViewSet):
         """
         user = self.request.user
         if not user.is_superuser and not user.is_staff:
-            self.queryset = self.queryset.filter(Q(event__organization__group__in=user.groups.all()))
+            self.queryset = self.queryset.filter(Q(event__organization__group__in=get_user_groups(user.pk)))
         athlete_information_queryset = AthleteInformation.get_visibility_queryset(
             user=self.request.user, queryset=AthleteInformation.objects.all()
         )
@@ -6,6 +6,7 @@ from rest_framework import viewsets
 
 from results.models.organizations import Area, Organization
 from results.serializers.organizations import AreaSerializer, OrganizationSerializer
+from results.utils.cache import get_user_groups
 
 
 class AreaViewSet(viewsets.ModelViewSet):
@@ -84,7 +85,7 @@ class OrganizationViewSet(viewsets.ModelViewSet):
         if own:
             user = self.request.user
             if not user.is_superuser and not user.is_staff:
-                self.queryset = self.queryset.filter(group__in=user.groups.all())
+                self.queryset = self.queryset.filter(group__in=get_user_groups(user.pk))
         self.queryset = self.get_serializer_class().setup_eager_loading(self.queryset)
         return self.queryset
 
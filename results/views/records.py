@@ -3,11 +3,18 @@ from django_filters import rest_framework as filters
 from django_filters.widgets import BooleanWidget
 from dry_rest_permissions.generics import DRYPermissions
 from rest_framework import mixins, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
 
 from results.models.athletes import AthleteInformation
 from results.models.records import Record, RecordLevel
 from results.serializers.records import RecordLevelSerializer, RecordSerializer
 from results.serializers.records_list import RecordListSerializer
+from results.utils.record_history import (
+    get_record_chain,
+    get_records_at,
+    get_records_between,
+)
 
 
 class RecordViewSet(viewsets.ModelViewSet):
@@ -30,12 +37,20 @@ class RecordViewSet(viewsets.ModelViewSet):
 
     destroy:
     Removes the given record.
+
+    history:
+    Returns approved records in the same record chain as the given record, ordered by start date.
     """
 
     permission_classes = (DRYPermissions,)
     queryset = Record.objects.all()
     serializer_class = RecordSerializer
 
+    @action(detail=True)
+    def history(self, request, *args, **kwargs):
+        serializer = self.get_serializer(get_record_chain(self.get_object()), many=True)
+        return Response(serializer.data)
+
 
 class RecordLevelViewSet(viewsets.ModelViewSet):
     """API endpoint for record levels.
@@ -89,6 +104,22 @@ class RecordListFilter(filters.FilterSet):
     approved = filters.BooleanFilter(field_name="approved", widget=BooleanWidget())
     start = filters.DateFilter(field_name="date_start", lookup_expr="gte")
     end = filters.DateFilter(field_name="date_end", lookup_expr="lte")
+    partial_type = NumberInFilter(field_name="partial_type__pk", lookup_expr="in")
+    at = filters.DateFilter(method="filter_at")
+    valid_from = filters.DateFilter(method="filter_valid_from")
+    valid_to = filters.DateFilter(method="filter_valid_to")
+
+    @staticmethod
+    def filter_at(queryset, name, value):
+        return get_records_at(queryset, value)
+
+    @staticmethod
+    def filter_valid_from(queryset, name, value):
+        return get_records_between(queryset, start=value)
+
+    @staticmethod
+    def filter_valid_to(queryset, name, value):
+        return get_records_between(queryset, end=value)
 
     o = filters.OrderingFilter(
         fields=(
@@ -105,6 +136,9 @@ class RecordList(mixins.ListModelMixin, viewsets.GenericViewSet):
 
     retrieve:
     Returns the record list, filtered by fields.
+
+    Returns current records by default. Records valid at a given date are returned with the at parameter and
+    records valid during a date range with the valid_from and valid_to parameters.
     """
 
     permission_classes = (DRYPermissions,)
@@ -112,11 +146,14 @@ class RecordList(mixins.ListModelMixin, viewsets.GenericViewSet):
     serializer_class = RecordListSerializer
     filter_backends = [filters.DjangoFilterBackend]
     filterset_class = RecordListFilter
+    history_parameters = ["at", "valid_from", "valid_to"]
 
     def get_queryset(self):
         """
-        Setup eager loading of linked models
+        Include ended records for the history queries and setup eager loading of linked models
         """
+        if any(self.request.query_params.get(parameter) for parameter in self.history_parameters):
+            self.queryset = Record.objects.all()
         athlete_information_queryset = AthleteInformation.get_visibility_queryset(
             user=self.request.user, queryset=AthleteInformation.objects.all()
         )
@@ -124,5 +161,8 @@ class RecordList(mixins.ListModelMixin, viewsets.GenericViewSet):
             Prefetch("result__athlete__info", queryset=athlete_information_queryset),
             Prefetch("result__team_members__info", queryset=athlete_information_queryset),
         ]
-        self.queryset = self.get_serializer_class().setup_eager_loading(self.queryset, prefetch=prefetch)
+        serializer_class = self.get_serializer_class()
+        self.queryset = serializer_class.setup_eager_loading(
+            self.queryset, prefetch=prefetch, fields=serializer_class.get_requested_fields(self.request)
+        )
         return self.queryset
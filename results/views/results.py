@@ -1,23 +1,42 @@
 import re
+import time
+import zlib
 from datetime import datetime
 
-from django.db.models import Prefetch, Q
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, Count, F, Prefetch, Q, RowRange, Sum, Window
+from django.db.models.functions import ExtractYear, RowNumber
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import method_decorator
+from django.views.decorators.vary import vary_on_cookie
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from dry_rest_permissions.generics import DRYPermissions
 from rest_framework import exceptions, filters, mixins, viewsets
+from rest_framework.decorators import action
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
 
 from results.models.athletes import AthleteInformation
-from results.models.results import Result, ResultPartial
+from results.models.results import AthleteBest, Result, ResultPartial
 from results.serializers.results import (
+    AthleteBestSerializer,
+    ResultGroupAggregateSerializer,
     ResultLimitedAggregateSerializer,
     ResultLimitedSerializer,
     ResultPartialSerializer,
     ResultSerializer,
 )
 from results.serializers.results_detail import ResultDetailSerializer
+from results.utils.cache import get_membership
+from results.utils.change_feed import get_change_marker, get_changes
 from results.utils.pagination import CustomPagePagination
+from results.utils.result_list import ResultListRenderer
+from results.utils.snapshots import aget_snapshot, get_snapshot
 
 
 class ResultViewSet(viewsets.ModelViewSet):
@@ -30,7 +49,7 @@ class ResultViewSet(viewsets.ModelViewSet):
     Returns the given result.
 
     create:
-    Creates a new result instance.
+    Creates a new result instance, or multiple instances if a list is given.
 
     update:
     Updates a given result.
@@ -48,6 +67,28 @@ class ResultViewSet(viewsets.ModelViewSet):
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ["competition"]
 
+    def get_serializer(self, *args, **kwargs):
+        """
+        Use list serializer when creating multiple results
+        """
+        if self.action == "create" and isinstance(kwargs.get("data"), list):
+            kwargs["many"] = True
+        return super().get_serializer(*args, **kwargs)
+
+    def perform_create(self, serializer):
+        """
+        Create multiple results in a single transaction
+        """
+        with transaction.atomic():
+            serializer.save()
+
+    def perform_update(self, serializer):
+        """
+        Update result and its partial results in a single transaction
+        """
+        with transaction.atomic():
+            serializer.save()
+
     def get_queryset(self):
         """
         Prefetch partial results
@@ -58,11 +99,13 @@ class ResultViewSet(viewsets.ModelViewSet):
         elif not user.is_superuser and not user.is_staff:
             self.queryset = self.queryset.filter(
                 Q(public=True)
-                | Q(competition__organization__group__in=user.groups.all())
-                | Q(competition__organization__areas__manager__in=user.groups.all())
-                | Q(competition__type__sport__manager__in=user.groups.all())
+                | Q(competition__organization__in=get_membership(user.pk)["organizations"])
+                | Q(competition__type__sport__in=get_membership(user.pk)["sports"])
             )
-        self.queryset = self.get_serializer_class().setup_eager_loading(self.queryset)
+        serializer_class = self.get_serializer_class()
+        self.queryset = serializer_class.setup_eager_loading(
+            self.queryset, fields=serializer_class.get_requested_fields(self.request)
+        )
         return self.queryset
 
 
@@ -76,7 +119,7 @@ class ResultPartialViewSet(viewsets.ModelViewSet):
     Returns the given partial result.
 
     create:
-    Creates a new partial result instance.
+    Creates a new partial result instance. Partial results of packed result types are saved with the result.
 
     update:
     Updates a given partial result.
@@ -102,9 +145,8 @@ class ResultPartialViewSet(viewsets.ModelViewSet):
         elif not user.is_superuser and not user.is_staff:
             self.queryset = self.queryset.filter(
                 Q(result__public=True)
-                | Q(result__competition__organization__group__in=user.groups.all())
-                | Q(result__competition__organization__areas__manager__in=user.groups.all())
-                | Q(result__competition__type__sport__manager__in=user.groups.all())
+                | Q(result__competition__organization__in=get_membership(user.pk)["organizations"])
+                | Q(result__competition__type__sport__in=get_membership(user.pk)["sports"])
             )
         return self.queryset
 
@@ -188,9 +230,20 @@ class ResultPartialViewSet(viewsets.ModelViewSet):
         ),
         OpenApiParameter(
             "group_results",
-            description="Sum of x best results by athlete.",
+            description="Aggregate of x best results by group, default sum by athlete.",
             type=OpenApiTypes.INT,
         ),
+        OpenApiParameter(
+            "group_by",
+            description="Grouping for group_results: athlete, organization, area, category, competition or season. "
+            "Multiple values may be separated by commas.",
+            type=OpenApiTypes.STR,
+        ),
+        OpenApiParameter(
+            "aggregate",
+            description="Aggregate function for group_results: sum, avg or count.",
+            type=OpenApiTypes.STR,
+        ),
         OpenApiParameter(
             "fields",
             description="Include only fields in results. Use != for excluding fields.",
@@ -201,7 +254,7 @@ class ResultPartialViewSet(viewsets.ModelViewSet):
 class ResultList(mixins.ListModelMixin, viewsets.GenericViewSet):
     """API endpoint for retrieving result lists.
 
-    group_results returns limited information, including only athlete and result.
+    group_results returns limited information, including only grouping fields and result.
 
     retrieve:
     Returns the result list
@@ -215,31 +268,78 @@ class ResultList(mixins.ListModelMixin, viewsets.GenericViewSet):
     ordering = "-result"
     serializer_class = ResultLimitedSerializer
 
-    @staticmethod
-    def _build_raw_query(queryset):
+    _GROUP_BY = {
+        "athlete": F("athlete"),
+        "organization": F("organization"),
+        "area": F("organization__areas"),
+        "category": F("category"),
+        "competition": F("competition"),
+        "season": ExtractYear("competition_date_start"),
+    }
+
+    _AGGREGATES = {"sum": Sum, "avg": Avg, "count": Count}
+
+    @method_decorator(vary_on_cookie)
+    def dispatch(self, request, *args, **kwargs):
+        return super().dispatch(request, *args, **kwargs)
+
+    def _get_grouping(self):
         """
-        Build a raw query for grouping results with inner query.
+        Returns group_by dimensions and aggregate function name from the query parameters.
         """
-        raw_query = str(queryset.query)
-        if "WHERE" in raw_query:
-            where_query = " WHERE" + raw_query.split("WHERE")[1].split(" ORDER BY")[0]
-            for match in re.findall(r" \d{4}-\d{2}-\d{2}", raw_query):
-                where_query = where_query.replace(match, ' "' + match.strip() + '"')
-            joins = re.split("FROM .results_result.", raw_query)[1].split("WHERE")[0]
-        else:
-            where_query = ""
-            joins = re.split("FROM .results_result.", raw_query)[1].split("ORDER BY")[0]
-        select_query = raw_query.split("FROM")[0]
-        first_select = re.sub(".results_result...result.,", "SUM(`results_result`.`result`) `result`,", select_query)
-        second_select = select_query + (
-            ", ROW_NUMBER() OVER(PARTITION BY `results_result`.`athlete_id` "
-            "ORDER BY `results_result`.`result` DESC) `rn` "
-        )
-        query_end = (
-            ") `results_result` WHERE `rn` <= %s GROUP BY `results_result`.`athlete_id` ORDER BY SUM(`result`) DESC"
+        group_by = self.request.query_params.get("group_by", "athlete").split(",")
+        aggregate = self.request.query_params.get("aggregate", "sum")
+        if not group_by or any(group not in self._GROUP_BY for group in group_by) or aggregate not in self._AGGREGATES:
+            raise exceptions.ParseError()
+        return group_by, aggregate
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.request and self.request.query_params.get("group_results", None):
+            context["group_by"], context["aggregate"] = self._get_grouping()
+        return context
+
+    @classmethod
+    def _group_results(cls, queryset, count, group_by=("athlete",), aggregate="sum"):
+        """
+        Returns the best result for each group, annotated with the aggregate of group's best results.
+
+        Results are numbered by group with a window function and the aggregate is calculated over the window frame
+        of the count best results, so the first row of each group includes the aggregate.
+
+        :param queryset: filtered results
+        :param count: number of best results to aggregate
+        :param group_by: grouping dimensions: athlete, organization, area, category, competition or season
+        :param aggregate: aggregate function: sum, avg or count
+        :type count: int
+        :type group_by: list
+        :type aggregate: str
+        :return: best result for each group with result_aggregate, ordered by result_aggregate
+        :rtype: QuerySet
+        """
+        partition_by = [cls._GROUP_BY[group] for group in group_by]
+        order_by = [F("result").desc(nulls_last=True), F("pk").asc()]
+        if "area" in group_by:
+            queryset = queryset.filter(organization__areas__isnull=False).annotate(
+                area=F("organization__areas__abbreviation")
+            )
+        if "organization" in group_by:
+            queryset = queryset.filter(organization__isnull=False)
+        if "season" in group_by:
+            queryset = queryset.annotate(season=cls._GROUP_BY["season"])
+        return (
+            queryset.annotate(
+                row_number=Window(RowNumber(), partition_by=partition_by, order_by=order_by),
+                result_aggregate=Window(
+                    cls._AGGREGATES[aggregate]("result"),
+                    partition_by=partition_by,
+                    order_by=order_by,
+                    frame=RowRange(start=0, end=count - 1),
+                ),
+            )
+            .filter(row_number=1)
+            .order_by(F("result_aggregate").desc(nulls_last=True), "pk")
         )
-        raw_query = first_select + "FROM (" + second_select + "FROM `results_result`" + joins + where_query + query_end
-        return raw_query
 
     def get_queryset(self):
         """
@@ -252,9 +352,8 @@ class ResultList(mixins.ListModelMixin, viewsets.GenericViewSet):
         elif not user.is_superuser and not user.is_staff:
             queryset = queryset.filter(
                 Q(public=True)
-                | Q(competition__organization__group__in=user.groups.all())
-                | Q(competition__organization__areas__manager__in=user.groups.all())
-                | Q(competition__type__sport__manager__in=user.groups.all())
+                | Q(competition__organization__in=get_membership(user.pk)["organizations"])
+                | Q(competition__type__sport__in=get_membership(user.pk)["sports"])
             )
         try:
             competition = self.request.query_params.get("competition", None)
@@ -270,7 +369,7 @@ class ResultList(mixins.ListModelMixin, viewsets.GenericViewSet):
             sport = self.request.query_params.get("sport", None)
             if sport:
                 sport_list = [int(c) for c in sport.split(",")]
-                queryset = queryset.filter(competition__type__sport__pk__in=sport_list)
+                queryset = queryset.filter(competition_sport__in=sport_list)
 
             category = self.request.query_params.get("category", None)
             if category:
@@ -280,12 +379,12 @@ class ResultList(mixins.ListModelMixin, viewsets.GenericViewSet):
             competition_level = self.request.query_params.get("level", None)
             if competition_level:
                 competition_level_list = [int(c) for c in competition_level.split(",")]
-                queryset = queryset.filter(competition__level__pk__in=competition_level_list)
+                queryset = queryset.filter(competition_level__in=competition_level_list)
 
             competition_type = self.request.query_params.get("type", None)
             if competition_type:
                 competition_type_list = [int(c) for c in competition_type.split(",")]
-                queryset = queryset.filter(competition__type__pk__in=competition_type_list)
+                queryset = queryset.filter(competition_type__in=competition_type_list)
 
             division = self.request.query_params.get("division", None)
             if division:
@@ -308,12 +407,12 @@ class ResultList(mixins.ListModelMixin, viewsets.GenericViewSet):
             start_date = self.request.query_params.get("start", None)
             if start_date:
                 start_date = datetime.strptime(start_date, "%Y-%m-%d").date()
-                queryset = queryset.filter(competition__date_end__gte=start_date)
+                queryset = queryset.filter(competition_date_end__gte=start_date)
 
             end_date = self.request.query_params.get("end", None)
             if end_date:
                 end_date = datetime.strptime(end_date, "%Y-%m-%d").date()
-                queryset = queryset.filter(competition__date_start__lte=end_date)
+                queryset = queryset.filter(competition_date_start__lte=end_date)
 
             approved = self.request.query_params.get("approved", False)
             if approved:
@@ -321,31 +420,161 @@ class ResultList(mixins.ListModelMixin, viewsets.GenericViewSet):
 
             trial = self.request.query_params.get("trial", False)
             if trial:
-                queryset = queryset.filter(competition__trial=True)
+                queryset = queryset.filter(competition_trial=True)
 
             external = self.request.query_params.get("external", False)
             if not external:
-                queryset = queryset.exclude(organization__external=True)
+                queryset = queryset.exclude(organization_external=True)
 
         except ValueError:
             raise exceptions.ParseError()
 
         group_results = self.request.query_params.get("group_results", None)
         if group_results and group_results.isdigit() and int(group_results) > 0:
-            # Remove team results as we group by athlete id
-            queryset = queryset.exclude(team=1)
-            self.serializer_class = ResultLimitedAggregateSerializer
+            group_by, aggregate = self._get_grouping()
+            if "athlete" in group_by:
+                # Remove team results as we group by athlete id
+                queryset = queryset.exclude(team=1)
+            if group_by == ["athlete"]:
+                self.serializer_class = ResultLimitedAggregateSerializer
+            else:
+                self.serializer_class = ResultGroupAggregateSerializer
             self.ordering = None
             self.ordering_fields = None
             self.filter_backends = []
-            queryset = Result.objects.raw(self._build_raw_query(queryset), [int(group_results)])
+            queryset = self._group_results(queryset, int(group_results), group_by, aggregate)
         athlete_information_queryset = AthleteInformation.get_visibility_queryset(
             user=self.request.user, queryset=AthleteInformation.objects.all()
         )
         prefetch = [Prefetch("athlete__info", queryset=athlete_information_queryset)]
-        queryset = self.get_serializer_class().setup_eager_loading(queryset, prefetch=prefetch)
+        serializer_class = self.get_serializer_class()
+        queryset = serializer_class.setup_eager_loading(
+            queryset, prefetch=prefetch, fields=serializer_class.get_requested_fields(self.request)
+        )
         return queryset
 
+    @staticmethod
+    def _get_snapshot_competition(request):
+        """
+        Returns competition id if the request can be served from the competition's result list snapshot.
+
+        Snapshots are served for anonymous JSON requests without other query parameters than competition.
+        """
+        competition = request.query_params.get("competition", "")
+        if (
+            request.user.is_authenticated
+            or request.accepted_media_type != JSONRenderer.media_type
+            or set(request.query_params) != {"competition"}
+            or not competition.isdigit()
+        ):
+            return None
+        return int(competition)
+
+    @staticmethod
+    def _get_snapshot_response(request, content):
+        """
+        Returns snapshot as deflate encoded response if accepted by the client, decompressed otherwise.
+        """
+        if re.search(r"\bdeflate\b", request.META.get("HTTP_ACCEPT_ENCODING", "")):
+            response = HttpResponse(content, content_type=JSONRenderer.media_type)
+            response["Content-Encoding"] = "deflate"
+        else:
+            response = HttpResponse(zlib.decompress(content), content_type=JSONRenderer.media_type)
+        patch_vary_headers(response, ["Accept-Encoding", "Cookie"])
+        return response
+
+    @classmethod
+    async def async_list(cls, request, *args, **kwargs):
+        """
+        Serves anonymous result lists of locked and approved competitions from the snapshots with the async ORM.
+
+        Returns None for other requests, which are served by the sync view.
+        """
+        if "HTTP_AUTHORIZATION" in request.META or settings.SESSION_COOKIE_NAME in request.COOKIES:
+            return None
+        drf_request = Request(request)
+        try:
+            (
+                drf_request.accepted_renderer,
+                drf_request.accepted_media_type,
+            ) = cls.content_negotiation_class().select_renderer(
+                drf_request, [renderer() for renderer in cls.renderer_classes]
+            )
+        except exceptions.NotAcceptable:
+            return None
+        competition_id = cls._get_snapshot_competition(drf_request)
+        if competition_id is None:
+            return None
+        content = await aget_snapshot(competition_id)
+        if content is None:
+            return None
+        return cls._get_snapshot_response(request, content)
+
+    def list(self, request, *args, **kwargs):
+        """
+        Render limited results with ResultListRenderer instead of the serializer.
+
+        Anonymous result lists of locked and approved competitions are served from the snapshots. Grouped results are
+        serialized with the aggregate serializers.
+        """
+        competition_id = self._get_snapshot_competition(request)
+        if competition_id is not None:
+            content = get_snapshot(competition_id)
+            if content is not None:
+                return self._get_snapshot_response(request, content)
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.get_serializer_class() is not ResultLimitedSerializer:
+            page = self.paginate_queryset(queryset)
+            if page is not None:
+                return self.get_paginated_response(self.get_serializer(page, many=True).data)
+            return Response(self.get_serializer(queryset, many=True).data)
+        renderer = ResultListRenderer(self.get_serializer_context())
+        rows = queryset.select_related(None).prefetch_related(None).values(*renderer.columns)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(renderer.render(page))
+        return Response(renderer.render(rows))
+
+
+@extend_schema(
+    parameters=[
+        OpenApiParameter(
+            "personal",
+            description="Return personal bests over all seasons instead of season bests.",
+            type=OpenApiTypes.BOOL,
+        ),
+    ]
+)
+class AthleteBestViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    """API endpoint for athlete's best results.
+
+    Best results and best partial results by competition type, category and season, from the public results.
+
+    list:
+    Returns a list of best results, usually filtered by athlete.
+    """
+
+    permission_classes = (DRYPermissions,)
+    queryset = AthleteBest.objects.all()
+    serializer_class = AthleteBestSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ["athlete", "type", "category", "season"]
+
+    def get_queryset(self):
+        """
+        Returns only the best season for each athlete, type and category with personal parameter.
+        """
+        queryset = self.queryset
+        if self.request.query_params.get("personal", False):
+            queryset = queryset.annotate(
+                row_number=Window(
+                    RowNumber(),
+                    partition_by=[F("athlete"), F("type"), F("category")],
+                    order_by=[F("value").desc(nulls_last=True), F("season").desc()],
+                )
+            ).filter(row_number=1)
+        return self.get_serializer_class().setup_eager_loading(queryset)
+
 
 class ResultDetailViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
     """API endpoint for retrieving detailed result information.
@@ -368,8 +597,144 @@ class ResultDetailViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
         elif not user.is_superuser and not user.is_staff:
             self.queryset = self.queryset.filter(
                 Q(public=True)
-                | Q(competition__organization__group__in=user.groups.all())
-                | Q(competition__organization__areas__manager__in=user.groups.all())
-                | Q(competition__type__sport__manager__in=user.groups.all())
+                | Q(competition__organization__in=get_membership(user.pk)["organizations"])
+                | Q(competition__type__sport__in=get_membership(user.pk)["sports"])
             )
         return self.queryset
+
+
+@extend_schema(
+    parameters=[
+        OpenApiParameter(
+            name="competition",
+            type=OpenApiTypes.INT,
+            description="Competition id.",
+            required=True,
+        ),
+        OpenApiParameter(
+            "cursor",
+            type=OpenApiTypes.STR,
+            description="Cursor from the previous response. Returns all results if not given.",
+        ),
+        OpenApiParameter(
+            "limit",
+            type=OpenApiTypes.INT,
+            description="Maximum number of changed results in a response.",
+        ),
+    ]
+)
+class ResultChangeFeed(viewsets.GenericViewSet):
+    """API endpoint for incremental result changes in a competition.
+
+    Results are returned in the same format as in the result list. Removed results, and results which are no longer
+    visible to the user, are returned in deleted list. If more is true, there are more changes available with the
+    returned cursor.
+
+    list:
+    Returns the results changed since the cursor.
+
+    stream:
+    Returns the result changes as a Server-Sent Events stream. Last-Event-ID header may be used instead of the cursor.
+    """
+
+    permission_classes = (DRYPermissions,)
+    queryset = Result.objects.all()
+    serializer_class = ResultLimitedSerializer
+    pagination_class = None
+
+    def get_queryset(self):
+        """
+        Filter public results and setup eager loading.
+        """
+        queryset = Result.objects.all()
+        user = self.request.user
+        if not user.is_authenticated:
+            queryset = queryset.filter(public=True)
+        elif not user.is_superuser and not user.is_staff:
+            queryset = queryset.filter(
+                Q(public=True)
+                | Q(competition__organization__in=get_membership(user.pk)["organizations"])
+                | Q(competition__type__sport__in=get_membership(user.pk)["sports"])
+            )
+        return queryset
+
+    def _get_parameters(self, request):
+        """
+        Returns competition, cursor and limit from the request.
+        """
+        max_limit = getattr(settings, "RESULT_CHANGE_FEED_LIMIT", 500)
+        try:
+            competition = int(request.query_params.get("competition", ""))
+            limit = min(int(request.query_params.get("limit", max_limit)), max_limit)
+        except ValueError:
+            raise exceptions.ParseError()
+        if limit < 1:
+            raise exceptions.ParseError()
+        cursor = request.query_params.get("cursor", request.headers.get("Last-Event-ID", None))
+        return competition, cursor, limit
+
+    def _get_changes(self, competition, cursor, limit):
+        """
+        Returns the changes serialized for the user.
+        """
+        try:
+            changed, deleted, cursor, more = get_changes(competition, cursor=cursor, limit=limit)
+        except ValueError:
+            raise exceptions.ParseError()
+        visible = set(self.get_queryset().filter(pk__in=changed).values_list("pk", flat=True))
+        athlete_information_queryset = AthleteInformation.get_visibility_queryset(
+            user=self.request.user, queryset=AthleteInformation.objects.all()
+        )
+        prefetch = [Prefetch("athlete__info", queryset=athlete_information_queryset)]
+        queryset = self.get_serializer_class().setup_eager_loading(
+            Result.objects.filter(pk__in=visible).order_by("updated_at", "pk"), prefetch=prefetch
+        )
+        return {
+            "cursor": cursor,
+            "more": more,
+            "results": self.get_serializer(queryset, many=True).data,
+            "deleted": deleted + [pk for pk in changed if pk not in visible],
+        }
+
+    def list(self, request, *args, **kwargs):
+        competition, cursor, limit = self._get_parameters(request)
+        return Response(self._get_changes(competition, cursor, limit))
+
+    def _stream(self, competition, cursor, limit):
+        """
+        Yields Server-Sent Events for the changes.
+
+        Database is only queried when the competition has been marked changed or keepalive interval has passed.
+        Stream is closed after the timeout and client is expected to reconnect.
+        """
+        poll_interval = getattr(settings, "RESULT_CHANGE_FEED_POLL_INTERVAL", 2)
+        keepalive = getattr(settings, "RESULT_CHANGE_FEED_KEEPALIVE", 30)
+        deadline = time.monotonic() + getattr(settings, "RESULT_CHANGE_FEED_STREAM_TIMEOUT", 300)
+        renderer = JSONRenderer()
+        marker = None
+        checked = None
+        yield "retry: %d\n\n" % (poll_interval * 1000)
+        while True:
+            current_marker = get_change_marker(competition)
+            if checked is None or current_marker != marker or time.monotonic() - checked >= keepalive:
+                marker = current_marker
+                checked = time.monotonic()
+                data = self._get_changes(competition, cursor, limit)
+                cursor = data["cursor"]
+                if data["results"] or data["deleted"]:
+                    yield "id: %s\nevent: changes\ndata: %s\n\n" % (cursor, renderer.render(data).decode())
+                    if data["more"]:
+                        continue
+                else:
+                    yield ": keepalive\n\n"
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(poll_interval)
+
+    @action(detail=False)
+    def stream(self, request, *args, **kwargs):
+        competition, cursor, limit = self._get_parameters(request)
+        response = StreamingHttpResponse(self._stream(competition, cursor, limit), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
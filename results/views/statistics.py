@@ -1,6 +1,3 @@
-import operator
-
-from django.forms.models import model_to_dict
 from django.http import JsonResponse
 from django.views.decorators.cache import never_cache
 from drf_spectacular.utils import extend_schema
@@ -8,10 +5,12 @@ from dry_rest_permissions.generics import DRYPermissions
 from rest_framework import viewsets
 from rest_framework.decorators import api_view
 
-from results.models.competitions import CompetitionLevel
-from results.models.results import Result
-from results.models.statistics import StatisticsLink
-from results.serializers.statistics import StatisticsLinkSerializer
+from results.models.statistics import PointsTable, StatisticsLink
+from results.serializers.statistics import (
+    PointsTableSerializer,
+    StatisticsLinkSerializer,
+)
+from results.utils.points import get_standings
 
 
 class StatisticsLinkViewSet(viewsets.ModelViewSet):
@@ -51,6 +50,111 @@ class StatisticsLinkViewSet(viewsets.ModelViewSet):
         return self.queryset
 
 
+class PointsTableViewSet(viewsets.ModelViewSet):
+    """API endpoint for points table definitions.
+
+    list:
+    Returns a list of all the existing points tables.
+
+    retrieve:
+    Returns the given points table.
+
+    create:
+    Creates a new points table instance.
+
+    update:
+    Updates a given points table.
+
+    partial_update:
+    Updates a given points table.
+
+    destroy:
+    Removes the given points table.
+    """
+
+    permission_classes = (DRYPermissions,)
+    queryset = PointsTable.objects.all()
+    serializer_class = PointsTableSerializer
+
+    def get_queryset(self):
+        """
+        Restricts the returned information to public points tables, unless user is
+        staff or superuser.
+        """
+        user = self.request.user
+        if not user.is_superuser and not user.is_staff:
+            self.queryset = self.queryset.filter(public=True)
+        return self.queryset
+
+
+def _points_response(request, slug, year):
+    """
+    Returns points table standings response, checking the table's visibility.
+    """
+    table = PointsTable.objects.filter(slug=slug).first()
+    if not table:
+        return JsonResponse({"message": "Not found"}, status=404)
+    if not table.public and not request.user.is_staff:
+        return JsonResponse({"message": "Forbidden"}, status=403)
+    return JsonResponse({"results": get_standings(table, year)})
+
+
+@extend_schema(
+    responses={
+        200: {
+            "type": "object",
+            "properties": {
+                "results": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "organization": {
+                                "type": "object",
+                                "properties": {
+                                    "id": {"type": "integer"},
+                                    "name": {"type": "string"},
+                                    "abbreviation": {"type": "string"},
+                                },
+                            },
+                            "area": {
+                                "type": "object",
+                                "properties": {
+                                    "id": {"type": "integer"},
+                                    "name": {"type": "string"},
+                                    "abbreviation": {"type": "string"},
+                                },
+                            },
+                            "athlete": {
+                                "type": "object",
+                                "properties": {
+                                    "id": {"type": "integer"},
+                                    "first_name": {"type": "string"},
+                                    "last_name": {"type": "string"},
+                                },
+                            },
+                            "value": {"type": "number"},
+                        },
+                    },
+                }
+            },
+        }
+    },
+)
+@never_cache
+@api_view()
+def statistics_points(request, slug, year):
+    """
+    Returns standings for the points table and year.
+
+    Each result contains the group, organization, area or athlete depending on the points table, and the value.
+
+    Non-public points tables are only available to staff. Points are calculated when results are changed and stored
+    by competition, see :mod:`results.utils.points`.
+    """
+    return _points_response(request, slug, year)
+
+
 @extend_schema(
     responses={
         200: {
@@ -81,48 +185,15 @@ class StatisticsLinkViewSet(viewsets.ModelViewSet):
 @api_view()
 def statistics_pohjolan_malja(request, year):
     """
-    Calculates organization points from SM competitions.
+    Returns organization points from SM competitions.
 
     First athlete or team per category gets 8 points for the organization
     they represent, second gets 7 and so on until 8th get 1 point.
 
     All SM competitions during a calendar year are counted.
+
+    Points are defined by the pohjolan-malja points table, see :func:`statistics_points`. Only available to staff.
     """
     if not request.user.is_staff:
         return JsonResponse({"message": "Forbidden"}, status=403)
-    level_list = ["SM"]
-    max_position = 8
-    competition_levels = CompetitionLevel.objects.filter(abbreviation__in=level_list)
-    results = Result.objects.filter(
-        competition__level__in=competition_levels,
-        position__gte=1,
-        competition__date_start__year=year,
-    ).order_by("competition", "category", "position", "-result")
-    data_dict = {}
-    competition = None
-    category = None
-    for result in results:
-        if competition != result.competition or category != result.category:
-            max_position = 8
-            competition = result.competition
-            category = result.category
-        if result.organization.external:
-            if not Result.objects.filter(
-                competition=result.competition,
-                category=result.category,
-                position=result.position,
-                organization__external=False,
-            ).exists():
-                max_position += 1
-        elif result.position <= max_position:
-            points = max_position - result.position + 1
-            organization = result.organization
-            if organization not in data_dict:
-                data_dict[organization] = points
-            else:
-                data_dict[organization] = data_dict[organization] + points
-    object_list = sorted(data_dict.items(), key=operator.itemgetter(1), reverse=True)
-    data = []
-    for obj in object_list:
-        data.append({"organization": model_to_dict(obj[0], fields=["id", "name", "abbreviation"]), "value": obj[1]})
-    return JsonResponse({"results": data})
+    return _points_response(request, "pohjolan-malja", year)
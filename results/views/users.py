@@ -3,8 +3,38 @@ from django.views.decorators.cache import never_cache
 from drf_spectacular.utils import extend_schema
 from rest_framework.decorators import api_view
 
-from results.models.organizations import Organization
-from results.models.sports import Sport
+from results.utils.async_views import async_read_view, authenticate
+from results.utils.cache import aget_membership, get_membership
+
+
+def _get_user_info(user, membership):
+    """
+    Returns user info with the user's cached group membership.
+    """
+    if user.is_authenticated:
+        first_name = user.first_name
+        last_name = user.last_name
+        email = user.email
+        area_manager = sorted(membership["area_organizations"])
+        sport_manager = sorted(membership["sports"])
+    else:
+        first_name = ""
+        last_name = ""
+        email = ""
+        area_manager = []
+        sport_manager = []
+
+    return {
+        "is_authenticated": user.is_authenticated,
+        "is_superuser": user.is_superuser,
+        "is_staff": user.is_staff,
+        "first_name": first_name,
+        "last_name": last_name,
+        "email": email,
+        "area_manager": area_manager,
+        "manager": area_manager,
+        "sport_manager": sport_manager,
+    }
 
 
 @extend_schema(
@@ -37,40 +67,24 @@ from results.models.sports import Sport
 )
 @never_cache
 @api_view()
-def current_user(request):
+def current_user_sync(request):
     """
     User info endpoint.
+
+    Requests are served by the async view, this view is used for the API schema and authentication errors.
     """
-    if request.user.is_authenticated:
-        first_name = request.user.first_name
-        last_name = request.user.last_name
-        email = request.user.email
-        area_manager = list(
-            Organization.objects.filter(areas__manager__in=request.user.groups.all())
-            .order_by("id")
-            .values_list("id", flat=True)
-        )
-        sport_manager = list(
-            list(
-                Sport.objects.filter(manager__in=request.user.groups.all()).order_by("id").values_list("id", flat=True)
-            )
-        )
-    else:
-        first_name = ""
-        last_name = ""
-        email = ""
-        area_manager = []
-        sport_manager = []
+    user = request.user
+    return JsonResponse(_get_user_info(user, get_membership(user.pk) if user.is_authenticated else None))
 
-    data = {
-        "is_authenticated": request.user.is_authenticated,
-        "is_superuser": request.user.is_superuser,
-        "is_staff": request.user.is_staff,
-        "first_name": first_name,
-        "last_name": last_name,
-        "email": email,
-        "area_manager": area_manager,
-        "manager": area_manager,
-        "sport_manager": sport_manager,
-    }
-    return JsonResponse(data)
+
+async def _current_user(request):
+    """
+    Returns user info with the async ORM, or None if the credentials are not valid.
+    """
+    user = await authenticate(request)
+    if user is None:
+        return None
+    return JsonResponse(_get_user_info(user, await aget_membership(user.pk) if user.is_authenticated else None))
+
+
+current_user = never_cache(async_read_view(current_user_sync, _current_user))
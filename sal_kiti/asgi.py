@@ -0,0 +1,12 @@
+"""
+For more information on this file, see
+https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "sal_kiti.settings.settings")
+
+application = get_asgi_application()
@@ -33,9 +33,24 @@ DATABASES = {
         "OPTIONS": {
             "init_command": "SET sql_mode='STRICT_TRANS_TABLES'",
         },
-    }
+    },
+    # Read replica, add alias to DATABASE_REPLICAS to use it
+    # "replica": {
+    #     "ENGINE": "django.db.backends.mysql",
+    #     "NAME": "mydb",
+    #     "USER": "mydbreader",
+    #     "PASSWORD": "mydbpassword",
+    #     "HOST": "replica.example.org",
+    #     "TEST": {"MIRROR": "default"},
+    # },
 }
 
+# Database aliases for reading safe method requests, writes always use the default database.
+# DATABASE_REPLICAS = ["replica"]
+# Time in seconds the client reads from the default database after its write request. Requires a cache shared
+# between the workers, with local memory cache authenticated clients always read from the default database.
+# REPLICA_STICKY_SECONDS = 10
+
 # If true, new record will be created for the same result as the previous record.
 CREATE_RECORD_FOR_SAME_RESULT_VALUE = False
 
@@ -55,13 +70,34 @@ REMOVE_COMPETITION_APPROVAL_WITH_EVENT = False
 # Automatically publish results when they are created. Default is True.
 # AUTO_PUBLISH_RESULTS = True
 
+# Points table standings cache timeout in seconds. Standings are removed from the cache when points change, but
+# group names are updated only after the timeout.
+# POINTS_CACHE_TIMEOUT = 3600
+
+# Athlete requirement coverage cache timeout in seconds. Coverage is removed from the cache when athlete
+# information changes.
+# REQUIREMENT_CACHE_TIMEOUT = 3600
+
+# User's group membership cache timeout in seconds. Membership is removed from the cache when user's groups,
+# organization groups or area and sport managers change. Removal reaches other workers only through a shared cache,
+# with local memory cache the timeout is limited to 60 seconds.
+# MEMBERSHIP_CACHE_TIMEOUT = 86400
+
+# Result change feed limits. Stream polls the changes every POLL_INTERVAL seconds and is closed after
+# STREAM_TIMEOUT seconds, after which the client reconnects. Note that each open stream reserves a worker.
+# RESULT_CHANGE_FEED_LIMIT = 500
+# RESULT_CHANGE_FEED_POLL_INTERVAL = 2
+# RESULT_CHANGE_FEED_KEEPALIVE = 30
+# RESULT_CHANGE_FEED_STREAM_TIMEOUT = 300
+
 # Gender and date of birth are available through API to these users
 UNMASKED_ATHLETE_USERS = ["admin"]
 
 # Limit visiblity of non public events and competitions, possible values: authenticated / staff / None (no limits)
 LIMIT_NON_PUBLIC_EVENT_AND_COMPETITION = "authenticated"
 
-# memcached is recommended for production use
+# memcached is recommended for production use, group membership and replica routing require a cache shared
+# between the workers
 CACHES = {
     "default": {
         "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
@@ -86,6 +122,9 @@ EVENT_CREATION_NOTIFICATION_ADDRESSES = ["creation@example.org", "event@example.
 
 STATIC_ROOT = "/path/to/static/"
 
+# Directory for the open data files written by the exportopendata command, served as static files
+# OPEN_DATA_ROOT = "/path/to/open-data/"
+
 LOCALE_PATHS = ["/path/to/sal-sal_kiti/locale", "/path/to/sal-sal_kiti/results/locale"]
 
 SUOMISPORT = {
@@ -100,3 +139,4 @@ SUOMISPORT = {
 
 if "test" in sys.argv:
     DATABASES["default"] = {"ENGINE": "django.db.backends.sqlite3"}
+    DATABASES["replica"] = {"ENGINE": "django.db.backends.sqlite3", "TEST": {"MIRROR": "default"}}
@@ -39,9 +39,14 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "results.middleware.replica.ReplicaMiddleware",
     "results.middleware.current_user.CurrentUserMiddleware",
 ]
 
+DATABASE_ROUTERS = ["results.db_router.ReplicaRouter"]
+DATABASE_REPLICAS = []
+REPLICA_STICKY_SECONDS = 10
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework.authentication.TokenAuthentication",
@@ -94,7 +99,21 @@ APPROVE_COMPETITIONS_WITH_EVENT = False
 REMOVE_COMPETITION_APPROVAL_WITH_EVENT = False
 AUTO_PUBLISH_RESULTS = True
 
+POINTS_CACHE_TIMEOUT = 3600
+REQUIREMENT_CACHE_TIMEOUT = 3600
+MEMBERSHIP_CACHE_TIMEOUT = 86400
+IMPORT_REFERENCE_CACHE_TIMEOUT = 3600
+
+RESULT_CHANGE_FEED_LIMIT = 500
+RESULT_CHANGE_FEED_POLL_INTERVAL = 2
+RESULT_CHANGE_FEED_KEEPALIVE = 30
+RESULT_CHANGE_FEED_STREAM_TIMEOUT = 300
+RESULT_CHANGE_FEED_TOMBSTONE_DAYS = 30
+
+OPEN_DATA_ROOT = None
+
 WSGI_APPLICATION = "sal_kiti.wsgi.application"
+ASGI_APPLICATION = "sal_kiti.asgi.application"
 
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
@@ -7,7 +7,7 @@ from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
 from results.routers import router
 from results.views.auth import LocalLoginView, LocalLogoutView
-from results.views.statistics import statistics_pohjolan_malja
+from results.views.statistics import statistics_pohjolan_malja, statistics_points
 from results.views.users import current_user
 
 admin.site.site_title = _("Kiti admin")
@@ -16,6 +16,7 @@ admin.site.index_title = _("Kiti administration")
 
 urlpatterns = [
     path("api/sal/pohjolanmalja/<int:year>/", statistics_pohjolan_malja, name="sal-pohjolan-malja"),
+    path("api/statistics/points/<slug:slug>/<int:year>/", statistics_points, name="statistics-points"),
     path("api/users/current/", current_user, name="current-user"),
     path("api/", include(router.urls)),
     path("admin/", admin.site.urls),